@@ -1,28 +1,120 @@
 from llama_cpp import Llama
 from langchain.llms.base import LLM
 from langchain.callbacks.manager import CallbackManagerForLLMRun
+from langchain.callbacks.base import BaseCallbackHandler
+from langchain.schema.output import GenerationChunk
 from langchain.agents import Tool, AgentExecutor, create_react_agent
+from langchain.tools import StructuredTool
+from langchain.pydantic_v1 import BaseModel, Field
 from langchain.prompts import PromptTemplate
-from typing import Optional, List, Any
+from langchain.tools.render import render_text_description
+from typing import Optional, List, Any, Iterator
+import threading
+import functools
+import json
 import config
-from tools import ExcelTools
+from tools import ExcelTools, QueryRouter, AnswerCache, FilterSyntaxError, parse_filter
+from tools import SQLQueryError, run_sql, schema_text, extract_sql, ContextBuilder, get_token_counter
+from tools.sql_query import HAS_DUCKDB
+from llm_server import LLMServerClient, InferenceWorkerPool
+
+# SQL mode ka prompt - instructions static (KV prefix warm), schema + question har sawal pe
+SQL_PROMPT_PREFIX = """You are an Excel data analyst. Answer the question with ONE DuckDB SQL query over the table below.
+Rules:
+- Write a single SELECT (or WITH ... SELECT) statement and nothing else
+- Quote column names with double quotes, e.g. "Join Date"
+- Use only the columns listed in the schema
+- Do the work in SQL (WHERE, GROUP BY, ORDER BY, LIMIT) instead of returning raw rows
+
+"""
+
+SQL_PROMPT = SQL_PROMPT_PREFIX + """Schema:
+{schema}
+
+Question: {question}
+SQL:"""
+
+
+class GroupByInput(BaseModel):
+    """group_by tool ke arguments"""
+    group_by: str = Field(description="Group karne wale column(s), comma-separated")
+    values: Optional[str] = Field(default=None, description="Aggregate hone wale column(s), comma-separated")
+    aggs: Optional[str] = Field(default="sum", description="sum, mean, count, min, max, nunique, median, pNN (comma-separated)")
+    pivot_column: Optional[str] = Field(default=None, description="Pivot ke columns banane wala column (optional)")
+
+
+# Process me ek hi model (saare ExcelAgents / Streamlit sessions share karte hain)
+_local_pool = None
+_local_pool_lock = threading.Lock()
+
+def get_local_pool():
+    """In-process Mistral worker + scheduler - pehli call pe load, phir reuse"""
+    global _local_pool
+    with _local_pool_lock:
+        if _local_pool is None:
+            pool = InferenceWorkerPool(workers=1, model_factory=lambda: Llama(**config.LLM_CONFIG))
+            pool.start()
+            _local_pool = pool
+    return _local_pool
+
 
 # Custom LLM wrapper for Mistral
 class MistralLLM(LLM):
     """Mistral 7B ko LangChain ke saath use karne ke liye wrapper"""
     
     llm: Any = None
+    client: Any = None
+    last_queue_time: float = 0.0
     
     def __init__(self):
         super().__init__()
-        print("🔄 Loading Mistral 7B model...")
-        self.llm = Llama(**config.LLM_CONFIG)
-        print("✅ Mistral 7B loaded successfully!")
+        # Warm server chal raha ho to wahi use karo, model load nahi karna padega
+        if config.LLM_SERVER_CONFIG["enabled"]:
+            client = LLMServerClient()
+            if client.ping():
+                print("✅ Connected to warm LLM server!")
+                self.client = client
+                return
+            print("⚠️ LLM server not reachable, loading model in-process")
+        self.llm = get_local_pool()
     
     @property
     def _llm_type(self) -> str:
         return "mistral-7b"
     
+    def _stream(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[GenerationChunk]:
+        """LLM se tokens stream karo (run manager callbacks ko bhi milte hain)"""
+        params = {
+            "prompt": prompt,
+            "stop": stop or [],
+            "max_tokens": config.LLM_CONFIG["max_tokens"],
+            "temperature": config.LLM_CONFIG["temperature"],
+            "top_p": config.LLM_CONFIG["top_p"]
+        }
+        
+        # Dono raste scheduler se jaate hain (server ya in-process pool)
+        if self.client is not None:
+            events = self.client.stream(params)
+        else:
+            events = self.llm.stream(params, timeout=config.LLM_SERVER_CONFIG["timeout"])
+        
+        for event in events:
+            if "token" in event:
+                chunk = GenerationChunk(text=event["token"])
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+            elif not event.get("ok", True):
+                raise RuntimeError(event["error"])
+            elif event.get("done"):
+                self.last_queue_time = event["queue_time"]
+    
     def _call(
         self,
         prompt: str,
@@ -31,14 +123,41 @@ class MistralLLM(LLM):
         **kwargs: Any,
     ) -> str:
         """LLM ko call karo"""
-        response = self.llm(
-            prompt,
-            max_tokens=config.LLM_CONFIG["max_tokens"],
-            temperature=config.LLM_CONFIG["temperature"],
-            top_p=config.LLM_CONFIG["top_p"],
-            stop=stop or []
-        )
-        return response["choices"][0]["text"].strip()
+        text = "".join(chunk.text for chunk in self._stream(prompt, stop, run_manager, **kwargs))
+        return text.strip()
+    
+    def get_num_tokens(self, text: str) -> int:
+        """Mistral tokenizer ke hisab se tokens (LangChain ka default GPT-2 estimate nahi)"""
+        return get_token_counter().count(text)
+    
+    def warm_prefix(self, prefix):
+        """Static prompt prefix ki KV state pehle se bana lo"""
+        if self.client is not None:
+            return self.client.warm_prefix(prefix)
+        return self.llm.warm_prefix(prefix)
+
+
+class StreamingCallback(BaseCallbackHandler):
+    """LLM tokens aate hi on_token(text_so_far) call karo (UI streaming ke liye)"""
+    
+    def __init__(self, on_token):
+        self.on_token = on_token
+        self.text = ""
+    
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        # ReAct ka har naya step alag line pe
+        if self.text:
+            self.text += "\n\n"
+    
+    def on_llm_new_token(self, token, **kwargs):
+        self.text += token
+        self.on_token(self.text)
+
+
+def _cacheable(output):
+    """Sirf asli answers cache hote hain - errors / iteration limit wale nahi"""
+    text = str(output).strip()
+    return bool(text) and not text.startswith("❌") and not text.startswith("Agent stopped")
 
 
 # Excel Agent class
@@ -54,12 +173,27 @@ class ExcelAgent:
         # Excel tools instance
         self.excel_tools = ExcelTools()
         
+        # Simple sawal bina LLM ke (fast path)
+        self.router = QueryRouter(self.excel_tools)
+        
+        # Pehle puche gaye sawalon ke answers (disk pe, dataset fingerprint se keyed)
+        self.answer_cache = AnswerCache() if config.ANSWER_CACHE_CONFIG["enabled"] else None
+        self.excel_tools.answer_cache = self.answer_cache
+        
+        # Data summary / observations token budget me (n_ctx overflow na ho)
+        self.context = ContextBuilder()
+        
         # Tools define karo
         self.tools = self._create_tools()
         
         # Agent banao
         self.agent = self._create_agent()
         
+        # "react" ya "sql" (single-shot) - run(mode=...) se per-question bhi
+        self.mode = config.SQL_AGENT_CONFIG["mode"]
+        if self.mode == "sql" and HAS_DUCKDB:
+            self.llm.warm_prefix(SQL_PROMPT_PREFIX)
+        
         print("✅ Excel Agent ready!")
     
     def _create_tools(self):
@@ -68,13 +202,23 @@ class ExcelAgent:
         tools = [
             Tool(
                 name="read_excel",
-                func=lambda x: self.excel_tools.read_excel(x),
+                func=lambda x: self._read_helper(x),
                 description="Excel file read karne ke liye. Input: file path string"
             ),
+            Tool(
+                name="list_sheets",
+                func=lambda x: self.excel_tools.list_sheets(),
+                description="Workbook ki saari sheets aur unke rows/columns dekhne ke liye"
+            ),
+            Tool(
+                name="select_sheet",
+                func=lambda x: self.excel_tools.select_sheet(x.strip()),
+                description="Dusri sheet pe switch karne ke liye. Input: sheet name"
+            ),
             Tool(
                 name="get_data_info",
-                func=lambda x: self.excel_tools.get_data_info(),
-                description="Excel data ki information lene ke liye (rows, columns, etc.)"
+                func=lambda x: self._data_info_helper(),
+                description="Excel data ki information lene ke liye (columns, types, distinct values, sample rows)"
             ),
             Tool(
                 name="calculate_sum",
@@ -86,10 +230,34 @@ class ExcelAgent:
                 func=lambda x: self.excel_tools.calculate_average(x),
                 description="Kisi column ka average calculate karne ke liye. Input: column name"
             ),
+            Tool(
+                name="calculate_min",
+                func=lambda x: self.excel_tools.calculate_min(x),
+                description="Kisi column ka minimum nikalne ke liye. Input: column name"
+            ),
+            Tool(
+                name="calculate_max",
+                func=lambda x: self.excel_tools.calculate_max(x),
+                description="Kisi column ka maximum nikalne ke liye. Input: column name"
+            ),
+            StructuredTool.from_function(
+                func=self._group_by_helper,
+                name="group_by",
+                description=(
+                    "Group-by / pivot aggregation ek hi step me. "
+                    "Input JSON: {\"group_by\": \"City\", \"values\": \"Salary\", "
+                    "\"aggs\": \"sum,mean,p90\", \"pivot_column\": null}"
+                ),
+                args_schema=GroupByInput
+            ),
             Tool(
                 name="filter_data",
                 func=lambda x: self._filter_helper(x),
-                description="Data filter karne ke liye. Input format: 'column_name,value'"
+                description=(
+                    "Data filter karne ke liye. Input: filter expression, e.g. "
+                    "City = 'Delhi' AND Salary > 50000, Age BETWEEN 25 AND 30, "
+                    "City IN ('Delhi', 'Mumbai'), Name ~ '^A', `Join Date` >= '2023-01-01'"
+                )
             ),
             Tool(
                 name="sort_data",
@@ -103,17 +271,64 @@ class ExcelAgent:
             ),
         ]
         
+        for tool in tools:
+            tool.func = self._budgeted(tool.func)
         return tools
     
+    def _budgeted(self, func):
+        """Tool observation token budget tak truncate (scratchpad har step badhta hai)"""
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            return self.context.observation(func(*args, **kwargs))
+        return run
+    
+    def _read_helper(self, file_path):
+        """File read karo - head() ki jagah budgeted schema/sample summary"""
+        result = self.excel_tools.read_excel(file_path.strip())
+        df = self.excel_tools.df
+        if df is None or not result.startswith("✅"):
+            return result
+        return f"✅ File read successful! Shape: {df.shape}\n\n{self.context.data_context(df)}"
+    
+    def _data_info_helper(self):
+        """Column types, cardinality aur sample rows (poora JSON dump nahi)"""
+        if self.excel_tools.df is None:
+            return self.excel_tools.get_data_info()
+        return self.context.data_context(self.excel_tools.df)
+    
     def _filter_helper(self, input_str):
-        """Filter tool ke liye helper"""
+        """Filter tool ke liye helper (expression, ya purana 'column_name,value')"""
+        source = self.excel_tools._source()
+        if source is not None:
+            try:
+                parse_filter(input_str, source.columns)
+                return self.excel_tools.query_data(input_str)
+            except FilterSyntaxError:
+                pass
+        
         try:
             parts = input_str.split(',')
             column = parts[0].strip()
             value = parts[1].strip()
             return self.excel_tools.filter_data(column, value)
         except:
-            return "❌ Format error! Use: 'column_name,value'"
+            return "❌ Format error! Use an expression like: City = 'Delhi' AND Salary > 50000"
+    
+    def _group_by_helper(self, group_by, values=None, aggs="sum", pivot_column=None):
+        """group_by tool ke liye helper - ReAct se poora JSON string group_by me aata hai"""
+        if isinstance(group_by, str) and group_by.strip().startswith("{"):
+            try:
+                args = json.loads(group_by)
+            except ValueError:
+                return "❌ Format error! Use JSON: {\"group_by\": \"City\", \"values\": \"Salary\", \"aggs\": \"sum\"}"
+            group_by = args.get("group_by")
+            values = args.get("values", values)
+            aggs = args.get("aggs", aggs) or "sum"
+            pivot_column = args.get("pivot_column", pivot_column)
+        
+        if pivot_column:
+            return self.excel_tools.pivot_data(group_by, pivot_column, values, aggs)
+        return self.excel_tools.group_by(group_by, values, aggs)
     
     def _create_agent(self):
         """ReAct agent banao"""
@@ -144,6 +359,13 @@ Question: {input}
             input_variables=["input", "agent_scratchpad", "tools", "tool_names"]
         )
         
+        # "Question:" se pehle ka hissa har call me same hai - uski KV state reuse hogi
+        self.prompt_prefix = template.split("Question: {input}")[0].format(
+            tools=render_text_description(self.tools),
+            tool_names=", ".join([t.name for t in self.tools])
+        )
+        self.llm.warm_prefix(self.prompt_prefix)
+        
         # Agent create karo
         agent = create_react_agent(
             llm=self.llm,
@@ -162,11 +384,60 @@ Question: {input}
         
         return agent_executor
     
-    def run(self, task):
-        """Agent ko task do"""
+    def _run_sql(self, task, callbacks=None):
+        """Single-shot mode: schema ek baar, LLM ek SQL likhe, DuckDB chalaye
+
+        ReAct ke 5 tak LLM calls ki jagah ek hi generation.
+        """
+        df = self.excel_tools.df
+        sql_config = config.SQL_AGENT_CONFIG
+        schema = self.context.counter.truncate(schema_text(df), config.CONTEXT_CONFIG["data_context_tokens"])
+        prompt = SQL_PROMPT.format(schema=schema, question=task)
+        # ";" pe stop nahi - wo 'a;b' jaise literal ke andar bhi ho sakta hai;
+        # statement ki boundary extract_sql (DuckDB parser) tay karta hai
+        text = self.llm.invoke(prompt, config={"callbacks": callbacks or []}, stop=["\nQuestion:", "\n```\n"])
+        sql = extract_sql(text)
+        result, truncated = run_sql(df, sql)
+        output = f"SQL: {sql}\n\n{result.to_string(index=False)}"
+        if truncated:
+            output += f"\n(first {sql_config['max_result_rows']} rows)"
+        return {"input": task, "output": output, "sql": sql}
+    
+    def run(self, task, callbacks=None, mode=None):
+        """Agent ko task do (callbacks me LLM tokens stream hote hain)
+
+        mode: "react" ya "sql" (default config.SQL_AGENT_CONFIG["mode"])
+        """
         print(f"\n🎯 Task: {task}\n")
         try:
-            result = self.agent.invoke({"input": task})
+            # Pehle deterministic router - samajh aaya to LLM call hi nahi
+            answer = self.router.route(task)
+            if answer is not None:
+                return {"input": task, "output": answer, "routed": True}
+            
+            mode = mode or self.mode
+            fingerprint = self.excel_tools.fingerprint() if self.answer_cache is not None else None
+            if fingerprint is not None:
+                cached = self.answer_cache.get(fingerprint, task, mode)
+                if cached is not None:
+                    return {"input": task, "output": cached, "cached": True}
+            
+            result = None
+            if mode == "sql" and self.excel_tools.df is not None and HAS_DUCKDB:
+                try:
+                    result = self._run_sql(task, callbacks)
+                except SQLQueryError as e:
+                    if not config.SQL_AGENT_CONFIG["fallback_to_react"]:
+                        return f"❌ SQL Error: {str(e)}"
+                    print(f"⚠️ SQL mode failed ({e}), falling back to ReAct")
+            if result is None:
+                result = self.agent.invoke({"input": task}, config={"callbacks": callbacks or []})
+            
+            # Run ke dauraan data badla (sort/add column) ya answer error hai to cache mat karo
+            output = result.get("output", "")
+            if (fingerprint is not None and _cacheable(output)
+                    and self.excel_tools.fingerprint() == fingerprint):
+                self.answer_cache.put(fingerprint, task, output, mode)
             return result
         except Exception as e:
             return f"❌ Error: {str(e)}"
@@ -2,11 +2,21 @@ import streamlit as st
 import pandas as pd
 from pathlib import Path
 import time
-from tools import ExcelTools
+import html
+from tools import (ExcelTools, QueryRouter, DatasetStore, SnapshotStore, WorkbookHandle,
+                   get_backend, content_hash,
+                   FilterSyntaxError, ColumnIndexes, ColumnProfiler,
+                   CorrelationService, export_frame, available_formats,
+                   OperationPipeline, GridView, charts)
+import config
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 
+# Sessions shared datasets ke shallow views rakhte hain - edit pe sirf
+# us session ka column copy ho, shared frame nahi badalta
+pd.set_option("mode.copy_on_write", True)
+
 # ============================================
 # PAGE CONFIG
 # ============================================
@@ -424,21 +434,29 @@ st.markdown("""
 # HELPER FUNCTIONS
 # ============================================
 def process_chat_command(command, df):
-    """Process user chat commands"""
+    """Process user chat commands (df can be a DataFrame or a streaming ChunkedSheet)"""
     command_lower = command.lower()
     
     try:
+        # Group-by / filter / sort sawal router seedha handle karta hai
+        if isinstance(df, pd.DataFrame):
+            tools = ExcelTools()
+            tools.df = df
+            routed = QueryRouter(tools).route(command, intents={"group", "filter", "sort"})
+            if routed is not None:
+                return f"✅ <pre>{html.escape(routed)}</pre>"
+        
         if 'sum' in command_lower or 'total' in command_lower:
             for col in df.columns:
                 if col.lower() in command_lower:
-                    result = df[col].sum()
+                    result = get_backend().aggregate(df, col, 'sum')
                     return f"✅ Sum of **{col}**: **{result:,}**"
             return "❌ Column not found. Please specify column name."
         
         elif 'average' in command_lower or 'mean' in command_lower:
             for col in df.columns:
                 if col.lower() in command_lower:
-                    result = df[col].mean()
+                    result = get_backend().aggregate(df, col, 'mean')
                     return f"✅ Average of **{col}**: **{result:.2f}**"
             return "❌ Column not found."
         
@@ -451,14 +469,14 @@ def process_chat_command(command, df):
         elif 'max' in command_lower or 'maximum' in command_lower:
             for col in df.columns:
                 if col.lower() in command_lower:
-                    result = df[col].max()
+                    result = get_backend().aggregate(df, col, 'max')
                     return f"✅ Maximum of **{col}**: **{result}**"
             return "❌ Column not found."
         
         elif 'min' in command_lower or 'minimum' in command_lower:
             for col in df.columns:
                 if col.lower() in command_lower:
-                    result = df[col].min()
+                    result = get_backend().aggregate(df, col, 'min')
                     return f"✅ Minimum of **{col}**: **{result}**"
             return "❌ Column not found."
         
@@ -470,6 +488,8 @@ def process_chat_command(command, df):
 - "average of [column]" - Find mean
 - "max of [column]" - Find maximum
 - "min of [column]" - Find minimum
+- "sum of [column] by [column]" - Group-by totals (mean, p90, unique bhi)
+- "sum of [column] by [column] across [column]" - Pivot table
 
 **ℹ️ Information:**
 - "count rows" - Total number of rows
@@ -481,20 +501,147 @@ def process_chat_command(command, df):
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
-def typing_effect(text):
-    """Simulate typing effect"""
+def get_agent():
+    """Session ka ExcelAgent (model LLM server / process me shared rehta hai)"""
+    if st.session_state.agent is None:
+        # llama_cpp/langchain sirf agent mode me chahiye
+        from agent import ExcelAgent
+        st.session_state.agent = ExcelAgent()
+    st.session_state.agent.excel_tools.df = st.session_state.df
+    return st.session_state.agent
+
+def simple_filter_expression(df, column, value):
+    """Simple filter mode: text columns me 'contains', baaki pe typed '='"""
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    series = df[column]
+    is_text = not (
+        pd.api.types.is_numeric_dtype(series)
+        or pd.api.types.is_datetime64_any_dtype(series)
+        or pd.api.types.is_bool_dtype(series)
+    )
+    op = "CONTAINS" if is_text else "="
+    return f"`{column}` {op} '{escaped}'"
+
+@st.cache_resource
+def get_dataset_store():
+    """Process-wide dataset store - har distinct file/sheet ek hi baar memory me"""
+    return DatasetStore(snapshots=SnapshotStore())
+
+@st.cache_resource
+def get_profiler():
+    """Process-wide column profiler - Upload, Analytics aur Summary same stats share karte hain"""
+    return ColumnProfiler()
+
+@st.cache_resource
+def get_correlations():
+    """Process-wide correlation cache - selectbox badalne pe matrix dobara nahi banta"""
+    return CorrelationService()
+
+def clear_dataset(clear_chat=True):
+    """Loaded data hatao - store ki lease chhodo taki koi aur session na use kare to frame free ho"""
+    if st.session_state.dataset_lease is not None:
+        st.session_state.dataset_lease.release()
+    st.session_state.dataset_lease = None
+    st.session_state.ingest_key = None
+    st.session_state.file_loaded = False
+    st.session_state.df = None
+    # Frame / upload bytes ke baaki references bhi - warna store free nahi kar payega
+    st.session_state.workbook = None
+    st.session_state.export = None
+    st.session_state.excel_tools.unload()
+    if st.session_state.agent is not None:
+        st.session_state.agent.excel_tools.unload()
+    st.session_state.grids = {}
+    st.session_state.pipeline = None
+    st.session_state.column_indexes.invalidate()
+    if clear_chat:
+        st.session_state.chat_history = []
+
+def render_grid(source, key, height=400):
+    """Paged data grid - sirf current page browser ko jaata hai
+
+    source DataFrame ho to sort/filter controls bhi (state server pe);
+    OperationPipeline ho to uska plan as-is, sirf paging.
+    """
+    grid = st.session_state.grids.get(key)
+    if grid is None or grid.source is not source:
+        indexes = st.session_state.column_indexes if source is st.session_state.df else None
+        grid = GridView(source, indexes=indexes)
+        st.session_state.grids[key] = grid
+    
+    if grid.controls_enabled:
+        col1, col2, col3 = st.columns([2, 1, 3])
+        with col1:
+            sort_col = st.selectbox("Sort by:", ["(none)"] + list(source.columns), key=f"{key}_sort")
+        with col2:
+            sort_order = st.radio("Order:", ["⬆️", "⬇️"], horizontal=True, key=f"{key}_order")
+        with col3:
+            expression = st.text_input(
+                "Filter:",
+                placeholder="City = 'Delhi' AND Salary > 50000",
+                key=f"{key}_filter"
+            )
+        grid.set_sort(None if sort_col == "(none)" else sort_col, sort_order == "⬆️")
+        try:
+            grid.set_filter(expression)
+        except FilterSyntaxError as e:
+            st.error(f"❌ {str(e)}")
+    
+    col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 1, 2])
+    with col1:
+        if st.button("⏮️", key=f"{key}_first", use_container_width=True):
+            grid.go_to(0)
+    with col2:
+        if st.button("◀️", key=f"{key}_prev", use_container_width=True):
+            grid.go_to(grid.page_number - 1)
+    with col3:
+        if st.button("▶️", key=f"{key}_next", use_container_width=True):
+            grid.go_to(grid.page_number + 1)
+    with col4:
+        if st.button("⏭️", key=f"{key}_last", use_container_width=True):
+            grid.go_to(grid.page_count - 1)
+    with col5:
+        page_sizes = config.GRID_CONFIG["page_sizes"]
+        page_size = st.selectbox(
+            "Rows per page:",
+            page_sizes,
+            index=page_sizes.index(grid.page_size) if grid.page_size in page_sizes else 0,
+            key=f"{key}_page_size",
+            label_visibility="collapsed"
+        )
+        grid.set_page_size(page_size)
+    
+    st.dataframe(grid.current_page(), use_container_width=True, height=height)
+    first, last = grid.row_range()
+    st.caption(f"Rows {first:,}–{last:,} of {grid.total_rows:,} · Page {grid.page_number + 1:,} / {grid.page_count:,}")
+
+def ask_agent(question, mode=None):
+    """Agent se jawab lo - tokens aate hi placeholder me dikhte hain"""
+    from agent import StreamingCallback
+    
     placeholder = st.empty()
-    displayed_text = ""
-    for char in text:
-        displayed_text += char
-        placeholder.markdown(displayed_text)
-        time.sleep(0.01)
+    callback = StreamingCallback(lambda text: placeholder.markdown(text + "▌"))
+    result = get_agent().run(question, callbacks=[callback], mode=mode)
+    placeholder.empty()
+    
+    if isinstance(result, dict):
+        if "sql" in result:
+            # SQL + result table - monospace me
+            return f"<pre>{html.escape(result['output'])}</pre>"
+        return result.get("output", str(result))
+    return result
 
 # ============================================
 # SESSION STATE INITIALIZATION
 # ============================================
 if 'excel_tools' not in st.session_state:
     st.session_state.excel_tools = ExcelTools()
+if 'dataset_lease' not in st.session_state:
+    st.session_state.dataset_lease = None
+if 'ingest_key' not in st.session_state:
+    st.session_state.ingest_key = None
+if 'workbook' not in st.session_state:
+    st.session_state.workbook = None
 if 'file_loaded' not in st.session_state:
     st.session_state.file_loaded = False
 if 'df' not in st.session_state:
@@ -503,6 +650,14 @@ if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
 if 'theme' not in st.session_state:
     st.session_state.theme = 'light'
+if 'agent' not in st.session_state:
+    st.session_state.agent = None
+if 'grids' not in st.session_state:
+    st.session_state.grids = {}
+if 'pipeline' not in st.session_state:
+    st.session_state.pipeline = None
+if 'column_indexes' not in st.session_state:
+    st.session_state.column_indexes = ColumnIndexes()
 
 # ============================================
 # SIDEBAR - AGENT CONTROL PANEL
@@ -541,9 +696,7 @@ with st.sidebar:
         """, unsafe_allow_html=True)
         
         if st.button("🗑️ Clear Data", key="clear_sidebar"):
-            st.session_state.file_loaded = False
-            st.session_state.df = None
-            st.session_state.chat_history = []
+            clear_dataset()
             st.rerun()
     else:
         st.markdown("""
@@ -726,20 +879,42 @@ elif page == "📤 Upload Data":
     
     if uploaded_file is not None:
         try:
-            # Show loading animation
-            with st.spinner(''):
-                st.markdown('<div class="loader"></div>', unsafe_allow_html=True)
-                time.sleep(1)
+            file_bytes = uploaded_file.getbuffer()
+            digest = content_hash(file_bytes)
             
-            # Save and read file
-            temp_path = Path("temp_upload.xlsx")
-            with open(temp_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+            # Sheet list workbook metadata se (cell data parse nahi hota)
+            if st.session_state.workbook is None or st.session_state.workbook.digest != digest:
+                st.session_state.workbook = WorkbookHandle(bytes(file_bytes), digest=digest)
+            workbook = st.session_state.workbook
             
-            df = pd.read_excel(temp_path)
-            st.session_state.df = df
-            st.session_state.file_loaded = True
-            st.session_state.excel_tools.df = df
+            sheet_name = 0
+            if len(workbook) > 1:
+                sheet_labels = {}
+                for info in workbook.sheet_info():
+                    dims = f"{info['rows']} × {info['columns']}" if info['rows'] is not None else "size unknown"
+                    sheet_labels[info['name']] = f"{info['name']} ({dims})"
+                sheet_name = st.selectbox(
+                    "📑 Select Sheet:",
+                    workbook.sheet_names,
+                    format_func=lambda name: sheet_labels[name],
+                    key="sheet_select"
+                )
+            
+            # Nayi file/sheet aayi hai tabhi shared store se lease lo
+            # (parse sirf tab hoga jab kisi session ne ise load nahi kiya)
+            store = get_dataset_store()
+            ingest_key = store.make_key(digest, sheet_name)
+            if st.session_state.ingest_key != ingest_key or st.session_state.df is None:
+                with st.spinner('Reading file...'):
+                    lease = store.acquire(file_bytes, sheet_name=sheet_name, digest=digest)
+                if st.session_state.dataset_lease is not None:
+                    st.session_state.dataset_lease.release()
+                st.session_state.dataset_lease = lease
+                st.session_state.ingest_key = ingest_key
+                st.session_state.df = lease.df
+                st.session_state.file_loaded = True
+                st.session_state.excel_tools.df = lease.df
+            df = st.session_state.df
             
             # Success message
             st.markdown(f"""
@@ -780,11 +955,17 @@ elif page == "📤 Upload Data":
             
             with col4:
                 memory_usage = df.memory_usage(deep=True).sum() / 1024
+                # Compaction hua ho to pehle vs ab memory dikhao
+                report = store.report(ingest_key)
+                memory_note = "KB"
+                if report is not None and report["after"] < report["before"]:
+                    memory_note = (f"KB (was {report['before'] / 1024:.1f} KB, "
+                                   f"{report['before'] / max(report['after'], 1):.1f}× smaller)")
                 st.markdown(f"""
                     <div class="metric-card" style="background: linear-gradient(135deg, #fa709a 0%, #fee140 100%);">
                         <div class="metric-label">Memory</div>
                         <div class="metric-value">{memory_usage:.1f}</div>
-                        <div class="metric-label">KB</div>
+                        <div class="metric-label">{memory_note}</div>
                     </div>
                 """, unsafe_allow_html=True)
             
@@ -797,11 +978,7 @@ elif page == "📤 Upload Data":
                 </div>
             """, unsafe_allow_html=True)
             
-            st.dataframe(
-                df,
-                use_container_width=True,
-                height=400
-            )
+            render_grid(df, "upload")
             
             st.markdown("<br>", unsafe_allow_html=True)
             
@@ -812,13 +989,7 @@ elif page == "📤 Upload Data":
                 </div>
             """, unsafe_allow_html=True)
             
-            col_info = pd.DataFrame({
-                'Column Name': df.columns,
-                'Data Type': df.dtypes.values,
-                'Non-Null Count': df.count().values,
-                'Null Count': df.isnull().sum().values,
-                'Unique Values': [df[col].nunique() for col in df.columns]
-            })
+            col_info = get_profiler().column_info(df)
             
             st.dataframe(col_info, use_container_width=True)
             
@@ -827,28 +998,43 @@ elif page == "📤 Upload Data":
             
             col1, col2, col3 = st.columns(3)
             
+            # Export sirf click pe banta hai (chunks me file me), har rerun pe nahi
+            export_formats, _ = available_formats()
             with col1:
-                csv = df.to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    label="📥 Download as CSV",
-                    data=csv,
-                    file_name='data.csv',
-                    mime='text/csv',
+                export_format = st.selectbox(
+                    "📦 Export Format:",
+                    export_formats,
+                    format_func=str.upper,
+                    key="export_format"
                 )
+            # Sirf is format pe chalne wali compressions (XLSX me koi nahi)
+            _, export_compressions = available_formats(export_format)
             
             with col2:
-                json_data = df.to_json(orient='records', indent=2)
-                st.download_button(
-                    label="📥 Download as JSON",
-                    data=json_data,
-                    file_name='data.json',
-                    mime='application/json',
+                export_compression = st.selectbox(
+                    "🗜️ Compression:",
+                    export_compressions,
+                    format_func=lambda name: "None" if name is None else name,
+                    key="export_compression"
                 )
+                if st.button("📤 Prepare Download", use_container_width=True):
+                    with st.spinner('Exporting...'):
+                        path, mime = export_frame(df, export_format, export_compression)
+                    st.session_state.export = {"df": df, "path": path, "mime": mime}
+                
+                export = st.session_state.get("export")
+                if export is not None and export["df"] is df and export["path"].exists():
+                    with open(export["path"], "rb") as export_file:
+                        st.download_button(
+                            label=f"📥 Download {export['path'].name}",
+                            data=export_file,
+                            file_name=f"data{''.join(export['path'].suffixes)}",
+                            mime=export["mime"],
+                        )
             
             with col3:
                 if st.button("🔄 Upload New File"):
-                    st.session_state.file_loaded = False
-                    st.session_state.df = None
+                    clear_dataset(clear_chat=False)
                     st.rerun()
             
         except Exception as e:
@@ -923,6 +1109,19 @@ elif page == "💬 AI Assistant":
         with col2:
             send_button = st.button("Send 📤", use_container_width=True)
         
+        use_agent = st.toggle("🧠 Ask Mistral agent (live streaming answer)", key="use_agent")
+        agent_mode = None
+        if use_agent:
+            modes = {"react": "🔁 Step-by-step tools", "sql": "⚡ Single-shot SQL"}
+            agent_mode = st.radio(
+                "Agent mode:",
+                list(modes),
+                index=list(modes).index(config.SQL_AGENT_CONFIG["mode"]),
+                format_func=modes.get,
+                horizontal=True,
+                key="agent_mode"
+            )
+        
         if send_button and user_input:
             # Add user message
             st.session_state.chat_history.append({
@@ -931,7 +1130,10 @@ elif page == "💬 AI Assistant":
             })
             
             # Process command
-            response = process_chat_command(user_input, st.session_state.df)
+            if use_agent:
+                response = ask_agent(user_input, agent_mode)
+            else:
+                response = process_chat_command(user_input, st.session_state.df)
             
             # Add agent response
             st.session_state.chat_history.append({
@@ -949,7 +1151,7 @@ elif page == "💬 AI Assistant":
         
         with col1:
             if st.button("📊 Show Summary", use_container_width=True):
-                summary = st.session_state.df.describe()
+                summary = get_profiler().describe(st.session_state.df)
                 st.dataframe(summary, use_container_width=True)
         
         with col2:
@@ -983,7 +1185,7 @@ elif page == "📊 Analytics":
             </div>
         """, unsafe_allow_html=True)
         
-        st.dataframe(df.describe(), use_container_width=True)
+        st.dataframe(get_profiler().describe(df), use_container_width=True)
         
         st.markdown("<br>", unsafe_allow_html=True)
         
@@ -994,7 +1196,7 @@ elif page == "📊 Analytics":
             </div>
         """, unsafe_allow_html=True)
         
-        numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+        numeric_cols = df.select_dtypes(include='number').columns.tolist()
         
         if numeric_cols:
             col1, col2 = st.columns(2)
@@ -1005,41 +1207,62 @@ elif page == "📊 Analytics":
             with col2:
                 chart_type = st.selectbox("📊 Chart Type:", ["Bar Chart", "Line Chart", "Pie Chart", "Histogram", "Box Plot"])
             
-            # Create chart based on selection
+            # Chart data server pe reduce hota hai - browser ko sirf chuninda points
+            total_rows = len(df)
+            rows_note = f" ({total_rows:,} rows)"
             if chart_type == "Bar Chart":
+                points = charts.bar_points(df[selected_col])
+                binned = " - binned" if len(points) < total_rows else ""
                 fig = px.bar(
-                    df,
+                    points,
+                    x="Row",
                     y=selected_col,
-                    title=f"{selected_col} - Bar Chart",
+                    title=f"{selected_col} - Bar Chart{rows_note}{binned}",
                     color_discrete_sequence=['#667eea']
                 )
             elif chart_type == "Line Chart":
+                points = charts.line_points(df[selected_col])
+                sampled = f" - {len(points):,} points shown" if len(points) < total_rows else ""
                 fig = px.line(
-                    df,
+                    points,
+                    x="Row",
                     y=selected_col,
-                    title=f"{selected_col} - Line Chart",
+                    title=f"{selected_col} - Line Chart{rows_note}{sampled}",
                     color_discrete_sequence=['#764ba2']
                 )
             elif chart_type == "Pie Chart":
+                slices = charts.pie_slices(df, df.columns[0], selected_col)
                 fig = px.pie(
-                    df,
+                    slices,
                     names=df.columns[0],
                     values=selected_col,
-                    title=f"{selected_col} - Distribution"
+                    title=f"{selected_col} - Distribution{rows_note}"
                 )
             elif chart_type == "Box Plot":
-                fig = px.box(
-                    df,
-                    y=selected_col,
-                    title=f"{selected_col} - Box Plot",
-                    color_discrete_sequence=['#f093fb']
-                )
+                stats = charts.box_stats(df[selected_col])
+                fig = go.Figure()
+                if stats is not None:
+                    fig.add_trace(go.Box(
+                        name=selected_col,
+                        q1=[stats["q1"]], median=[stats["median"]], q3=[stats["q3"]],
+                        mean=[stats["mean"]],
+                        lowerfence=[stats["lowerfence"]], upperfence=[stats["upperfence"]],
+                        marker_color='#f093fb'
+                    ))
+                fig.update_layout(title=f"{selected_col} - Box Plot{rows_note}")
             else:
-                fig = px.histogram(
-                    df,
-                    x=selected_col,
-                    title=f"{selected_col} - Distribution",
-                    color_discrete_sequence=['#4facfe']
+                bins = charts.histogram_bins(df[selected_col])
+                fig = go.Figure(go.Bar(
+                    x=(bins["bin_start"] + bins["bin_end"]) / 2,
+                    y=bins["count"],
+                    width=bins["bin_end"] - bins["bin_start"],
+                    marker_color='#4facfe'
+                ))
+                fig.update_layout(
+                    title=f"{selected_col} - Distribution{rows_note}",
+                    xaxis_title=selected_col,
+                    yaxis_title="count",
+                    bargap=0
                 )
             
             fig.update_layout(
@@ -1058,15 +1281,25 @@ elif page == "📊 Analytics":
                     </div>
                 """, unsafe_allow_html=True)
                 
-                corr = df[numeric_cols].corr()
+                corr = get_correlations().matrix(df, numeric_cols)
+                # Wide sheets pe cell text padhne layak nahi rehta
+                show_text = len(numeric_cols) <= config.CORRELATION_CONFIG["heatmap_text_max_columns"]
                 fig = px.imshow(
                     corr,
-                    text_auto=True,
+                    text_auto=".2f" if show_text else False,
                     title="Correlation Matrix",
-                    color_continuous_scale='RdBu'
+                    color_continuous_scale='RdBu',
+                    zmin=-1,
+                    zmax=1
                 )
                 fig.update_layout(height=600)
                 st.plotly_chart(fig, use_container_width=True)
+                
+                st.markdown("#### 🔝 Strongest Correlations")
+                st.dataframe(
+                    get_correlations().top_pairs(df, columns=numeric_cols),
+                    use_container_width=True
+                )
         else:
             st.info("ℹ️ No numeric columns found for visualization")
 
@@ -1081,6 +1314,13 @@ elif page == "⚙️ Operations":
     else:
         df = st.session_state.df
         
+        # Operations ek lazy plan me record hote hain - source data nahi badalta
+        pipeline = st.session_state.pipeline
+        if pipeline is None or pipeline.source is not df:
+            pipeline = OperationPipeline(df, st.session_state.column_indexes)
+            st.session_state.pipeline = pipeline
+        view = pipeline.head()
+        
         tab1, tab2, tab3, tab4 = st.tabs(["🔍 Filter", "↕️ Sort", "➕ Add Column", "🧮 Calculate"])
         
         # TAB 1: Filter
@@ -1091,16 +1331,31 @@ elif page == "⚙️ Operations":
                 </div>
             """, unsafe_allow_html=True)
             
-            col1, col2 = st.columns(2)
-            with col1:
-                filter_col = st.selectbox("Select Column:", df.columns, key="filter_col")
-            with col2:
-                filter_val = st.text_input("Enter Value:", key="filter_val")
+            filter_mode = st.radio("Mode:", ["Simple", "Expression"], horizontal=True, key="filter_mode")
+            
+            if filter_mode == "Simple":
+                col1, col2 = st.columns(2)
+                with col1:
+                    filter_col = st.selectbox("Select Column:", view.columns, key="filter_col")
+                with col2:
+                    filter_val = st.text_input("Enter Value:", key="filter_val")
+                expression = simple_filter_expression(view, filter_col, filter_val)
+            else:
+                expression = st.text_input(
+                    "Filter Expression:",
+                    placeholder="City = 'Delhi' AND Salary > 50000",
+                    key="filter_expr",
+                    help="Operators: = != > >= < <=, BETWEEN x AND y, IN (a, b), ~ 'regex', "
+                         "CONTAINS 'text', IS NULL, AND / OR / NOT, ( ). "
+                         "Spaces wale column names `backticks` me likho."
+                )
             
             if st.button("Apply Filter", key="apply_filter"):
-                filtered_df = df[df[filter_col].astype(str).str.contains(filter_val, case=False, na=False)]
-                st.dataframe(filtered_df, use_container_width=True, height=400)
-                st.success(f"✅ Found {len(filtered_df)} matching rows")
+                try:
+                    pipeline.filter(expression)
+                    st.success(f"✅ Filter added - {len(pipeline)} matching rows")
+                except FilterSyntaxError as e:
+                    st.error(f"❌ {str(e)}")
         
         # TAB 2: Sort
         with tab2:
@@ -1112,15 +1367,13 @@ elif page == "⚙️ Operations":
             
             col1, col2 = st.columns(2)
             with col1:
-                sort_col = st.selectbox("Select Column:", df.columns, key="sort_col")
+                sort_col = st.selectbox("Select Column:", view.columns, key="sort_col")
             with col2:
                 sort_order = st.radio("Order:", ["Ascending ⬆️", "Descending ⬇️"], key="sort_order")
             
             if st.button("Apply Sort", key="apply_sort"):
-                sorted_df = df.sort_values(by=sort_col, ascending=("Ascending" in sort_order))
-                st.session_state.df = sorted_df
-                st.dataframe(sorted_df, use_container_width=True, height=400)
-                st.success("✅ Data sorted successfully!")
+                pipeline.sort(sort_col, ascending=("Ascending" in sort_order))
+                st.success("✅ Sort added to the plan!")
         
         # TAB 3: Add Column
         with tab3:
@@ -1135,9 +1388,8 @@ elif page == "⚙️ Operations":
             
             if st.button("Add Column", key="add_column"):
                 if new_col_name:
-                    st.session_state.df[new_col_name] = new_col_value
+                    pipeline.add_column(new_col_name, new_col_value)
                     st.success(f"✅ Column '{new_col_name}' added!")
-                    st.dataframe(st.session_state.df, use_container_width=True, height=400)
         
         # TAB 4: Calculate
         with tab4:
@@ -1147,7 +1399,7 @@ elif page == "⚙️ Operations":
                 </div>
             """, unsafe_allow_html=True)
             
-            numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+            numeric_cols = view.select_dtypes(include='number').columns.tolist()
             
             if numeric_cols:
                 calc_col = st.selectbox("Select Column:", numeric_cols, key="calc_col")
@@ -1156,7 +1408,7 @@ elif page == "⚙️ Operations":
                 
                 with col1:
                     if st.button("Sum", key="calc_sum", use_container_width=True):
-                        result = df[calc_col].sum()
+                        result = pipeline.column(calc_col).sum()
                         st.markdown(f"""
                             <div class="metric-card">
                                 <div class="metric-label">Sum</div>
@@ -1166,7 +1418,7 @@ elif page == "⚙️ Operations":
                 
                 with col2:
                     if st.button("Average", key="calc_avg", use_container_width=True):
-                        result = df[calc_col].mean()
+                        result = pipeline.column(calc_col).mean()
                         st.markdown(f"""
                             <div class="metric-card" style="background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);">
                                 <div class="metric-label">Average</div>
@@ -1176,7 +1428,7 @@ elif page == "⚙️ Operations":
                 
                 with col3:
                     if st.button("Maximum", key="calc_max", use_container_width=True):
-                        result = df[calc_col].max()
+                        result = pipeline.column(calc_col).max()
                         st.markdown(f"""
                             <div class="metric-card" style="background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);">
                                 <div class="metric-label">Maximum</div>
@@ -1186,15 +1438,79 @@ elif page == "⚙️ Operations":
                 
                 with col4:
                     if st.button("Minimum", key="calc_min", use_container_width=True):
-                        result = df[calc_col].min()
+                        result = pipeline.column(calc_col).min()
                         st.markdown(f"""
                             <div class="metric-card" style="background: linear-gradient(135deg, #fa709a 0%, #fee140 100%);">
                                 <div class="metric-label">Minimum</div>
                                 <div class="metric-value">{result:,.2f}</div>
                             </div>
                         """, unsafe_allow_html=True)
+                
+                # Group-by bhi plan ka ek step hai
+                st.markdown("<br>", unsafe_allow_html=True)
+                col1, col2 = st.columns(2)
+                with col1:
+                    group_cols = st.multiselect("Group By:", view.columns, key="group_cols")
+                with col2:
+                    group_agg = st.selectbox("Aggregation:", ["sum", "mean", "count", "min", "max", "median"], key="group_agg")
+                if st.button("Add Group Step", key="add_group") and group_cols:
+                    pipeline.aggregate(group_cols, calc_col, group_agg)
+                    st.success(f"✅ Grouped by {', '.join(group_cols)}")
             else:
                 st.info("ℹ️ No numeric columns available for calculations")
+        
+        # Current plan + result preview (sirf dikhne wali rows banti hain)
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("""
+            <div class="glass-card">
+                <h2 style='color: #667eea;'>🧾 Operation Plan</h2>
+            </div>
+        """, unsafe_allow_html=True)
+        
+        recorded, optimized = pipeline.describe()
+        if recorded:
+            for number, step in enumerate(recorded, start=1):
+                st.markdown(f"{number}. {html.escape(step)}")
+            if optimized != recorded:
+                with st.expander("⚡ Optimized plan"):
+                    for number, step in enumerate(optimized, start=1):
+                        st.markdown(f"{number}. {html.escape(step)}")
+        else:
+            st.info("ℹ️ No operations yet - showing the original data")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            if st.button("↩️ Undo", key="plan_undo", disabled=not pipeline.can_undo, use_container_width=True):
+                pipeline.undo()
+                st.rerun()
+        with col2:
+            if st.button("↪️ Redo", key="plan_redo", disabled=not pipeline.can_redo, use_container_width=True):
+                pipeline.redo()
+                st.rerun()
+        with col3:
+            if st.button("🔄 Reset", key="plan_reset", disabled=not recorded, use_container_width=True):
+                pipeline.reset()
+                st.rerun()
+        with col4:
+            # Plan ka result poore dataset ki jagah (Analytics/Chat bhi yahi dekhenge)
+            if st.button("💾 Apply to Dataset", key="plan_apply", disabled=not recorded, use_container_width=True):
+                result_df = pipeline.to_frame()
+                st.session_state.df = result_df
+                st.session_state.excel_tools.df = result_df
+                st.rerun()
+        
+        render_grid(pipeline, "operations")
+        
+        if recorded and st.button("📤 Prepare Result Download (CSV)", key="plan_export"):
+            with st.spinner('Exporting...'):
+                path, mime = export_frame(pipeline.to_frame(), "csv")
+            with open(path, "rb") as export_file:
+                st.download_button(
+                    label=f"📥 Download {path.name}",
+                    data=export_file,
+                    file_name="result.csv",
+                    mime=mime,
+                )
 
 # ============================================
 # PAGE 6: SETTINGS
@@ -1227,9 +1543,7 @@ elif page == "🎨 Settings":
     """, unsafe_allow_html=True)
     
     if st.button("🗑️ Clear All Data & Reset", key="clear_all"):
-        st.session_state.file_loaded = False
-        st.session_state.df = None
-        st.session_state.chat_history = []
+        clear_dataset()
         st.success("✅ All data cleared successfully!")
         time.sleep(1)
         st.rerun()
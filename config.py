@@ -19,11 +19,164 @@ LLM_CONFIG = {
     "verbose": False
 }
 
+# Warm LLM server - model ek process me load, saare agents/sessions share karte hain
+LLM_SERVER_CONFIG = {
+    "enabled": True,            # False = har process me model khud load hoga
+    "host": "127.0.0.1",
+    "port": 8765,
+    "socket_path": None,        # Unix socket path (set karo to TCP ki jagah use hoga)
+    "workers": 1,               # Model instances = max parallel completions
+    "max_queue": 32,            # Isse zyada pending requests reject hongi
+    "timeout": 300              # Seconds
+}
+
+# Completion scheduler - short questions lambi generations ke peeche na atkein
+LLM_SCHEDULER_CONFIG = {
+    "aging_rate": 50.0,         # Har second wait = itne tokens ki priority
+    "group_bonus": 64,          # Same sampling params wale job ko bonus (tokens)
+    "prefill_weight": 0.1,      # Prompt token ki cost (generated token = 1)
+    "output_ema_weight": 0.2,   # Har request type ke expected output tokens ka moving average
+    "stats_window": 256         # Queue time stats kitne recent jobs pe
+}
+
+# Prompt prefix KV cache - ReAct template ka static hissa ek hi baar evaluate
+LLM_PREFIX_CACHE_CONFIG = {
+    "enabled": True,
+    "capacity_bytes": 2 * 1024 ** 3     # 2 GB KV states
+}
+
 # Paths
 TOOLS_DIR = BASE_DIR / "tools"
 TEST_FILES_DIR = BASE_DIR / "test_files"
 OUTPUT_DIR = BASE_DIR / "output"
 
+# Agent answer cache - same data + same sawal pe LLM dobara nahi chalega
+ANSWER_CACHE_CONFIG = {
+    "enabled": True,
+    "path": OUTPUT_DIR / "answer_cache.sqlite",
+    "ttl_seconds": 7 * 24 * 3600,   # 1 week
+    "max_entries": 5000
+}
+
+# Shared dataset store - saare sessions me har distinct file ki ek hi copy
+DATASET_STORE_CONFIG = {
+    "max_entries": 32,                     # Max datasets (unused wale hi evict hote hain)
+    "max_bytes": 2 * 1024 * 1024 * 1024    # Memory budget (2 GB)
+}
+
+# Columnar snapshots - parsed sheets Arrow format me, reload memory-mapped
+SNAPSHOT_ENABLED = True
+SNAPSHOT_DIR = OUTPUT_DIR / "snapshots"
+SNAPSHOT_MAX_FILES = 64                         # Isse zyada ho to least-recently-used hatao
+SNAPSHOT_MAX_BYTES = 4 * 1024 * 1024 * 1024     # Disk budget (4 GB)
+
+# Streaming reader - isse badi files chunks me padhi jati hain
+STREAM_THRESHOLD_BYTES = 100 * 1024 * 1024     # 100 MB
+STREAM_CHUNK_SIZE = 50_000                      # Rows per chunk
+
+# Multi-sheet workbooks - kitni parsed sheets memory me rakhni hain
+WORKBOOK_MAX_CACHED_SHEETS = 4
+
+# Ingest pe dtype compaction - session ki memory kam (values same rehti hain)
+DTYPE_COMPACTION_CONFIG = {
+    "enabled": True,
+    "category_max_ratio": 0.5,     # unique/rows isse kam -> category
+    "parse_dates": True,           # "2024-01-31" jaise text -> datetime64
+    "date_sample_size": 100,       # Kitni unique values check karni hain
+    "arrow_strings": True          # Baaki text -> string[pyarrow]
+}
+
+# Column profiling (Upload/Analytics/Summary) - isse zyada rows pe distinct count HyperLogLog se
+PROFILING_CONFIG = {
+    "exact_distinct_max_rows": 1_000_000,
+    "hll_precision": 14,           # 16384 registers, ~0.8% error
+    "max_entries": 1024            # Cached column profiles
+}
+
+# Charts (Analytics page) - browser ko sirf itne points bheje jaate hain
+CHART_CONFIG = {
+    "max_points": 2000,        # Line (LTTB) / bar (row bins) points
+    "histogram_bins": 50,
+    "pie_max_slices": 20       # Baaki slices 'Other' me
+}
+
+# Correlation (Analytics page) - matrix cached, wide sheets pe heatmap text band
+CORRELATION_CONFIG = {
+    "max_entries": 16,             # Cached matrices
+    "top_k": 20,                   # Strongest pairs table
+    "heatmap_text_max_columns": 20
+}
+
+# Downloads - sirf click pe, chunks me OUTPUT_DIR/exports me likhe jaate hain
+EXPORT_CONFIG = {
+    "directory": OUTPUT_DIR / "exports",
+    "chunk_size": 50_000,      # Rows per write
+    "max_files": 20            # Purane exports hat jaate hain
+}
+
+# XLSX writer (save/create/format/export) - ek pass, write-only mode
+XLSX_WRITER_CONFIG = {
+    "chunk_size": 50_000,
+    "width_sample_rows": 200,      # Column width inhi rows se
+    "min_width": 8,
+    "max_width": 60,
+    "number_formats": {
+        "integer": "#,##0",
+        "float": "#,##0.00",
+        "datetime": "yyyy-mm-dd hh:mm:ss"
+    }
+}
+
+# Operations tab ka lazy plan
+PIPELINE_CONFIG = {
+    "page_size": 100,              # Display me itni rows hi materialize hoti hain
+    "max_cached_states": 16        # Undo/redo ke liye evaluated plans (sirf row positions)
+}
+
+# Data grid - browser ko ek baar me sirf ek page
+GRID_CONFIG = {
+    "page_size": 100,
+    "page_sizes": [25, 50, 100, 250, 500]
+}
+
+# Query engine - ExcelTools ke filter/sort/aggregate/group-by kaun chalaye
+# "pandas" (default) ya "duckdb" (multi-threaded, out-of-core; duckdb install hona chahiye)
+# Results dono pe same; DuckDB sirf min_rows se badi sheets pe lagta hai
+QUERY_ENGINE_CONFIG = {
+    "engine": "pandas",
+    "min_rows": 200_000,
+    "threads": None,              # None = saare cores
+    "memory_limit": None,         # e.g. "4GB" - isse upar sort/group-by disk pe spill
+    "temp_directory": OUTPUT_DIR / "duckdb_spill"
+}
+
+# Agent mode - "react" (multi-step tools) ya "sql" (schema ek baar, ek hi LLM call
+# me SQL, DuckDB loaded sheet pe chalata hai; duckdb install hona chahiye)
+SQL_AGENT_CONFIG = {
+    "mode": "react",
+    "table_name": "data",
+    "max_result_rows": 50,         # Answer me itni rows tak
+    "fallback_to_react": True      # SQL fail ho to ReAct agent se jawab
+}
+
+# Agent prompt budget - context + observations n_ctx ke andar (tokens model ke tokenizer se)
+CONTEXT_CONFIG = {
+    "data_context_tokens": 600,    # Schema/cardinality/sample rows summary
+    "observation_tokens": 300,     # Har tool observation max (scratchpad 5 steps tak badhta hai)
+    "sample_rows": 3,              # Representative rows (shuru, beech, aakhir)
+    "sample_rows_share": 0.3,      # data_context budget ka itna hissa sample rows ke liye
+    "top_values": 3,               # Text columns ki top values
+    "value_sample_rows": 100_000,  # Top values itni evenly spaced rows se
+    "max_value_chars": 30,
+    "bytes_per_token": 3.0         # llama_cpp na ho to estimate (asli ~3.5-4)
+}
+
+# Per-column filter indexes - pehli lookup pe bante hain, chhoti sheets pe scan hi tez hai
+COLUMN_INDEX_CONFIG = {
+    "enabled": True,
+    "min_rows": 50_000
+}
+
 # Create output folder if not exists
 OUTPUT_DIR.mkdir(exist_ok=True)
 
@@ -0,0 +1,538 @@
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+import config
+
+# Server side pe hi llama_cpp chahiye - client import karne pe model load nahi hota
+try:
+    from llama_cpp import Llama, LlamaRAMCache
+except ImportError:
+    Llama = None
+    LlamaRAMCache = None
+
+
+# ============================================
+# PROTOCOL HELPERS (newline-delimited JSON)
+# ============================================
+def _send(sock_file, payload):
+    sock_file.write((json.dumps(payload) + "\n").encode("utf-8"))
+    sock_file.flush()
+
+
+def _recv(sock_file):
+    line = sock_file.readline()
+    if not line:
+        return None
+    return json.loads(line.decode("utf-8"))
+
+
+# ============================================
+# PROMPT PREFIX KV CACHE
+# ============================================
+def enable_prefix_cache(model):
+    """Model pe KV state cache lagao
+
+    llama.cpp har completion ke baad state save karta hai aur agle prompt ke
+    liye longest matching prefix wali state load karke sirf naye tokens
+    evaluate karta hai.
+    """
+    cache_config = config.LLM_PREFIX_CACHE_CONFIG
+    if cache_config["enabled"] and LlamaRAMCache is not None and hasattr(model, "set_cache"):
+        model.set_cache(LlamaRAMCache(capacity_bytes=cache_config["capacity_bytes"]))
+    return model
+
+
+def warm_prefix(model, prefix):
+    """Static prompt prefix ek baar evaluate karke uski KV state cache me rakho"""
+    if getattr(model, "cache", None) is None:
+        return False
+    tokens = model.tokenize(prefix.encode("utf-8"))
+    model.reset()
+    model.eval(tokens)
+    model.cache[tokens] = model.save_state()
+    return True
+
+
+# ============================================
+# SERVER
+# ============================================
+class _Job:
+    """Ek completion request jo queue me wait kar rahi hai"""
+
+    def __init__(self, params):
+        self.params = params
+        self.enqueued_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+        # Streaming jobs ke tokens yahan aate hain (None = khatam)
+        self.tokens = queue.Queue() if params.get("stream") else None
+        self.result = None
+        self.error = None
+
+    @property
+    def sampling_key(self):
+        """Same sampling params wale jobs compatible hain"""
+        params = self.params
+        return (
+            params.get("temperature", config.LLM_CONFIG["temperature"]),
+            params.get("top_p", config.LLM_CONFIG["top_p"]),
+            tuple(params.get("stop") or []),
+        )
+
+    @property
+    def kind(self):
+        """Request type - stop sequences se pehchaan (ReAct step, SQL, warm ...)
+
+        Sab agent calls same max_tokens bhejte hain, isliye output length ka
+        andaza isi type ke pichle jobs se lagta hai.
+        """
+        return (self.params.get("op"), tuple(self.params.get("stop") or []))
+
+    @property
+    def max_tokens(self):
+        return self.params.get("max_tokens", config.LLM_CONFIG["max_tokens"])
+
+    def cost(self, output_tokens=None):
+        """Estimated kaam (tokens) - expected generation + sasta prompt prefill
+
+        output_tokens = is type ka expected output (na pata ho to max_tokens).
+        """
+        scheduler_config = config.LLM_SCHEDULER_CONFIG
+        if output_tokens is None:
+            output_tokens = self.max_tokens
+        prompt_tokens = len(self.params.get("prompt", "")) / 4
+        return min(output_tokens, self.max_tokens) + prompt_tokens * scheduler_config["prefill_weight"]
+
+
+class CompletionScheduler:
+    """Completion jobs ki priority queue
+
+    - Chhote jobs (kam expected output / chhota prompt) lambe generations se
+      aage nikal sakte hain, isliye short questions ki latency bounded rehti hai.
+      Expected output har request type (job.kind) ke pichle jobs ke generated
+      tokens ka moving average hai - pehle job tak max_tokens maana jata hai
+    - Aging: har second wait karne pe priority badhti hai, koi starve nahi hota
+    - Pichle job jaise sampling params wale jobs ko bonus - compatible
+      requests ek ke baad ek chalti hain
+    """
+
+    def __init__(self, max_queue=None, aging_rate=None, group_bonus=None):
+        scheduler_config = config.LLM_SCHEDULER_CONFIG
+        self.max_queue = max_queue or config.LLM_SERVER_CONFIG["max_queue"]
+        self.aging_rate = aging_rate if aging_rate is not None else scheduler_config["aging_rate"]
+        self.group_bonus = group_bonus if group_bonus is not None else scheduler_config["group_bonus"]
+        self._jobs = []
+        self._cond = threading.Condition()
+        self._queue_times = deque(maxlen=scheduler_config["stats_window"])
+        self._output_tokens = {}
+
+    def put(self, job):
+        """Job add karo - queue full ho to queue.Full"""
+        with self._cond:
+            if len(self._jobs) >= self.max_queue:
+                raise queue.Full
+            self._jobs.append(job)
+            self._cond.notify()
+
+    def expected_output(self, job):
+        """Is type ke jobs kitne tokens generate karte hain (None = abhi pata nahi)"""
+        with self._cond:
+            return self._output_tokens.get(job.kind)
+
+    def record_output(self, job, generated):
+        """Job khatam - us type ka expected output update karo"""
+        weight = config.LLM_SCHEDULER_CONFIG["output_ema_weight"]
+        with self._cond:
+            previous = self._output_tokens.get(job.kind)
+            if previous is None:
+                self._output_tokens[job.kind] = float(generated)
+            else:
+                self._output_tokens[job.kind] = previous + weight * (generated - previous)
+
+    def _score(self, job, now, last_key):
+        # self._cond pehle se held hai (get se)
+        score = job.cost(self._output_tokens.get(job.kind)) - self.aging_rate * (now - job.enqueued_at)
+        if last_key is not None and job.sampling_key == last_key:
+            score -= self.group_bonus
+        return score
+
+    def get(self, last_key=None):
+        """Sabse kam score wala job nikalo (block karta hai jab tak job na aaye)"""
+        with self._cond:
+            while not self._jobs:
+                self._cond.wait()
+            # Queue chhoti hai (max_queue), har baar linear scan theek hai
+            now = time.monotonic()
+            job = min(self._jobs, key=lambda j: self._score(j, now, last_key))
+            self._jobs.remove(job)
+            job.started_at = now
+            self._queue_times.append(now - job.enqueued_at)
+            return job
+
+    def discard(self, job):
+        """Abhi tak shuru na hua job hata do (timeout pe)"""
+        with self._cond:
+            if job in self._jobs:
+                self._jobs.remove(job)
+                return True
+            return False
+
+    def qsize(self):
+        with self._cond:
+            return len(self._jobs)
+
+    def stats(self):
+        """Recent queue times (seconds)"""
+        with self._cond:
+            times = sorted(self._queue_times)
+        if not times:
+            return {"queue_time_avg": 0.0, "queue_time_p95": 0.0, "queue_time_max": 0.0}
+        return {
+            "queue_time_avg": sum(times) / len(times),
+            "queue_time_p95": times[min(len(times) - 1, int(len(times) * 0.95))],
+            "queue_time_max": times[-1],
+        }
+
+
+class InferenceWorkerPool:
+    """Model ek baar load, completions scheduler se serve
+
+    Har worker ka apna Llama instance hai (llama.cpp ek instance pe parallel
+    calls safe nahi hain), isliye workers = concurrency limit.
+    """
+
+    def __init__(self, workers=None, max_queue=None, model_factory=None):
+        server_config = config.LLM_SERVER_CONFIG
+        self.workers = workers or server_config["workers"]
+        self.scheduler = CompletionScheduler(max_queue=max_queue or server_config["max_queue"])
+        self.model_factory = model_factory or (lambda: Llama(**config.LLM_CONFIG))
+        self._threads = []
+        self.completed = 0
+        self._completed_lock = threading.Lock()
+        # Registered static prefixes - har worker apne model pe inhe warm karta hai
+        self.prefixes = []
+        self._prefix_lock = threading.Lock()
+
+    def start(self):
+        for i in range(self.workers):
+            print(f"🔄 Loading Mistral 7B model (worker {i + 1}/{self.workers})...")
+            model = enable_prefix_cache(self.model_factory())
+            thread = threading.Thread(target=self._worker_loop, args=(model,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print("✅ Inference workers ready!")
+
+    def _warm_pending(self, model, warmed):
+        with self._prefix_lock:
+            pending = [prefix for prefix in self.prefixes if prefix not in warmed]
+        for prefix in pending:
+            try:
+                warm_prefix(model, prefix)
+            finally:
+                warmed.add(prefix)
+
+    def _worker_loop(self, model):
+        last_key = None
+        warmed = set()
+        while True:
+            job = self.scheduler.get(last_key)
+            last_key = job.sampling_key
+            try:
+                self._warm_pending(model, warmed)
+                params = job.params
+                if params.get("op") == "warm":
+                    job.result = ""
+                    continue
+                # Hamesha stream karo - streaming jobs ko token turant mil jata hai
+                chunks = model(
+                    params["prompt"],
+                    max_tokens=params.get("max_tokens", config.LLM_CONFIG["max_tokens"]),
+                    temperature=params.get("temperature", config.LLM_CONFIG["temperature"]),
+                    top_p=params.get("top_p", config.LLM_CONFIG["top_p"]),
+                    stop=params.get("stop") or [],
+                    stream=True
+                )
+                parts = []
+                for chunk in chunks:
+                    token = chunk["choices"][0]["text"]
+                    parts.append(token)
+                    if job.tokens is not None:
+                        job.tokens.put(token)
+                job.result = "".join(parts)
+                # Stream ka har chunk ek token - agle same type jobs ki cost isi se
+                self.scheduler.record_output(job, len(parts))
+            except Exception as e:
+                job.error = str(e)
+            finally:
+                with self._completed_lock:
+                    self.completed += 1
+                job.finished_at = time.monotonic()
+                if job.tokens is not None:
+                    job.tokens.put(None)
+                job.done.set()
+
+    def submit(self, params, timeout=None):
+        """Job scheduler me daalo aur result ka wait karo
+
+        Queue full ho to turant error (backpressure) - client retry kar sakta hai.
+        """
+        job = _Job(params)
+        try:
+            self.scheduler.put(job)
+        except queue.Full:
+            return {"ok": False, "error": "server busy: request queue full"}
+
+        if not job.done.wait(timeout):
+            self.scheduler.discard(job)
+            return {"ok": False, "error": "timed out waiting for completion"}
+        if job.error is not None:
+            return {"ok": False, "error": job.error}
+
+        return {
+            "ok": True,
+            "text": job.result,
+            "queue_time": job.started_at - job.enqueued_at,
+            "elapsed": job.finished_at - job.started_at,
+        }
+
+    def stream(self, params, timeout=None):
+        """Job scheduler me daalo aur tokens aate hi yield karo
+
+        Events: {"token": ...} har token ke liye, aakhir me
+        {"ok": True, "done": True, "queue_time": ..., "elapsed": ...}
+        ya error pe {"ok": False, "error": ...}
+        """
+        job = _Job({**params, "stream": True})
+        try:
+            self.scheduler.put(job)
+        except queue.Full:
+            yield {"ok": False, "error": "server busy: request queue full"}
+            return
+
+        while True:
+            try:
+                token = job.tokens.get(timeout=timeout)
+            except queue.Empty:
+                self.scheduler.discard(job)
+                yield {"ok": False, "error": "timed out waiting for completion"}
+                return
+            if token is None:
+                break
+            yield {"token": token}
+
+        if job.error is not None:
+            yield {"ok": False, "error": job.error}
+            return
+        yield {
+            "ok": True,
+            "done": True,
+            "queue_time": job.started_at - job.enqueued_at,
+            "elapsed": job.finished_at - job.started_at,
+        }
+
+    def warm_prefix(self, prefix):
+        """Static prompt prefix register karo - workers iski KV state bana lenge
+
+        Wait nahi karta; ek warm job queue me jata hai taki pehla question
+        bhi warm prefix pe chale.
+        """
+        with self._prefix_lock:
+            if prefix in self.prefixes:
+                return False
+            self.prefixes.append(prefix)
+        try:
+            self.scheduler.put(_Job({"op": "warm", "prompt": "", "max_tokens": 0}))
+        except queue.Full:
+            pass
+        return True
+
+    def completed_count(self):
+        with self._completed_lock:
+            return self.completed
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "queued": self.scheduler.qsize(),
+            "completed": self.completed_count(),
+            **self.scheduler.stats(),
+        }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        pool = self.server.pool
+        timeout = config.LLM_SERVER_CONFIG["timeout"]
+        while True:
+            try:
+                request = _recv(self.rfile)
+            except (ValueError, OSError):
+                break
+            if request is None:
+                break
+
+            op = request.get("op", "complete")
+            if op == "ping":
+                response = {"ok": True, **pool.stats()}
+            elif op == "complete":
+                response = pool.submit(request, timeout=timeout)
+            elif op == "stream":
+                for event in pool.stream(request, timeout=timeout):
+                    _send(self.wfile, event)
+                continue
+            elif op == "warm":
+                response = {"ok": True, "registered": pool.warm_prefix(request["prefix"])}
+            else:
+                response = {"ok": False, "error": f"unknown op: {op}"}
+            _send(self.wfile, response)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def create_server(pool, host=None, port=None, socket_path=None):
+    """Unix socket (agar diya ho) ya localhost TCP pe server banao"""
+    server_config = config.LLM_SERVER_CONFIG
+    socket_path = socket_path or server_config["socket_path"]
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _UnixServer(socket_path, _RequestHandler)
+    else:
+        server = _TCPServer((host or server_config["host"], port or server_config["port"]), _RequestHandler)
+    server.pool = pool
+    return server
+
+
+def serve():
+    """Long-lived inference server chalao"""
+    if Llama is None:
+        raise RuntimeError("llama_cpp is not installed")
+    pool = InferenceWorkerPool()
+    pool.start()
+    server = create_server(pool)
+    print(f"🚀 LLM server listening on {server.server_address}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+# ============================================
+# CLIENT
+# ============================================
+class LLMServerClient:
+    """Warm LLM server ka client - ek connection, thread-safe"""
+
+    def __init__(self, host=None, port=None, socket_path=None, timeout=None):
+        server_config = config.LLM_SERVER_CONFIG
+        self.host = host or server_config["host"]
+        self.port = port or server_config["port"]
+        self.socket_path = socket_path or server_config["socket_path"]
+        self.timeout = timeout or server_config["timeout"]
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self.socket_path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        else:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._file.close()
+                self._sock.close()
+            except OSError:
+                # Toota connection - buffered data flush nahi ho sakta, chhod do
+                self._sock.close()
+            finally:
+                self._sock = None
+                self._file = None
+
+    def _request(self, payload):
+        with self._lock:
+            # Ek baar reconnect try karo (server restart ho gaya ho to)
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    _send(self._file, payload)
+                    response = _recv(self._file)
+                    if response is None:
+                        raise ConnectionError("server closed the connection")
+                    return response
+                except OSError:
+                    self.close()
+                    if attempt == 1:
+                        raise
+
+    def ping(self):
+        """Server chal raha hai ya nahi"""
+        try:
+            return self._request({"op": "ping"}).get("ok", False)
+        except OSError:
+            return False
+
+    def submit(self, params):
+        """Server se completion lo - poora response (text, queue_time, elapsed)"""
+        response = self._request({"op": "complete", **params})
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "LLM server error"))
+        return response
+
+    def stream(self, params):
+        """Server se tokens stream karo - pool.stream jaise events yield hote hain"""
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            try:
+                _send(self._file, {**params, "op": "stream"})
+                while True:
+                    event = _recv(self._file)
+                    if event is None:
+                        raise ConnectionError("server closed the connection")
+                    if not event.get("ok", True):
+                        raise RuntimeError(event.get("error", "LLM server error"))
+                    yield event
+                    if event.get("done"):
+                        return
+            except BaseException:
+                # Aadha padha stream - connection reuse nahi ho sakta
+                self.close()
+                raise
+
+    def complete(self, prompt, stop=None, **params):
+        """Server se sirf completion text lo"""
+        return self.submit({"prompt": prompt, "stop": stop or [], **params})["text"]
+
+    def warm_prefix(self, prefix):
+        """Server pe static prompt prefix register karo"""
+        return self._request({"op": "warm", "prefix": prefix}).get("ok", False)
+
+    def stats(self):
+        """Server ke queue/scheduler stats"""
+        return self._request({"op": "ping"})
+
+
+if __name__ == "__main__":
+    serve()
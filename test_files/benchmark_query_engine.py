@@ -0,0 +1,43 @@
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tools.backends import PandasBackend, DuckDBBackend
+from tools.filter_expr import parse_filter
+
+# Usage: python test_files/benchmark_query_engine.py [rows]
+rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+rng = np.random.default_rng(0)
+df = pd.DataFrame({
+    'City': rng.choice(['Delhi', 'Mumbai', 'Bangalore', 'Pune'], rows),
+    'Age': rng.integers(20, 60, rows),
+    'Salary': rng.integers(30_000, 150_000, rows),
+    'Score': np.where(rng.random(rows) < 0.05, np.nan, rng.random(rows) * 100),
+    'Joined': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3000, rows), unit='D'),
+})
+df['City'] = df['City'].astype('category')
+
+node = parse_filter("City = 'Delhi' AND Age > 30 AND Score < 50", df.columns)
+jobs = {
+    "filter": lambda engine: engine.filter(df, node),
+    "sort": lambda engine: engine.sort(df, ['City', 'Score'], [True, False]),
+    "group-by": lambda engine: engine.group_by(df, ['City', 'Age'], 'Salary', 'sum,mean,count,max'),
+}
+
+pandas_engine = PandasBackend()
+duckdb_engine = DuckDBBackend(min_rows=0)
+print(f"Rows: {rows:,}")
+for name, job in jobs.items():
+    start = time.perf_counter()
+    expected = job(pandas_engine)
+    pandas_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = job(duckdb_engine)
+    duckdb_seconds = time.perf_counter() - start
+
+    same = result.equals(expected) and result.index.equals(expected.index)
+    print(f"{name:9s} pandas {pandas_seconds:.2f}s | duckdb {duckdb_seconds:.2f}s | identical: {same}")
@@ -0,0 +1,43 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tools.xlsx_writer import write_xlsx, style_header
+
+# Usage: python test_files/benchmark_xlsx_writer.py [rows]
+rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+rng = np.random.default_rng(0)
+df = pd.DataFrame({
+    'Name': [f"Employee {i}" for i in range(rows)],
+    'City': rng.choice(['Delhi', 'Mumbai', 'Bangalore', 'Pune'], rows),
+    'Age': rng.integers(20, 60, rows),
+    'Salary': rng.integers(30_000, 150_000, rows),
+    'Score': rng.random(rows) * 100,
+    'Joined': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3000, rows), unit='D'),
+})
+
+with tempfile.TemporaryDirectory() as tmp:
+    tmp = Path(tmp)
+
+    # Purana path: to_excel -> load_workbook -> header style -> save
+    start = time.perf_counter()
+    df.to_excel(tmp / "saved.xlsx", index=False)
+    style_header(tmp / "saved.xlsx", tmp / "formatted_old.xlsx")
+    old_seconds = time.perf_counter() - start
+
+    # Naya path: ek pass, styles likhte waqt
+    start = time.perf_counter()
+    write_xlsx(df, tmp / "formatted_new.xlsx")
+    new_seconds = time.perf_counter() - start
+
+    check = pd.read_excel(tmp / "formatted_new.xlsx")
+    same = check.shape == df.shape and check['Salary'].equals(df['Salary'].astype(check['Salary'].dtype))
+
+    print(f"Rows: {rows:,}")
+    print(f"3-step (to_excel + load_workbook + save): {old_seconds:.2f}s")
+    print(f"Single-pass write_xlsx:                   {new_seconds:.2f}s")
+    print(f"Speedup: {old_seconds / new_seconds:.1f}x  |  Data round-trip OK: {same}")
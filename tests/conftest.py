@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Repo root import path pe (tools/, config.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.aggregation import group_aggregate, parse_agg, pivot_aggregate
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "City": ["Delhi", "Pune", "Delhi", "Mumbai", "Pune", "Delhi"],
+        "Dept": ["IT", "HR", "HR", "IT", "IT", "IT"],
+        "Salary": [50, 40, 70, 65, 45, 55],
+        "Age": [30, 25, 41, 35, 28, 33],
+    })
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("sum", ("sum", None)),
+    ("AVG", ("mean", None)),
+    ("distinct", ("nunique", None)),
+    ("p90", ("quantile", 0.9)),
+    ("p99.5", ("quantile", 0.995)),
+])
+def test_parse_agg(name, expected):
+    assert parse_agg(name) == expected
+
+
+@pytest.mark.parametrize("name", ["mode", "p", "sum2"])
+def test_parse_agg_rejects_unknown(name):
+    with pytest.raises(ValueError):
+        parse_agg(name)
+
+
+def test_multi_key_multi_agg_matches_pandas(df):
+    result = group_aggregate(df, "City, Dept", "Salary", "sum, mean, count, p50")
+    grouped = df.groupby(["City", "Dept"])["Salary"]
+    expected = pd.DataFrame({
+        "Salary_sum": grouped.sum(),
+        "Salary_mean": grouped.mean(),
+        "Salary_count": grouped.count(),
+        "Salary_p50": grouped.quantile(0.5),
+    }).reset_index()
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_default_values_are_numeric_columns(df):
+    result = group_aggregate(df, "City")
+    assert list(result.columns) == ["City", "Salary_sum", "Age_sum"]
+    assert result["Salary_sum"].tolist() == [175, 65, 85]
+
+
+def test_count_only_counts_rows(df):
+    result = group_aggregate(df, "Dept", aggs="count")
+    assert result.to_dict("list") == {"Dept": ["HR", "IT"], "count": [2, 4]}
+
+
+def test_missing_columns_raise(df):
+    with pytest.raises(KeyError):
+        group_aggregate(df, "Region")
+    with pytest.raises(KeyError):
+        group_aggregate(df, "City", "Bonus")
+    with pytest.raises(ValueError):
+        group_aggregate(df, "")
+
+
+def test_categorical_keys_skip_unobserved(df):
+    df = df.assign(City=pd.Categorical(df["City"], categories=["Delhi", "Pune", "Mumbai", "Goa"]))
+    result = group_aggregate(df, "City", "Salary", "max")
+    assert result["City"].tolist() == ["Delhi", "Pune", "Mumbai"]
+
+
+def test_pivot_matches_pivot_table(df):
+    result = pivot_aggregate(df, "City", "Dept", "Salary", "sum")
+    expected = df.pivot_table(index="City", columns="Dept", values="Salary", aggfunc="sum")
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+    assert list(result.index) == list(expected.index)
+    assert list(result.columns) == list(expected.columns)
+
+
+def test_pivot_needs_one_value_column(df):
+    with pytest.raises(ValueError):
+        pivot_aggregate(df, "City", "Dept", "Salary, Age")
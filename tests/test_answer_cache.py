@@ -0,0 +1,39 @@
+import pytest
+
+from tools.answer_cache import AnswerCache, normalize_question
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnswerCache(path=tmp_path / "answers.db")
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Rows where Salary > 50000", "Rows where Salary < 50000"),
+    ("Rows where Salary >= 50000", "Rows where Salary > 50000"),
+    ("Rows where City = Delhi", "Rows where City != Delhi"),
+    ("कुल सैलरी क्या है?", "औसत सैलरी क्या है?"),
+    ("कुल सैलरी क्या है?", "कल सैलरी क्या है?"),
+])
+def test_different_questions_do_not_collide(cache, first, second):
+    assert normalize_question(first) != normalize_question(second)
+    cache.put("f", first, "first answer")
+    assert cache.get("f", second) is None
+    assert cache.get("f", first) == "first answer"
+
+
+@pytest.mark.parametrize("first, second", [
+    ("What is the total Salary?", "sum of salary"),
+    ("Rows where Salary>50000", "rows where salary > 50000"),
+    ("कुल सैलरी क्या है?", "कुल  सैलरी क्या है"),
+])
+def test_rewordings_share_a_key(first, second):
+    assert normalize_question(first) == normalize_question(second)
+
+
+@pytest.mark.parametrize("question", ["", "what is the?", "???", "> <"])
+def test_questions_without_words_are_not_cached(cache, question):
+    assert normalize_question(question) == ""
+    cache.put("f", question, "answer")
+    assert cache.get("f", question) is None
+    assert len(cache) == 0
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from tools.backends import DuckDBBackend, PandasBackend
+from tools.filter_expr import parse_filter
+
+
+@pytest.mark.parametrize("expression", [
+    "Score = 0.1",
+    "Score != 0.1",
+    "Score >= 0.1",
+    "Score < 0.3",
+    "Score BETWEEN 0.1 AND 0.2",
+    "Score IN (0.1, 0.3)",
+])
+def test_float32_literals_match_pandas(expression):
+    df = pd.DataFrame({"Score": np.array([0.1, 0.2, 0.3, np.nan, 0.1], dtype=np.float32)})
+    node = parse_filter(expression, df.columns)
+    expected = PandasBackend().filter(df, node)
+    result = DuckDBBackend(min_rows=0).filter(df, node)
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.charts import bar_points, box_stats, histogram_bins, line_points, lttb_indices, pie_slices
+
+
+def test_lttb_small_input_is_unchanged():
+    assert lttb_indices([1, 2, 3], 10).tolist() == [0, 1, 2]
+    assert lttb_indices(np.arange(10), 2).tolist() == list(range(10))
+
+
+def test_lttb_picks_threshold_sorted_points_with_endpoints():
+    y = np.sin(np.linspace(0, 20, 10_000))
+    keep = lttb_indices(y, 500)
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_lttb_keeps_spikes():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=20_000)
+    y[7_777], y[12_345] = 100.0, -100.0
+    keep = lttb_indices(y, 200)
+    assert 7_777 in keep and 12_345 in keep
+
+
+def test_line_points_skip_nan_and_keep_row_positions():
+    series = pd.Series([1.0, np.nan, 3.0, 4.0, np.nan, 6.0], name="Sales")
+    points = line_points(series, max_points=100)
+    assert points["Row"].tolist() == [0, 2, 3, 5]
+    assert points["Sales"].tolist() == [1.0, 3.0, 4.0, 6.0]
+    assert len(line_points(pd.Series(np.arange(10_000.0), name="v"), max_points=300)) == 300
+
+
+def test_bar_points_bin_means_ignore_nan():
+    series = pd.Series([1.0, 3.0, np.nan, 5.0, 7.0, 9.0], name="v")
+    points = bar_points(series, max_points=3)
+    assert points["Row"].tolist() == [0, 2, 4]
+    assert points["v"].tolist() == [2.0, 5.0, 8.0]
+    assert len(bar_points(series, max_points=10)) == len(series)
+
+
+def test_histogram_counts_every_non_null_value():
+    series = pd.Series(np.r_[np.arange(1_000.0), [np.nan] * 5])
+    bins = histogram_bins(series, bins=10)
+    assert bins["count"].sum() == 1_000
+    assert len(bins) == 10
+    assert histogram_bins(pd.Series([np.nan])).empty
+
+
+def test_box_stats_match_numpy_and_iqr_fences():
+    values = np.r_[np.arange(1.0, 101.0), 1_000.0]
+    stats = box_stats(pd.Series(values))
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    assert (stats["q1"], stats["median"], stats["q3"]) == (q1, median, q3)
+    assert stats["upperfence"] == 100.0 and stats["lowerfence"] == 1.0
+    assert box_stats(pd.Series([np.nan])) is None
+
+
+def test_pie_slices_fold_small_groups_into_other():
+    df = pd.DataFrame({"City": list("ABCDE"), "Sales": [50, 40, 30, 2, 1]})
+    slices = pie_slices(df, "City", "Sales", max_slices=3)
+    assert slices["City"].tolist() == ["A", "B", "Other"]
+    assert slices["Sales"].sum() == df["Sales"].sum()
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from tools.column_index import ColumnIndexes, HashIndex, SortedIndex, positions_to_mask
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "city": ["Pune", "Delhi", None, "Pune", "Agra", "Delhi"],
+        "sales": [10.0, np.nan, 30.0, 10.0, 5.0, 20.0],
+        "date": pd.to_datetime(["2024-01-03", "2024-01-01", None, "2024-01-02", "2024-01-05", "2024-01-01"]),
+    })
+
+
+def test_hash_index_keeps_row_order_and_skips_missing(df):
+    index = HashIndex(df["city"])
+    assert index.equal("Pune").tolist() == [0, 3]
+    assert index.equal("Mumbai").tolist() == []
+    assert sorted(index.isin(["Delhi", "Agra"]).tolist()) == [1, 4, 5]
+
+
+def test_sorted_index_equal_and_range(df):
+    index = SortedIndex(df["sales"])
+    assert index.equal(10.0).tolist() == [0, 3]
+    # NaN kabhi match nahi hota
+    assert sorted(index.range(low=10.0).tolist()) == [0, 2, 3, 5]
+    assert sorted(index.range(low=10.0, include_low=False, high=30.0, include_high=False).tolist()) == [5]
+    assert index.range(low=40.0).tolist() == []
+
+
+def test_sorted_index_accepts_timestamps(df):
+    index = SortedIndex(df["date"])
+    assert sorted(index.equal(pd.Timestamp("2024-01-01")).tolist()) == [1, 5]
+    assert sorted(index.range(high=pd.Timestamp("2024-01-02")).tolist()) == [1, 3, 5]
+
+
+def test_indexes_built_lazily_per_column(df):
+    indexes = ColumnIndexes(min_rows=0, enabled=True)
+    assert "city" not in indexes
+    assert indexes.get(df, "city").kind == "hash"
+    assert indexes.get(df, "sales").kind == "sorted"
+    assert indexes.get(df, "city") is indexes.get(df, "city")
+    # Galat kind maanga to None
+    assert indexes.get(df, "city", kind="sorted") is None
+
+
+def test_new_frame_resets_indexes(df):
+    indexes = ColumnIndexes(min_rows=0, enabled=True)
+    first = indexes.get(df, "city")
+    sorted_df = df.sort_values("sales")
+    assert indexes.get(sorted_df, "city") is not first
+    assert "sales" not in indexes
+
+
+def test_invalidate_after_in_place_change(df):
+    indexes = ColumnIndexes(min_rows=0, enabled=True)
+    indexes.get(df, "city")
+    indexes.get(df, "sales")
+    df.loc[0, "city"] = "Agra"
+    indexes.invalidate("city")
+    assert "city" not in indexes and "sales" in indexes
+    assert indexes.get(df, "city").equal("Agra").tolist() == [0, 4]
+    indexes.invalidate()
+    assert "sales" not in indexes
+
+
+def test_small_or_disabled_frames_are_not_indexed(df):
+    assert ColumnIndexes(min_rows=len(df) + 1, enabled=True).get(df, "city") is None
+    assert ColumnIndexes(min_rows=0, enabled=False).get(df, "city") is None
+
+
+def test_positions_to_mask_keeps_frame_index(df):
+    df = df.set_index(pd.Index(list("abcdef")))
+    mask = positions_to_mask(np.array([1, 4]), df)
+    assert mask[mask].index.tolist() == ["b", "e"]
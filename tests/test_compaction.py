@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.compaction import compact_dtypes
+
+
+def compacted(values):
+    result, _ = compact_dtypes(pd.DataFrame({"Date": values}), category_max_ratio=0)
+    return result["Date"]
+
+
+@pytest.mark.parametrize("values, expected", [
+    (["2024-01-31", "2024-02-01", None], ["2024-01-31", "2024-02-01", None]),
+    (["2024-01-31 10:30", "2024-02-01", "2024-02-03"], ["2024-01-31 10:30", "2024-02-01", "2024-02-03"]),
+    (["31/01/2024", "01/02/2024", "15/03/2024"], ["2024-01-31", "2024-02-01", "2024-03-15"]),
+    (["01/31/2024", "02/01/2024", "03/15/2024"], ["2024-01-31", "2024-02-01", "2024-03-15"]),
+])
+def test_unambiguous_dates_are_parsed(values, expected):
+    result = compacted(values)
+    assert pd.api.types.is_datetime64_any_dtype(result)
+    pd.testing.assert_series_equal(result, pd.Series(pd.to_datetime(expected, format="ISO8601"), name="Date"))
+
+
+@pytest.mark.parametrize("values", [
+    # dd/mm aur mm/dd dono chalte hain - alag dates
+    ["03/04/2024", "05/06/2024", "07/08/2024"],
+    # Har value ek format me nahi aati
+    ["31/01/2024", "01/31/2024", "15/03/2024"],
+])
+def test_ambiguous_or_mixed_dates_stay_text(values):
+    result = compacted(values)
+    assert not pd.api.types.is_datetime64_any_dtype(result)
+    assert result.tolist() == values
+
+
+def test_compaction_keeps_sum_and_mean():
+    # calculate_sum / calculate_average isi backend aggregate se chalte hain
+    from tools.backends import get_backend
+
+    values = np.arange(3_000_000) % 200_000 + 0.5
+    df = pd.DataFrame({"Amount": values, "Units": np.arange(3_000_000) % 100})
+    compact, _ = compact_dtypes(df)
+    backend = get_backend()
+    for column in df.columns:
+        for op in ("sum", "mean"):
+            assert backend.aggregate(compact, column, op) == backend.aggregate(df, column, op)
+    assert backend.aggregate(compact, "Amount", "sum") == values.sum()
@@ -0,0 +1,108 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+from tools.context import ContextBuilder, TokenCounter
+
+
+class _WordVocab:
+    """Fake llama_cpp vocab - har word/space/punctuation ek token"""
+
+    def tokenize(self, data, add_bos=False):
+        return re.findall(rb"\w+|\s|[^\w\s]", data)
+
+    def detokenize(self, tokens):
+        return b"".join(tokens)
+
+
+def _exact_counter():
+    counter = TokenCounter(model_path="missing.gguf")
+    counter._loaded = True
+    counter._vocab = _WordVocab()
+    return counter
+
+
+@pytest.fixture(params=["estimate", "exact"])
+def counter(request):
+    if request.param == "estimate":
+        # Model file nahi - bytes-per-token estimate
+        return TokenCounter(model_path="missing.gguf")
+    return _exact_counter()
+
+
+def _wide_frame(rows=500, columns=60):
+    rng = np.random.default_rng(0)
+    data = {}
+    for i in range(columns):
+        if i % 3 == 0:
+            data[f"amount_{i}"] = rng.normal(1000, 250, rows).round(2)
+        elif i % 3 == 1:
+            data[f"customer_name_{i}"] = rng.choice(["Asha Verma", "Rohit Mehra", "Kavya Iyer", "Dev Anand"], rows)
+        else:
+            data[f"order_date_{i}"] = pd.date_range("2024-01-01", periods=rows, freq="h")
+    return pd.DataFrame(data)
+
+
+FRAMES = {
+    "empty": pd.DataFrame({"a": pd.Series(dtype=float), "b": pd.Series(dtype=object)}),
+    "small": pd.DataFrame({"City": ["Pune", "Delhi", None], "Sales": [1.5, np.nan, 3.0]}),
+    "wide": _wide_frame(),
+    "long_text": pd.DataFrame({"notes": ["x" * 5000, "y" * 5000], "flag": [True, False]}),
+}
+
+
+@pytest.mark.parametrize("name", FRAMES)
+@pytest.mark.parametrize("max_tokens", [40, 80, 200, 600, 2000])
+def test_data_context_stays_within_budget(counter, name, max_tokens):
+    text = ContextBuilder(counter=counter).data_context(FRAMES[name], max_tokens)
+    assert counter.count(text) <= max_tokens
+    assert text.startswith("Rows:")
+
+
+def test_data_context_lists_hidden_columns_when_tight(counter):
+    df = _wide_frame()
+    text = ContextBuilder(counter=counter).data_context(df, 200)
+    # Note khud budget me kata hua - aakhri truncate use nahi hatata
+    assert "more columns" in text
+    assert counter.count(text) <= 200
+
+
+def test_data_context_includes_sample_rows_with_room(counter):
+    text = ContextBuilder(counter=counter).data_context(FRAMES["small"], 600)
+    assert "- City (text" in text and "- Sales (float64" in text
+    assert "Sample rows:" in text
+
+
+@pytest.mark.parametrize("max_tokens", [50, 300])
+def test_truncate_keeps_whole_lines_within_budget(counter, max_tokens):
+    text = "\n".join(f"row {i}: value {i * 7}" for i in range(200))
+    result = counter.truncate(text, max_tokens)
+    assert counter.count(result) <= max_tokens
+    assert result.endswith("more lines truncated)")
+    kept = result.splitlines()[:-1]
+    assert kept == text.splitlines()[:len(kept)]
+
+
+def test_truncate_cuts_single_long_line(counter):
+    result = counter.truncate("word " * 2000, 50)
+    assert counter.count(result) <= 50
+    assert result.endswith("... (truncated)")
+
+
+def test_truncate_leaves_short_text_alone(counter):
+    assert counter.truncate("short text", 50) == "short text"
+
+
+def test_cut_never_splits_utf8(counter):
+    text = "दिल्ली पुणे आगरा " * 50
+    cut = counter.cut(text, 10)
+    assert counter.count(cut) <= 10
+    assert text.startswith(cut)
+    assert counter.cut(text, 0) == ""
+
+
+def test_estimate_used_without_model():
+    counter = TokenCounter(model_path="missing.gguf")
+    assert not counter.exact
+    assert counter.count("abcdef") == 2
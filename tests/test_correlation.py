@@ -0,0 +1,71 @@
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import correlation
+from tools.correlation import CorrelationService
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=500)
+    df = pd.DataFrame({
+        "a": base,
+        "b": base * 2 + rng.normal(scale=0.1, size=500),
+        "c": rng.normal(size=500),
+        "d": -base + rng.normal(scale=0.5, size=500),
+        "City": ["Delhi", "Pune"] * 250,
+    })
+    df.loc[::7, "c"] = np.nan
+    return df
+
+
+def test_matrix_matches_pandas_corr(df):
+    result = CorrelationService().matrix(df)
+    expected = df.select_dtypes("number").corr()
+    pd.testing.assert_frame_equal(result, expected, atol=1e-12)
+
+
+def test_constant_column_gives_nan_row(df):
+    df = df.assign(flat=1.0)
+    result = CorrelationService().matrix(df)
+    assert result["flat"].isna().all()
+
+
+def test_same_frame_is_served_from_cache(df):
+    service = CorrelationService()
+    first = service.matrix(df)
+    with mock.patch.object(correlation, "_column_key", wraps=correlation._column_key) as keys:
+        assert service.matrix(df) is first
+    keys.assert_not_called()
+
+
+def test_new_column_only_computes_its_correlations(df):
+    service = CorrelationService()
+    service.matrix(df)
+    extended = df.assign(e=df["a"] + df["c"].fillna(0))
+    with mock.patch.object(correlation, "pairwise_corr", wraps=correlation.pairwise_corr) as corr:
+        result = service.matrix(extended)
+    # Sirf naye column ki rows: new x known aur new x new
+    assert corr.call_count == 2
+    assert all(call.args[0].shape[1] == 1 for call in corr.call_args_list)
+    expected = extended.select_dtypes("number").corr()
+    pd.testing.assert_frame_equal(result, expected, atol=1e-12)
+
+
+def test_forget_after_in_place_edit(df):
+    service = CorrelationService()
+    assert service.matrix(df).loc["a", "b"] > 0.9
+    df["b"] = -df["b"]
+    service.forget(df)
+    assert service.matrix(df).loc["a", "b"] < -0.9
+
+
+def test_top_pairs_sorted_by_strength(df):
+    pairs = CorrelationService().top_pairs(df, k=3)
+    strengths = pairs["Correlation"].abs().tolist()
+    assert strengths == sorted(strengths, reverse=True)
+    assert set(pairs.iloc[0][["Column A", "Column B"]]) == {"a", "b"}
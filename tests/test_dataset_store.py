@@ -0,0 +1,92 @@
+import gc
+import io
+import threading
+
+import pandas as pd
+import pytest
+
+from tools.dataset_store import DatasetStore
+
+
+def xlsx_bytes(df):
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def files():
+    return [xlsx_bytes(pd.DataFrame({"Value": range(i * 10, i * 10 + 5)})) for i in range(3)]
+
+
+def test_same_file_is_parsed_once_and_shared(files):
+    store = DatasetStore(compact=False)
+    first = store.acquire(files[0])
+    second = store.acquire(files[0])
+    assert store.misses == 1 and store.hits == 1
+    assert first.key == second.key
+    assert store.refcount(first.key) == 2
+    pd.testing.assert_frame_equal(first.df, second.df)
+
+
+def test_release_is_idempotent_and_drops_refcount(files):
+    store = DatasetStore(compact=False)
+    lease = store.acquire(files[0])
+    other = store.acquire(files[0])
+    lease.release()
+    lease.release()
+    assert lease.released
+    assert store.refcount(lease.key) == 1
+    other.release()
+    assert store.refcount(lease.key) == 0
+    assert store.stats()["active_leases"] == 0
+
+
+def test_garbage_collected_lease_releases(files):
+    store = DatasetStore(compact=False)
+    key = store.acquire(files[0]).key
+    gc.collect()
+    assert store.refcount(key) == 0
+
+
+def test_only_unreferenced_entries_are_evicted(files):
+    store = DatasetStore(max_entries=1, compact=False)
+    held = store.acquire(files[0])
+    dropped = store.acquire(files[1])
+    dropped.release()
+    store.acquire(files[2]).release()
+    # files[0] lease active hai - evict nahi hua; files[1] hat gaya
+    assert held.key in store
+    assert dropped.key not in store
+    held.release()
+    store.acquire(files[1]).release()
+    assert held.key not in store
+
+
+def test_failed_parse_does_not_leak_key_lock():
+    store = DatasetStore(compact=False)
+    for _ in range(2):
+        with pytest.raises(Exception):
+            store.acquire(b"not an excel file")
+    assert store._key_locks == {}
+    assert store.stats()["active_leases"] == 0
+
+
+def test_key_lock_is_dropped_after_acquire(files):
+    store = DatasetStore(compact=False)
+    lease = store.acquire(files[0])
+    assert store._key_locks == {}
+    lease.release()
+
+
+def test_concurrent_acquires_parse_once(files):
+    store = DatasetStore(compact=False)
+    leases = []
+    threads = [threading.Thread(target=lambda: leases.append(store.acquire(files[0]))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.misses == 1
+    assert store.refcount(leases[0].key) == 4
+    assert store._key_locks == {}
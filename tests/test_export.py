@@ -0,0 +1,31 @@
+import gzip
+
+import pandas as pd
+import pytest
+
+from tools.export import available_formats, export_frame
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"City": ["Delhi", "Pune"], "Salary": [50, 40]})
+
+
+def test_xlsx_offers_no_compression():
+    _, compressions = available_formats("xlsx")
+    assert compressions == [None]
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_xlsx_with_compression_is_rejected(tmp_path, df, compression):
+    with pytest.raises(ValueError, match="does not support"):
+        export_frame(df, "xlsx", compression, directory=tmp_path)
+    assert not list(tmp_path.iterdir())
+
+
+def test_csv_gzip_export(tmp_path, df):
+    path, mime = export_frame(df, "csv", "gzip", directory=tmp_path)
+    assert path.name.endswith(".csv.gz")
+    assert mime == "application/gzip"
+    with gzip.open(path, "rt") as handle:
+        assert handle.read().splitlines() == ["City,Salary", "Delhi,50", "Pune,40"]
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from tools.column_index import ColumnIndexes
+from tools.filter_expr import compile_mask, filter_rows, parse_filter
+
+
+def _frame(rows=2000):
+    rng = np.random.default_rng(0)
+    nulls = rng.random(rows) < 0.1
+    ints = pd.array(rng.integers(0, 5, rows), dtype="Int64")
+    ints[nulls] = pd.NA
+    floats = rng.integers(0, 5, rows).astype(float)
+    floats[nulls] = np.nan
+    text = pd.Series(rng.choice(["a", "b", "c"], rows), dtype=object)
+    text[nulls] = None
+    return pd.DataFrame({
+        "ints": ints,
+        "floats": floats,
+        "text": text,
+        "arrow": text.astype("string[pyarrow]"),
+        "cat": text.astype("category"),
+    })
+
+
+EXPRESSIONS = [
+    "{col} = {value}",
+    "{col} != {value}",
+    "{col} IN ({value})",
+    "{col} NOT IN ({value})",
+    "NOT ({col} = {value})",
+]
+
+
+@pytest.mark.parametrize("column,value", [
+    ("ints", "2"), ("floats", "2"), ("text", "'b'"), ("arrow", "'b'"), ("cat", "'b'"),
+])
+@pytest.mark.parametrize("template", EXPRESSIONS)
+def test_indexed_and_scan_paths_match(column, value, template):
+    df = _frame()
+    node = parse_filter(template.format(col=column, value=value), df.columns)
+    scan = filter_rows(df, node)
+    indexed = filter_rows(df, node, ColumnIndexes(min_rows=0))
+    pd.testing.assert_frame_equal(scan, indexed)
+
+
+@pytest.mark.parametrize("column", ["ints", "floats", "text", "arrow", "cat"])
+def test_not_equal_keeps_null_rows(column):
+    df = _frame()
+    node = parse_filter(f"{column} != {'2' if column in ('ints', 'floats') else repr('b')}", df.columns)
+    mask = compile_mask(node, df)
+    assert mask.dtype == bool
+    assert mask[df[column].isna()].all()
+
+
+@pytest.mark.parametrize("expression", ["ints > 2", "floats BETWEEN 1 AND 3", "ints <= 1"])
+def test_range_paths_match(expression):
+    df = _frame()
+    node = parse_filter(expression, df.columns)
+    pd.testing.assert_frame_equal(filter_rows(df, node), filter_rows(df, node, ColumnIndexes(min_rows=0)))
+
+
+@pytest.mark.parametrize("expression", [
+    "text ~ '['",
+    "text MATCHES '(a'",
+    "mixed > 5",
+    "mixed BETWEEN 1 AND 5",
+])
+def test_bad_user_input_raises_filter_syntax_error(expression):
+    from tools.filter_expr import FilterSyntaxError, apply_filter
+    df = pd.DataFrame({"text": ["a", "b", None], "mixed": [1, "x", 3]})
+    with pytest.raises(FilterSyntaxError):
+        apply_filter(df, expression)
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("Name LIKE 'A%'", ["Alice", "Anna", "A.Cole", "ABCole"]),
+    ("Name LIKE '%a'", ["Anna", "Bella"]),
+    ("Name LIKE '_nna'", ["Anna"]),
+    ("Name LIKE 'a.c%'", ["A.Cole"]),
+    ("Name LIKE '%(x)%'", ["Bob (x)"]),
+    ("Name LIKE 'Alice'", ["Alice"]),
+])
+def test_like_uses_sql_wildcards(expression, expected):
+    from tools.filter_expr import apply_filter
+    df = pd.DataFrame({"Name": ["Alice", "Anna", "Bella", "xA%", "A.Cole", "ABCole", "Bob (x)", None]})
+    assert apply_filter(df, expression)["Name"].tolist() == expected
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+from tools.column_index import ColumnIndexes
+from tools.filter_expr import FilterSyntaxError
+from tools.grid import GridView
+from tools.pipeline import OperationPipeline
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "id": range(1, 251),
+        "city": ["Pune", "Delhi", "Agra", "Goa", "Leh"] * 50,
+        "sales": [(i * 37) % 101 for i in range(250)],
+    })
+
+
+def test_pages_are_slices_of_the_frame(df):
+    grid = GridView(df, page_size=100)
+    assert grid.page_count == 3
+    pd.testing.assert_frame_equal(grid.current_page(), df.iloc[:100])
+    grid.go_to(2)
+    pd.testing.assert_frame_equal(grid.current_page(), df.iloc[200:])
+    assert grid.row_range() == (201, 250)
+
+
+@pytest.mark.parametrize("requested,expected", [(-3, 0), (1, 1), (99, 2)])
+def test_go_to_clamps_page_number(df, requested, expected):
+    assert GridView(df, page_size=100).go_to(requested) == expected
+
+
+def test_sort_and_filter_match_pandas_and_reset_page(df):
+    grid = GridView(df, page_size=20, indexes=ColumnIndexes(min_rows=0))
+    grid.go_to(3)
+    grid.set_filter("city = 'Pune'")
+    assert grid.page_number == 0
+    grid.go_to(1)
+    grid.set_sort("sales", ascending=False)
+    assert grid.page_number == 0
+
+    expected = df[df["city"] == "Pune"].sort_values("sales", ascending=False, kind="stable")
+    assert grid.total_rows == 50 and grid.page_count == 3
+    grid.go_to(2)
+    assert grid.current_page()["id"].tolist() == expected["id"].iloc[40:].tolist()
+
+
+def test_bad_filter_keeps_previous_view(df):
+    grid = GridView(df, page_size=20)
+    grid.set_filter("city = 'Goa'")
+    with pytest.raises(FilterSyntaxError):
+        grid.set_filter("city = = 'Goa'")
+    assert grid.filter_expression == "city = 'Goa'"
+    assert grid.total_rows == 50
+
+
+def test_page_size_change_keeps_first_visible_row(df):
+    grid = GridView(df, page_size=25)
+    grid.go_to(5)  # rows 126-150
+    grid.set_page_size(100)
+    assert grid.page_number == 1
+    assert grid.row_range() == (101, 200)
+
+
+def test_empty_result_has_one_empty_page(df):
+    grid = GridView(df, page_size=20)
+    grid.set_filter("sales > 1000")
+    assert grid.page_count == 1
+    assert grid.current_page().empty
+    assert grid.row_range() == (0, 0)
+
+
+def test_pipeline_source_is_shown_as_is(df):
+    pipeline = OperationPipeline(df)
+    pipeline.filter("city = 'Leh'")
+    grid = GridView(pipeline, page_size=10)
+    assert not grid.controls_enabled
+    assert grid.view is pipeline
+    assert grid.total_rows == 50 and grid.page_count == 5
@@ -0,0 +1,77 @@
+import io
+
+import pandas as pd
+import pytest
+
+from tools.ingest_cache import IngestCache, content_hash
+
+
+def frame(rows):
+    return pd.DataFrame({"Value": range(rows)})
+
+
+def xlsx_bytes(df):
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def test_same_bytes_are_parsed_once():
+    cache = IngestCache()
+    data = xlsx_bytes(frame(5))
+    key, first = cache.load_excel(data)
+    again_key, second = cache.load_excel(bytearray(data))
+    assert key == again_key
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_sheet_and_options_are_part_of_the_key():
+    digest = content_hash(b"abc")
+    assert IngestCache.make_key(digest, 0) != IngestCache.make_key(digest, "Sheet2")
+    assert IngestCache.make_key(digest, 0, header=None) != IngestCache.make_key(digest, 0)
+    assert IngestCache.make_key(digest, 0, a=1, b=2) == IngestCache.make_key(digest, 0, b=2, a=1)
+
+
+def test_lru_evicts_oldest_entry_by_count():
+    cache = IngestCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, frame(3))
+    cache.get("a")
+    cache.put("c", frame(3))
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_byte_budget_is_enforced_and_tracked():
+    size = int(frame(1000).memory_usage(deep=True).sum())
+    cache = IngestCache(max_entries=10, max_bytes=size * 2)
+    for key in ("a", "b", "c"):
+        cache.put(key, frame(1000))
+    assert len(cache) == 2
+    assert cache.total_bytes == size * 2
+    assert "a" not in cache
+
+
+def test_single_oversized_frame_is_kept():
+    cache = IngestCache(max_bytes=1)
+    cache.put("big", frame(1000))
+    assert "big" in cache
+
+
+def test_replacing_a_key_does_not_double_count_bytes():
+    cache = IngestCache()
+    cache.put("a", frame(10))
+    cache.put("a", frame(10))
+    assert cache.total_bytes == int(frame(10).memory_usage(deep=True).sum())
+    cache.clear()
+    assert cache.total_bytes == 0 and len(cache) == 0
+
+
+def test_compaction_report_is_kept_per_entry():
+    cache = IngestCache(compact=True)
+    df = pd.DataFrame({"City": ["Delhi", "Pune"] * 50, "Age": range(100)})
+    key, compacted = cache.load_excel(xlsx_bytes(df))
+    report = cache.report(key)
+    assert report["after"] < report["before"]
+    assert str(compacted["City"].dtype) == "category"
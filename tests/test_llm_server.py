@@ -0,0 +1,249 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from llm_server import CompletionScheduler, InferenceWorkerPool, _Job
+
+REACT_STOP = ["\nObservation:"]
+SQL_STOP = ["\nQuestion:"]
+
+
+def job(prompt="x", stop=REACT_STOP, **params):
+    return _Job({"prompt": prompt, "stop": stop, **params})
+
+
+def drain(scheduler, count):
+    return [scheduler.get() for _ in range(count)]
+
+
+def test_without_history_shorter_prompt_goes_first():
+    scheduler = CompletionScheduler(max_queue=8, aging_rate=0, group_bonus=0)
+    long_job, short_job = job("x" * 4000), job("x" * 40)
+    scheduler.put(long_job)
+    scheduler.put(short_job)
+    assert drain(scheduler, 2) == [short_job, long_job]
+
+
+def test_expected_output_per_request_type_orders_jobs():
+    scheduler = CompletionScheduler(max_queue=8, aging_rate=0, group_bonus=0)
+    # ReAct steps lambe likhte hain, SQL ek chhoti line
+    scheduler.record_output(job(stop=REACT_STOP), 200)
+    scheduler.record_output(job(stop=SQL_STOP), 20)
+    react, sql = job("x" * 400, stop=REACT_STOP), job("x" * 400, stop=SQL_STOP)
+    scheduler.put(react)
+    scheduler.put(sql)
+    assert drain(scheduler, 2) == [sql, react]
+
+
+def test_expected_output_is_a_moving_average_capped_by_max_tokens():
+    scheduler = CompletionScheduler(max_queue=8)
+    sample = job()
+    scheduler.record_output(sample, 100)
+    scheduler.record_output(sample, 200)
+    assert 100 < scheduler.expected_output(sample) < 200
+    assert job(max_tokens=50).cost(scheduler.expected_output(sample)) == pytest.approx(50 + 0.25 * 0.1)
+
+
+def test_aging_lets_old_long_job_run():
+    scheduler = CompletionScheduler(max_queue=8, aging_rate=1000, group_bonus=0)
+    old = job("x" * 4000)
+    old.enqueued_at -= 10
+    scheduler.put(old)
+    scheduler.put(job("x"))
+    assert scheduler.get() is old
+
+
+def test_same_sampling_params_get_group_bonus():
+    scheduler = CompletionScheduler(max_queue=8, aging_rate=0, group_bonus=10_000)
+    other = job("x", temperature=0.9)
+    same = job("x" * 400)
+    scheduler.put(other)
+    scheduler.put(same)
+    assert scheduler.get(last_key=same.sampling_key) is same
+
+
+def test_full_queue_raises():
+    scheduler = CompletionScheduler(max_queue=1)
+    scheduler.put(job())
+    with pytest.raises(queue.Full):
+        scheduler.put(job())
+
+
+class FakeModel:
+    def __call__(self, prompt, max_tokens, stream=True, **kwargs):
+        for token in prompt.split():
+            yield {"choices": [{"text": token}]}
+
+
+def test_pool_counts_completions_from_all_workers():
+    pool = InferenceWorkerPool(workers=3, max_queue=64, model_factory=FakeModel)
+    pool.start()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pool.submit({"prompt": "a b c"}, timeout=5)))
+        for _ in range(30)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result["ok"] and result["text"] == "abc" for result in results)
+    deadline = time.monotonic() + 5
+    while pool.stats()["completed"] < 30 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.stats()["completed"] == 30
+    assert pool.scheduler.expected_output(_Job({"prompt": ""})) == pytest.approx(3)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Fake model wala asli server (Unix socket pe, background thread me)"""
+    from llm_server import create_server
+
+    pool = InferenceWorkerPool(workers=1, max_queue=8, model_factory=FakeModel)
+    pool.start()
+    socket_path = str(tmp_path / "llm.sock")
+    server = create_server(pool, socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, socket_path
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_completes_through_warm_server(server):
+    from llm_server import LLMServerClient
+
+    _, socket_path = server
+    client = LLMServerClient(socket_path=socket_path, timeout=5)
+    assert client.ping()
+    assert client.complete("hello warm world") == "hellowarmworld"
+    response = client.submit({"prompt": "a b"})
+    assert response["text"] == "ab" and response["queue_time"] >= 0
+    assert client.stats()["completed"] == 2
+    client.close()
+
+
+def test_client_reconnects_after_dropped_connection(server):
+    from llm_server import LLMServerClient
+
+    _, socket_path = server
+    client = LLMServerClient(socket_path=socket_path, timeout=5)
+    assert client.complete("one") == "one"
+    # Server side connection band - agla request naya connection banaye
+    client._sock.shutdown(2)
+    assert client.complete("two") == "two"
+
+
+def test_ping_is_false_without_server(tmp_path):
+    from llm_server import LLMServerClient
+
+    assert not LLMServerClient(socket_path=str(tmp_path / "missing.sock"), timeout=1).ping()
+
+
+class CachingModel(FakeModel):
+    """llama.cpp jaisa KV cache API - warm_prefix ke calls record karta hai"""
+
+    def __init__(self):
+        self.cache = {}
+        self.evaluated = []
+
+    def tokenize(self, data):
+        return tuple(data.decode("utf-8").split())
+
+    def reset(self):
+        pass
+
+    def eval(self, tokens):
+        self.evaluated.append(tokens)
+
+    def save_state(self):
+        return f"state:{len(self.evaluated)}"
+
+
+def test_warm_prefix_stores_prefix_state():
+    from llm_server import warm_prefix
+
+    model = CachingModel()
+    assert warm_prefix(model, "You are an agent")
+    assert model.cache == {("You", "are", "an", "agent"): "state:1"}
+    assert not warm_prefix(FakeModel(), "no cache here")
+
+
+def test_pool_warms_each_prefix_once_per_worker_before_jobs():
+    models = []
+
+    def factory():
+        models.append(CachingModel())
+        return models[-1]
+
+    pool = InferenceWorkerPool(workers=2, max_queue=16, model_factory=factory)
+    assert pool.warm_prefix("static react prefix")
+    assert not pool.warm_prefix("static react prefix")
+    pool.start()
+    for _ in range(4):
+        assert pool.submit({"prompt": "static react prefix question"}, timeout=5)["ok"]
+    # Jis worker ne koi job chalaya usne prefix ek hi baar evaluate kiya
+    for model in models:
+        assert model.evaluated.count(("static", "react", "prefix")) <= 1
+    assert any(model.cache for model in models)
+
+
+def test_client_registers_prefix_on_server(server):
+    from llm_server import LLMServerClient
+
+    pool_server, socket_path = server
+    client = LLMServerClient(socket_path=socket_path, timeout=5)
+    client.warm_prefix("shared prefix")
+    client.warm_prefix("shared prefix")
+    assert pool_server.pool.prefixes == ["shared prefix"]
+
+
+def test_pool_stream_yields_tokens_then_done():
+    pool = InferenceWorkerPool(workers=1, max_queue=4, model_factory=FakeModel)
+    pool.start()
+    events = list(pool.stream({"prompt": "one two three"}, timeout=5))
+    assert [event["token"] for event in events[:-1]] == ["one", "two", "three"]
+    assert events[-1]["ok"] and events[-1]["done"] and events[-1]["queue_time"] >= 0
+
+
+def test_pool_stream_reports_model_errors():
+    class BrokenModel:
+        def __call__(self, prompt, **kwargs):
+            yield {"choices": [{"text": "partial"}]}
+            raise RuntimeError("kv cache full")
+
+    pool = InferenceWorkerPool(workers=1, max_queue=4, model_factory=BrokenModel)
+    pool.start()
+    events = list(pool.stream({"prompt": "x"}, timeout=5))
+    assert events[0] == {"token": "partial"}
+    assert events[-1] == {"ok": False, "error": "kv cache full"}
+
+
+def test_client_streams_tokens_from_server(server):
+    from llm_server import LLMServerClient
+
+    _, socket_path = server
+    client = LLMServerClient(socket_path=socket_path, timeout=5)
+    events = list(client.stream({"prompt": "streamed over socket"}))
+    assert "".join(event.get("token", "") for event in events) == "streamedoversocket"
+    assert events[-1]["done"]
+    # Stream ke baad wahi connection normal requests ke liye chalta hai
+    assert client.complete("after stream") == "afterstream"
+
+
+def test_streaming_callback_accumulates_text_per_step():
+    pytest.importorskip("llama_cpp")
+    pytest.importorskip("langchain")
+    from agent import StreamingCallback
+
+    seen = []
+    callback = StreamingCallback(seen.append)
+    callback.on_llm_start({}, ["prompt"])
+    for token in ("Thought", ":", " sum"):
+        callback.on_llm_new_token(token)
+    callback.on_llm_start({}, ["prompt"])
+    callback.on_llm_new_token("Final")
+    assert seen[-1] == "Thought: sum\n\nFinal"
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from tools.filter_expr import parse_filter
+from tools.pipeline import OperationPipeline, _State, optimize
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "City": ["Delhi", "Pune", "Delhi", "Mumbai", "Pune", "Delhi"],
+        "Age": [30, 25, 41, 35, 25, 30],
+        "Salary": [50, 40, 70, 65, 45, 55],
+    })
+
+
+def filter_step(df, expression):
+    return ("filter", parse_filter(expression, df.columns), expression)
+
+
+def naive(df, steps):
+    """Bina optimize kiye steps ek-ek karke chalao"""
+    pipeline = OperationPipeline(df)
+    state = _State(df)
+    for step in steps:
+        state = pipeline._apply(state, step)
+    return state.take().reset_index(drop=True)
+
+
+def optimized(df, steps):
+    pipeline = OperationPipeline(df)
+    pipeline.steps = tuple(steps)
+    return pipeline.to_frame().reset_index(drop=True)
+
+
+def test_filter_filter_fuses(df):
+    steps = [filter_step(df, "Age > 26"), filter_step(df, "City = 'Delhi'")]
+    plan = optimize(steps)
+    assert [step[0] for step in plan] == ["filter"]
+    pd.testing.assert_frame_equal(optimized(df, steps), naive(df, steps))
+
+
+def test_sort_sort_fuses_into_one_stable_sort(df):
+    steps = [("sort", ("Salary",), (False,)), ("sort", ("Age",), (True,))]
+    assert optimize(steps) == (("sort", ("Age", "Salary"), (True, False)),)
+    pd.testing.assert_frame_equal(optimized(df, steps), naive(df, steps))
+
+
+def test_assign_assign_merges_later_value_wins(df):
+    steps = [("assign", (("Bonus", 1), ("Team", "A"))), ("assign", (("Bonus", 2),))]
+    assert optimize(steps) == (("assign", (("Team", "A"), ("Bonus", 2))),)
+    pd.testing.assert_frame_equal(optimized(df, steps), naive(df, steps))
+
+
+def test_filter_pushed_below_sort(df):
+    steps = [("sort", ("Salary",), (True,)), filter_step(df, "City = 'Pune'")]
+    assert [step[0] for step in optimize(steps)] == ["filter", "sort"]
+    pd.testing.assert_frame_equal(optimized(df, steps), naive(df, steps))
+
+
+def test_filter_pushed_below_unrelated_assign(df):
+    steps = [("assign", (("Bonus", 5),)), filter_step(df, "Age = 25")]
+    assert [step[0] for step in optimize(steps)] == ["filter", "assign"]
+    pd.testing.assert_frame_equal(optimized(df, steps), naive(df, steps))
+
+
+def test_filter_on_assigned_column_stays_after_assign(df):
+    df = df.assign(Bonus=0)
+    steps = [("assign", (("Bonus", 5),)), filter_step(df, "Bonus = 5")]
+    assert [step[0] for step in optimize(steps)] == ["assign", "filter"]
+    pd.testing.assert_frame_equal(optimized(df, steps), naive(df, steps))
+
+
+def test_assign_moves_before_unrelated_sort(df):
+    steps = [("sort", ("Age",), (True,)), ("assign", (("Bonus", 5),))]
+    assert [step[0] for step in optimize(steps)] == ["assign", "sort"]
+    pd.testing.assert_frame_equal(optimized(df, steps), naive(df, steps))
+
+
+def test_assign_overwriting_sort_column_keeps_order(df):
+    steps = [("sort", ("Salary",), (False,)), ("assign", (("Salary", 1),))]
+    assert [step[0] for step in optimize(steps)] == ["sort", "assign"]
+    result = optimized(df, steps)
+    pd.testing.assert_frame_equal(result, naive(df, steps))
+    assert result["City"].tolist() == ["Delhi", "Mumbai", "Delhi", "Delhi", "Pune", "Pune"]
+
+
+def test_sort_dropped_before_aggregate(df):
+    steps = [("sort", ("Salary",), (False,)), ("aggregate", ("City",), ("Salary",), ("sum",))]
+    assert [step[0] for step in optimize(steps)] == ["aggregate"]
+    pd.testing.assert_frame_equal(optimized(df, steps), naive(df, steps))
@@ -0,0 +1,91 @@
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import profiling
+from tools.profiling import ColumnProfiler, HyperLogLog, _column_hashes, profile_column
+
+
+@pytest.mark.parametrize("cardinality", [10, 1_000, 50_000, 1_000_000])
+def test_hyperloglog_error_within_bounds(cardinality):
+    sketch = HyperLogLog(14)
+    # Har value 3 baar - duplicates count nahi badhate
+    values = pd.Series(np.tile(np.arange(cardinality), 3))
+    sketch.add_hashes(_column_hashes(values))
+    relative_error = abs(sketch.count() - cardinality) / cardinality
+    # Standard error 1.04/sqrt(2^14) ~ 0.8%; 4 sigma tak
+    assert relative_error < 4 * 1.04 / np.sqrt(1 << 14)
+
+
+def test_hyperloglog_merge_equals_union():
+    left, right, union = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+    a = _column_hashes(pd.Series(np.arange(0, 30_000)))
+    b = _column_hashes(pd.Series(np.arange(20_000, 50_000)))
+    left.add_hashes(a)
+    right.add_hashes(b)
+    union.add_hashes(np.concatenate([a, b]))
+    left.merge(right)
+    assert left.count() == union.count()
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
+
+
+def test_profile_column_matches_pandas():
+    series = pd.Series([1.0, 2.0, 2.0, np.nan, 10.0, 3.5])
+    stats = profile_column(series)
+    assert stats["null"] == 1 and stats["non_null"] == 5
+    assert stats["unique"] == series.nunique() and not stats["unique_approx"]
+    expected = series.describe()
+    for name, value in stats["numeric"].items():
+        assert value == pytest.approx(expected[name])
+
+
+def test_large_columns_switch_to_approximate_distinct():
+    series = pd.Series(np.arange(20_000) % 5_000)
+    stats = profile_column(series, exact_distinct_max_rows=1_000)
+    assert stats["unique_approx"]
+    assert abs(stats["unique"] - 5_000) / 5_000 < 0.05
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "City": ["Delhi", "Pune", None, "Delhi"],
+        "Salary": [50, 40, 70, 65],
+    })
+
+
+def test_same_frame_is_served_from_cache(df):
+    profiler = ColumnProfiler()
+    first = profiler.column_stats(df)
+    with mock.patch.object(profiling, "_column_hashes", wraps=profiling._column_hashes) as hashes:
+        assert profiler.column_stats(df) is first
+    hashes.assert_not_called()
+
+
+def test_sorted_or_extended_frame_only_profiles_new_columns(df):
+    profiler = ColumnProfiler()
+    profiler.column_stats(df)
+    with mock.patch.object(profiling, "profile_column", wraps=profiling.profile_column) as profile:
+        profiler.column_stats(df.sort_values("Salary"))
+        assert profile.call_count == 0
+        profiler.column_stats(df.assign(Bonus=[1, 2, 3, 4]))
+        assert profile.call_count == 1
+
+
+def test_forget_after_in_place_edit(df):
+    profiler = ColumnProfiler()
+    assert profiler.column_stats(df)["Salary"]["numeric"]["max"] == 70
+    df.loc[0, "Salary"] = 500
+    profiler.forget(df)
+    assert profiler.column_stats(df)["Salary"]["numeric"]["max"] == 500
+
+
+def test_column_info_and_describe(df):
+    profiler = ColumnProfiler()
+    info = profiler.column_info(df)
+    assert info["Null Count"].tolist() == [1, 0]
+    assert info["Unique Values"].tolist() == [2, 4]
+    pd.testing.assert_frame_equal(profiler.describe(df), df.describe().astype(float))
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+from tools import ExcelTools, QueryRouter
+
+
+@pytest.fixture
+def router():
+    tools = ExcelTools()
+    tools.df = pd.DataFrame({
+        'Name': list('abcdef'),
+        'City': ['Delhi', 'Pune', 'Delhi', 'Mumbai', 'Pune', 'Delhi'],
+        'Age': [25, 35, 45, 28, 33, 50],
+        'Salary': [100, 400, 200, 150, 300, 250],
+    })
+    return QueryRouter(tools)
+
+
+@pytest.mark.parametrize("question", [
+    "max salary in Delhi",
+    "average salary for people older than 30",
+    "sum of salary by city for people in 2023",
+])
+def test_unrecognized_words_go_to_llm(router, question):
+    assert router.route(question) is None
+
+
+def test_aggregate_applies_where_clause(router):
+    answer = router.route("sum of salary where age > 30")
+    assert answer.startswith("Sum of Salary")
+    assert answer.endswith(": 1150")
+
+
+def test_plain_aggregate_still_routed(router):
+    assert router.route("what is the total Salary") == "Sum of Salary: 1400"
+
+
+def test_filter_still_routed(router):
+    assert "3 rows" in router.route("rows where City = 'Delhi'")
+    assert router.route("show rows where City is Delhi") is not None
+
+
+def test_sort_does_not_reorder_dataset(router):
+    before = router.excel_tools.df.copy()
+    answer = router.route("sort by Salary descending")
+    assert answer.startswith("✅ Data sorted by Salary")
+    pd.testing.assert_frame_equal(router.excel_tools.df, before)
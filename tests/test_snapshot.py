@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from tools.snapshot import SnapshotStore
+
+
+@pytest.mark.parametrize("columns", [
+    ["Name", "Age"],
+    [0, 1],
+    [1.5, 2.5],
+    [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")],
+])
+def test_snapshot_keeps_column_labels(tmp_path, columns):
+    store = SnapshotStore(tmp_path, enabled=True)
+    df = pd.DataFrame([[1, 2], [3, 4]], columns=columns)
+    assert store.save("digest", df) is not None
+    pd.testing.assert_frame_equal(store.load("digest"), df)
+
+
+@pytest.mark.parametrize("columns", [[1.5, "a"], [1, "1"], [True, False]])
+def test_labels_that_do_not_roundtrip_are_not_snapshotted(tmp_path, columns):
+    store = SnapshotStore(tmp_path, enabled=True)
+    df = pd.DataFrame([[1, 2]], columns=columns)
+    assert store.save("digest", df) is None
+    assert store.load("digest") is None
+
+
+def test_old_snapshots_are_pruned_by_count(tmp_path):
+    store = SnapshotStore(tmp_path, enabled=True, max_files=2)
+    df = pd.DataFrame({"Value": [1, 2, 3]})
+    paths = []
+    for i in range(3):
+        paths.append(store.save(f"digest{i}", df))
+        # mtime ka order pakka karo (filesystem timestamp coarse ho sakta hai)
+        os.utime(paths[-1], ns=(i * 10**9, i * 10**9))
+    store.save("digest3", df)
+    assert sorted(p.name for p in tmp_path.glob("*.arrow")) == sorted(
+        [paths[2].name, store.path_for("digest3").name]
+    )
+
+
+def test_load_marks_snapshot_recently_used(tmp_path):
+    store = SnapshotStore(tmp_path, enabled=True, max_files=2)
+    df = pd.DataFrame({"Value": [1, 2, 3]})
+    first = store.save("first", df)
+    second = store.save("second", df)
+    os.utime(first, ns=(0, 0))
+    os.utime(second, ns=(10**9, 10**9))
+    assert store.load("first") is not None
+    store.save("third", df)
+    assert first.exists()
+    assert not second.exists()
+
+
+def test_byte_budget_keeps_newest_snapshot(tmp_path):
+    store = SnapshotStore(tmp_path, enabled=True, max_bytes=1)
+    df = pd.DataFrame({"Value": range(100)})
+    store.save("old", df)
+    os.utime(store.path_for("old"), ns=(0, 0))
+    newest = store.save("new", df)
+    assert [p.name for p in tmp_path.glob("*.arrow")] == [newest.name]
+
+
+def test_read_excel_with_digest_skips_source_on_hit(tmp_path):
+    store = SnapshotStore(tmp_path, enabled=True)
+    source = tmp_path / "book.xlsx"
+    df = pd.DataFrame({"Value": [1, 2, 3]})
+    df.to_excel(source, index=False)
+    pd.testing.assert_frame_equal(store.read_excel(source, digest="abc"), df)
+    source.unlink()
+    # Snapshot hit - file ab nahi hai fir bhi data milta hai
+    pd.testing.assert_frame_equal(store.read_excel(source, digest="abc"), df)
@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from tools.sql_query import extract_sql, run_sql
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("SELECT COUNT(*) FROM data", "SELECT COUNT(*) FROM data"),
+    ("```sql\nSELECT 1 FROM data;\n```", "SELECT 1 FROM data"),
+    ("SQL: SELECT 1 FROM data; SELECT 2", "SELECT 1 FROM data"),
+    ("SELECT * FROM data WHERE Note = 'a;b'", "SELECT * FROM data WHERE Note = 'a;b'"),
+    ('SELECT "x;y" FROM data; this returns the column', 'SELECT "x;y" FROM data'),
+    # LLM ";" pe nahi rukta - statement ke baad explanation bhi aa sakti hai
+    ("```sql\nSELECT * FROM data WHERE Note = 'a;b';\n", "SELECT * FROM data WHERE Note = 'a;b'"),
+    (" SELECT COUNT(*) FROM data WHERE Note = 'a;b';\nThis counts the rows.\n",
+     "SELECT COUNT(*) FROM data WHERE Note = 'a;b'"),
+])
+def test_extract_sql_keeps_semicolons_inside_literals(text, expected):
+    assert extract_sql(text) == expected
+
+
+def test_extracted_query_with_semicolon_literal_runs():
+    df = pd.DataFrame({"Note": ["a;b", "c"]})
+    result, truncated = run_sql(df, extract_sql("SELECT COUNT(*) AS n FROM data WHERE Note = 'a;b';"))
+    assert result["n"].tolist() == [1]
+    assert not truncated
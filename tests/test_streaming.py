@@ -0,0 +1,33 @@
+import openpyxl
+import pandas as pd
+import pytest
+
+from tools.streaming import iter_excel_chunks
+
+
+def write_sheet(path, header, rows):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+@pytest.mark.parametrize("header", [
+    ["a", "a", "a", "a"],
+    ["a", "a.1", "a", "a"],
+    ["a", None, "b", None, "a"],
+    ["Name", "Name", "Unnamed: 2", None],
+    ["x", "x.1", "x.1", "x"],
+    ["a", "a", "a.1"],
+    [None, "Unnamed: 0", "b"],
+])
+def test_streamed_headers_match_read_excel(tmp_path, header):
+    path = tmp_path / "sheet.xlsx"
+    write_sheet(path, header, [list(range(len(header))), list(range(10, 10 + len(header)))])
+    expected = pd.read_excel(path)
+    streamed = pd.concat(iter_excel_chunks(path, chunk_size=1), ignore_index=True)
+    assert list(streamed.columns) == list(expected.columns)
+    assert streamed.columns.is_unique
+    pd.testing.assert_frame_equal(streamed, expected)
@@ -0,0 +1,60 @@
+import io
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from tools.workbook import WorkbookHandle
+
+
+@pytest.fixture
+def book_bytes():
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        pd.DataFrame({"A": range(5)}).to_excel(writer, sheet_name="First", index=False)
+        pd.DataFrame({"B": ["x", "y"], "C": [1, 2]}).to_excel(writer, sheet_name="Second", index=False)
+        pd.DataFrame({"D": [1.5]}).to_excel(writer, sheet_name="Third", index=False)
+    return buffer.getvalue()
+
+
+def test_sheet_metadata_without_parsing(book_bytes):
+    book = WorkbookHandle(book_bytes)
+    with mock.patch("tools.workbook.pd.read_excel") as read_excel:
+        assert book.sheet_names == ["First", "Second", "Third"]
+        assert book.dimensions("Second") == (2, 2)
+        assert book.dimensions(0) == (5, 1)
+        assert not any(info["loaded"] for info in book.sheet_info())
+    read_excel.assert_not_called()
+
+
+def test_sheets_parse_lazily_and_are_cached(book_bytes):
+    book = WorkbookHandle(book_bytes)
+    with mock.patch("tools.workbook.pd.read_excel", wraps=pd.read_excel) as read_excel:
+        second = book.get_sheet("Second")
+        assert book.get_sheet(1) is second
+        assert read_excel.call_count == 1
+    pd.testing.assert_frame_equal(second, pd.DataFrame({"B": ["x", "y"], "C": [1, 2]}))
+    assert [info["loaded"] for info in book.sheet_info()] == [False, True, False]
+
+
+def test_parsed_sheet_cache_is_bounded(book_bytes):
+    book = WorkbookHandle(book_bytes, max_cached_sheets=2)
+    for name in ("First", "Second", "Third"):
+        book.get_sheet(name)
+    assert [info["loaded"] for info in book.sheet_info()] == [False, True, True]
+
+
+def test_unknown_sheet_raises(book_bytes):
+    book = WorkbookHandle(book_bytes)
+    with pytest.raises(KeyError):
+        book.get_sheet("Missing")
+    with pytest.raises(IndexError):
+        book.get_sheet(7)
+
+
+def test_path_and_bytes_sources_agree(tmp_path, book_bytes):
+    path = tmp_path / "book.xlsx"
+    path.write_bytes(book_bytes)
+    from_path, from_bytes = WorkbookHandle(path), WorkbookHandle(book_bytes)
+    assert from_path.digest == from_bytes.digest
+    pd.testing.assert_frame_equal(from_path.get_sheet("Third"), from_bytes.get_sheet("Third"))
@@ -1,3 +1,35 @@
 from .excel_tools import ExcelTools
+from .ingest_cache import IngestCache, content_hash
+from .compaction import compact_dtypes
+from .dataset_store import DatasetStore, DatasetLease
+from .snapshot import SnapshotStore
+from .streaming import ChunkedSheet, iter_excel_chunks, aggregate
+from .workbook import WorkbookHandle
+from .router import QueryRouter
+from .answer_cache import AnswerCache, dataset_fingerprint, normalize_question
+from .aggregation import group_aggregate, pivot_aggregate
+from .filter_expr import FilterSyntaxError, parse_filter, compile_filter, apply_filter, filter_rows
+from .column_index import ColumnIndexes, HashIndex, SortedIndex
+from .profiling import ColumnProfiler, HyperLogLog, profile_column
+from .correlation import CorrelationService
+from .xlsx_writer import write_xlsx
+from .export import export_frame, available_formats, EXPORT_FORMATS
+from .pipeline import OperationPipeline
+from .grid import GridView
+from .backends import PandasBackend, DuckDBBackend, get_backend
+from .sql_query import SQLQueryError, run_sql, schema_text, extract_sql
+from .context import ContextBuilder, TokenCounter, get_token_counter
+from . import charts
 
-__all__ = ['ExcelTools']
\ No newline at end of file
+__all__ = ['ExcelTools', 'IngestCache', 'content_hash', 'compact_dtypes', 'SnapshotStore',
+           'DatasetStore', 'DatasetLease',
+           'ChunkedSheet', 'iter_excel_chunks', 'aggregate', 'WorkbookHandle',
+           'QueryRouter', 'AnswerCache', 'dataset_fingerprint', 'normalize_question',
+           'group_aggregate', 'pivot_aggregate',
+           'FilterSyntaxError', 'parse_filter', 'compile_filter', 'apply_filter', 'filter_rows',
+           'ColumnIndexes', 'HashIndex', 'SortedIndex',
+           'ColumnProfiler', 'HyperLogLog', 'profile_column', 'CorrelationService', 'write_xlsx',
+           'export_frame', 'available_formats', 'EXPORT_FORMATS',
+           'OperationPipeline', 'GridView', 'PandasBackend', 'DuckDBBackend', 'get_backend',
+           'SQLQueryError', 'run_sql', 'schema_text', 'extract_sql',
+           'ContextBuilder', 'TokenCounter', 'get_token_counter', 'charts']
\ No newline at end of file
@@ -0,0 +1,98 @@
+import re
+import pandas as pd
+
+
+BASIC_AGGS = ("sum", "mean", "count", "min", "max", "nunique", "median")
+PERCENTILE_PATTERN = re.compile(r"^p(\d{1,2}(?:\.\d+)?)$")
+
+
+def _as_list(value):
+    """'City, Dept' / 'City' / ['City'] -> ['City', 'Dept'] / ['City'] / ['City']"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    return list(value)
+
+
+def parse_agg(name):
+    """'p90' -> ('quantile', 0.9), 'avg' -> ('mean', None)"""
+    name = str(name).strip().lower()
+    name = {"avg": "mean", "average": "mean", "total": "sum", "distinct": "nunique", "unique": "nunique"}.get(name, name)
+    match = PERCENTILE_PATTERN.match(name)
+    if match:
+        q = float(match.group(1)) / 100
+        if not 0 <= q <= 1:
+            raise ValueError(f"Invalid percentile: {name}")
+        return "quantile", q
+    if name not in BASIC_AGGS:
+        raise ValueError(f"Unsupported aggregation: {name} (use {', '.join(BASIC_AGGS)} or pNN)")
+    return name, None
+
+
+def group_aggregate(df, by, values=None, aggs="sum"):
+    """Multi-key group-by, kai aggregations ek saath
+
+    Group keys ek hi baar factorize hote hain; basic aggs pandas ke cython
+    kernels se aur percentiles vectorized groupby.quantile se nikalte hain.
+    Result columns: '<value>_<agg>' (e.g. Salary_sum, Salary_p90).
+    """
+    by = _as_list(by)
+    if not by:
+        raise ValueError("At least one group-by column is required")
+    missing = [col for col in by if col not in df.columns]
+    if missing:
+        raise KeyError(f"Columns not found: {missing}")
+
+    agg_names = _as_list(aggs) or ["sum"]
+    parsed = [(name, *parse_agg(name)) for name in agg_names]
+
+    values = _as_list(values)
+    if not values:
+        if all(func == "count" for _, func, _ in parsed):
+            # Sirf count - har group ki rows
+            return df.groupby(by, sort=True, observed=True).size().to_frame("count").reset_index()
+        values = [col for col in df.select_dtypes(include="number").columns if col not in by]
+    missing = [col for col in values if col not in df.columns]
+    if missing:
+        raise KeyError(f"Columns not found: {missing}")
+
+    grouped = df.groupby(by, sort=True, observed=True)[values]
+    pieces = {}
+
+    basic = list(dict.fromkeys(func for _, func, q in parsed if q is None))
+    if basic:
+        result = grouped.agg(basic)
+        for value in values:
+            for func in basic:
+                pieces[(value, func)] = result[(value, func)]
+
+    quantiles = list(dict.fromkeys(q for _, func, q in parsed if q is not None))
+    if quantiles:
+        result = grouped.quantile(quantiles)
+        # Index: (group keys..., q) -> q ko columns me le jao
+        result = result.unstack(level=-1)
+        for value in values:
+            for q in quantiles:
+                pieces[(value, q)] = result[(value, q)]
+
+    columns = {}
+    for value in values:
+        for name, func, q in parsed:
+            key = (value, q if q is not None else func)
+            label = name.strip().lower() if q is not None else func
+            columns[f"{value}_{label}"] = pieces[key]
+    return pd.DataFrame(columns).reset_index()
+
+
+def pivot_aggregate(df, index, columns, values, agg="sum"):
+    """Pivot table: index rows x columns ke values, ek aggregation"""
+    index = _as_list(index)
+    pivot_cols = _as_list(columns)
+    value_cols = _as_list(values)
+    if len(value_cols) != 1:
+        raise ValueError("Pivot needs exactly one value column")
+    flat = group_aggregate(df, index + pivot_cols, value_cols, [agg])
+    value_label = flat.columns[-1]
+    table = flat.set_index(index + pivot_cols)[value_label].unstack(pivot_cols)
+    return table
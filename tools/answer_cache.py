@@ -0,0 +1,191 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import numpy as np
+import pandas as pd
+import config
+
+
+# Same matlab wale words ek hi form me
+SYNONYMS = {
+    "total": "sum", "summation": "sum",
+    "avg": "average", "mean": "average",
+    "maximum": "max", "highest": "max", "largest": "max", "biggest": "max",
+    "minimum": "min", "lowest": "min", "smallest": "min",
+    "per": "by", "each": "by",
+    "columns": "column", "rows": "row", "values": "value",
+}
+
+STOPWORDS = {
+    "a", "an", "the", "what", "whats", "is", "are", "was", "of", "in", "for",
+    "please", "me", "show", "tell", "give", "find", "calculate", "compute",
+    "can", "you", "could", "would", "i", "want", "to", "know", "do", "does",
+    "data", "my",
+}
+
+
+OPERATOR_CHARS = set("<>=!")
+
+
+def _tokens(text):
+    """Words (koi bhi script) aur operators (>, <=, != ...) alag-alag
+
+    Devanagari matras (combining marks) word ka hissa hain - "कुल" aur
+    "कल" alag rehne chahiye. Baaki punctuation separator hai.
+    """
+    tokens, current, kind = [], [], None
+    for ch in text:
+        if ch.isalnum() or ch in "_." or unicodedata.category(ch).startswith("M"):
+            ch_kind = "word"
+        elif ch in OPERATOR_CHARS:
+            ch_kind = "op"
+        else:
+            ch_kind = None
+        if ch_kind != kind and current:
+            tokens.append(("".join(current), kind))
+            current = []
+        kind = ch_kind
+        if ch_kind is not None:
+            current.append(ch)
+    if current:
+        tokens.append(("".join(current), kind))
+    return tokens
+
+
+def normalize_question(question):
+    """Question ka normalized form - chhote wording farq pe same key
+
+    Koi word na bache (sirf stopwords/punctuation) to "" - aise
+    question cache nahi hote.
+    """
+    normalized = []
+    has_word = False
+    for token, kind in _tokens(question.lower()):
+        if kind == "word":
+            token = token.strip(".")
+            token = SYNONYMS.get(token, token)
+            if not token or token in STOPWORDS:
+                continue
+            has_word = True
+        normalized.append(token)
+    return " ".join(normalized) if has_word else ""
+
+
+def dataset_fingerprint(df):
+    """DataFrame ka content fingerprint (columns, dtypes, values, row order)"""
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode("utf-8"))
+    digest.update(str(len(df)).encode("utf-8"))
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy(dtype=np.uint64)
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    """Agent answers ka disk cache (SQLite) - TTL + LRU eviction
+
+    Key = dataset fingerprint + normalized question. Restart ke baad bhi
+    answers milte hain.
+    """
+
+    def __init__(self, path=None, ttl_seconds=None, max_entries=None):
+        cache_config = config.ANSWER_CACHE_CONFIG
+        self.path = str(path or cache_config["path"])
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else cache_config["ttl_seconds"]
+        self.max_entries = max_entries or cache_config["max_entries"]
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS answers (
+                fingerprint TEXT NOT NULL,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (fingerprint, question)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def _key(question, mode=None):
+        # Alag mode (react/sql) ka answer alag format me hota hai - alag key
+        # Khali normalized question (sirf stopwords) ki koi key nahi - None
+        key = normalize_question(question)
+        if not key:
+            return None
+        return f"{mode}: {key}" if mode else key
+
+    def get(self, fingerprint, question, mode=None):
+        """Cached answer ya None (expired entries hata di jati hain)"""
+        key = self._key(question, mode)
+        if key is None:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer, created_at FROM answers WHERE fingerprint = ? AND question = ?",
+                (fingerprint, key)
+            ).fetchone()
+            if row is None:
+                return None
+            answer, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM answers WHERE fingerprint = ? AND question = ?", (fingerprint, key)
+                )
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE answers SET last_used = ? WHERE fingerprint = ? AND question = ?",
+                (now, fingerprint, key)
+            )
+            self._conn.commit()
+            return answer
+
+    def put(self, fingerprint, question, answer, mode=None):
+        """Answer save karo aur limit se upar ho to LRU evict"""
+        key = self._key(question, mode)
+        if key is None:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, key, str(answer), now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM answers WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM answers WHERE rowid IN "
+                "(SELECT rowid FROM answers ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def invalidate(self, fingerprint):
+        """Is dataset ke saare cached answers hatao (data badalne pe)"""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM answers WHERE fingerprint = ?", (fingerprint,)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM answers")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
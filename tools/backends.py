@@ -0,0 +1,387 @@
+import threading
+import warnings
+import numpy as np
+import pandas as pd
+import config
+from .aggregation import group_aggregate, parse_agg, _as_list
+from .filter_expr import FilterSyntaxError, coerce_value, filter_columns, filter_rows, _indexed_positions
+from .streaming import aggregate
+
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except ImportError:
+    duckdb = None
+    HAS_DUCKDB = False
+
+
+class _Unsupported(Exception):
+    """Ye operation DuckDB pe pandas jaisa exact result nahi deta - pandas pe chalao"""
+
+
+def _sort_args(columns, ascending):
+    columns = [columns] if isinstance(columns, str) else list(columns)
+    if isinstance(ascending, bool):
+        ascending = [ascending] * len(columns)
+    return columns, [bool(asc) for asc in ascending]
+
+
+class PandasBackend:
+    """Default engine - seedha pandas (yahi reference results hain)"""
+
+    name = "pandas"
+
+    def filter(self, df, node, indexes=None):
+        return filter_rows(df, node, indexes)
+
+    def sort(self, df, columns, ascending=True):
+        columns, ascending = _sort_args(columns, ascending)
+        # Stable sort - barabar keys ka order dono engines pe same
+        return df.sort_values(by=columns, ascending=ascending, kind="stable")
+
+    def aggregate(self, source, column, op):
+        return aggregate(source, column, op)
+
+    def group_by(self, df, by, values=None, aggs="sum"):
+        return group_aggregate(df, by, values, aggs)
+
+
+# ============================================
+# DUCKDB (multi-threaded, out-of-core)
+# ============================================
+def _is_plain_int(dtype):
+    return isinstance(dtype, np.dtype) and dtype.kind in "iu"
+
+
+def _is_plain_number(dtype):
+    return isinstance(dtype, np.dtype) and (dtype.kind in "iu" or (dtype.kind == "f" and dtype.itemsize >= 4))
+
+
+def _is_text(values):
+    if pd.api.types.is_string_dtype(values.dtype) and values.dtype != object:
+        return True
+    return values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty")
+
+
+def _check_scannable(series):
+    """Column DuckDB me pandas wali semantics ke saath ja sakta hai?"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        # ENUM sirf string categories ka; order categories wala hi rehta hai
+        if not _is_text(pd.Series(dtype.categories)):
+            raise _Unsupported(f"categorical {series.name!r}")
+        return
+    if pd.api.types.is_bool_dtype(dtype) and isinstance(dtype, np.dtype):
+        return
+    if _is_plain_number(dtype):
+        return
+    if isinstance(dtype, np.dtype) and dtype.kind == "M":
+        return
+    if _is_text(series):
+        return
+    # Mixed object, tz-aware dates, float16, nullable extension types - pandas hi
+    raise _Unsupported(f"dtype {dtype} of {series.name!r}")
+
+
+def _literal_param(series, literal):
+    """Literal -> bind parameter (pandas ke coerce_value se hi)"""
+    if series.dtype == object and literal[0] == "number":
+        # Mixed object column ka "30"/30 match sirf pandas path me
+        raise _Unsupported("numeric literal on text column")
+    value = coerce_value(series, literal)
+    if isinstance(value, float) and np.isnan(value):
+        raise _Unsupported("NaN literal")
+    if isinstance(value, pd.Timestamp) and (value is pd.NaT or value.nanosecond):
+        raise _Unsupported("nanosecond timestamp literal")
+    return value
+
+
+def _placeholder(series):
+    """Bind parameter ka SQL - float32 column pe literal bhi FLOAT
+
+    pandas float32 column ko literal se float32 me hi compare karta hai;
+    DOUBLE parameter ke saath DuckDB column ko DOUBLE bana deta hai aur
+    0.1 jaise values ka "=" alag nikalta hai. (IN ko pandas isin float64
+    me compare karta hai, wahan plain "?" hi sahi hai.)
+    """
+    if series.dtype == np.float32:
+        return "CAST(? AS FLOAT)"
+    return "?"
+
+
+def _where_sql(node, df, aliases, params):
+    """Filter AST -> SQL boolean expression (har leaf COALESCE, NULL kabhi nahi)"""
+    op = node[0]
+    if op in ("and", "or"):
+        left = _where_sql(node[1], df, aliases, params)
+        right = _where_sql(node[2], df, aliases, params)
+        return f"({left} {op.upper()} {right})"
+    if op == "not":
+        return f"(NOT {_where_sql(node[1], df, aliases, params)})"
+    if op in ("regex", "contains"):
+        # Python re / str.upper semantics RE2 se alag - pandas hi chalao
+        raise _Unsupported(op)
+
+    series = df[node[1]]
+    column = aliases[node[1]]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if series.cat.ordered:
+            raise _Unsupported("ordered categorical")
+        column = f"CAST({column} AS VARCHAR)"
+
+    if op == "null":
+        return f"({column} IS {'NOT ' if node[2] else ''}NULL)"
+    if op == "cmp":
+        _, _, cmp, literal = node
+        value = _literal_param(series, literal)
+        if value is None:
+            if cmp == "=":
+                return f"({column} IS NULL)"
+            if cmp == "!=":
+                return f"({column} IS NOT NULL)"
+            raise FilterSyntaxError("Use IS NULL / IS NOT NULL for null checks")
+        params.append(value)
+        if cmp == "!=":
+            # pandas: ~(series == value) - NaN rows bhi aate hain
+            return f"(NOT COALESCE({column} = {_placeholder(series)}, FALSE))"
+        return f"COALESCE({column} {cmp} {_placeholder(series)}, FALSE)"
+    if op == "between":
+        low, high = _literal_param(series, node[2]), _literal_param(series, node[3])
+        if low is None or high is None:
+            raise _Unsupported("null bound")
+        params.extend([low, high])
+        return f"COALESCE({column} BETWEEN {_placeholder(series)} AND {_placeholder(series)}, FALSE)"
+    if op == "in":
+        values = [_literal_param(series, literal) for literal in node[2]]
+        present = [value for value in values if value is not None]
+        parts = []
+        if present:
+            params.extend(present)
+            parts.append(f"COALESCE({column} IN ({', '.join('?' * len(present))}), FALSE)")
+        if len(present) < len(values):
+            parts.append(f"({column} IS NULL)")
+        sql = f"({' OR '.join(parts)})"
+        return f"(NOT {sql})" if node[3] else sql
+    raise FilterSyntaxError(f"Unknown node: {op}")
+
+
+class DuckDBBackend(PandasBackend):
+    """DuckDB engine - filter/sort/group-by multi-threaded columnar execution
+
+    DataFrame zero-copy scan hota hai; sort/group-by memory_limit se bade
+    hon to temp_directory me spill (out-of-core). Filter/sort sirf row
+    positions lautate hain aur rows pandas hi nikalta hai, isliye result
+    pandas path se exact same hai. Jo operation exact match nahi de sakta
+    (float sum/mean, percentiles, regex, mixed object columns) wo
+    PandasBackend pe chalta hai; chhote frames bhi (min_rows se kam).
+    """
+
+    name = "duckdb"
+
+    def __init__(self, threads=None, memory_limit=None, temp_directory=None, min_rows=None):
+        if not HAS_DUCKDB:
+            raise RuntimeError("DuckDB backend needs the duckdb package")
+        engine_config = config.QUERY_ENGINE_CONFIG
+        self.min_rows = engine_config["min_rows"] if min_rows is None else min_rows
+        settings = {}
+        threads = threads or engine_config["threads"]
+        if threads:
+            settings["threads"] = threads
+        memory_limit = memory_limit or engine_config["memory_limit"]
+        if memory_limit:
+            settings["memory_limit"] = memory_limit
+        temp_directory = temp_directory or engine_config["temp_directory"]
+        if temp_directory:
+            settings["temp_directory"] = str(temp_directory)
+        self._con = duckdb.connect(config=settings)
+        self._lock = threading.Lock()
+
+    def _use(self, df):
+        return isinstance(df, pd.DataFrame) and len(df) >= self.min_rows
+
+    def _query(self, df, columns, sql, params=()):
+        """df ke columns (c0, c1, ... + __pos) pe SQL chalao -> result DataFrame"""
+        frame = pd.DataFrame(
+            {f"c{i}": df[column].reset_index(drop=True) for i, column in enumerate(columns)},
+            index=pd.RangeIndex(len(df))
+        )
+        frame["__pos"] = np.arange(len(df), dtype=np.int64)
+        with self._lock:
+            # Har call ka apna cursor; registration usi cursor tak
+            cursor = self._con.cursor()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", FutureWarning)
+                cursor.register("frame", frame)
+                return cursor.execute(sql.replace("{frame}", "frame"), list(params)).df()
+        finally:
+            cursor.close()
+
+    def _positions(self, df, columns, clause, params=()):
+        result = self._query(df, columns, f"SELECT __pos FROM {{frame}} {clause}", params)
+        return result["__pos"].to_numpy()
+
+    # ---------- filter ----------
+    def filter(self, df, node, indexes=None):
+        if not self._use(df):
+            return super().filter(df, node, indexes)
+        if indexes is not None and node[0] in ("cmp", "between", "in") and _indexed_positions(node, df, indexes):
+            # Column index lookup scan se bhi sasta hai
+            return super().filter(df, node, indexes)
+        columns = sorted(filter_columns(node), key=str)
+        aliases = {column: f"c{i}" for i, column in enumerate(columns)}
+        params = []
+        try:
+            for column in columns:
+                _check_scannable(df[column])
+            where = _where_sql(node, df, aliases, params)
+        except _Unsupported:
+            return super().filter(df, node, indexes)
+        return df.iloc[self._positions(df, columns, f"WHERE {where} ORDER BY __pos", params)]
+
+    # ---------- sort ----------
+    def sort(self, df, columns, ascending=True):
+        columns, ascending = _sort_args(columns, ascending)
+        if not self._use(df) or len(set(columns)) != len(columns) or any(c not in df.columns for c in columns):
+            return super().sort(df, columns, ascending)
+        try:
+            for column in columns:
+                _check_scannable(df[column])
+        except _Unsupported:
+            return super().sort(df, columns, ascending)
+        # __pos aakhri key - stable sort jaisa tie order; NaN pandas ki tarah last
+        order = ", ".join(
+            f"c{i} {'ASC' if asc else 'DESC'} NULLS LAST" for i, asc in enumerate(ascending)
+        )
+        return df.take(self._positions(df, columns, f"ORDER BY {order}, __pos"))
+
+    # ---------- scalar aggregate ----------
+    def aggregate(self, source, column, op):
+        if not self._use(source) or column not in source.columns:
+            return super().aggregate(source, column, op)
+        dtype = source[column].dtype
+        if op == "count":
+            try:
+                _check_scannable(source[column])
+            except _Unsupported:
+                return super().aggregate(source, column, op)
+            return np.int64(self._query(source, [column], "SELECT COUNT(c0) AS n FROM {frame}")["n"].iloc[0])
+        if op in ("min", "max") and _is_plain_number(dtype):
+            result = self._query(source, [column], f"SELECT {op.upper()}(c0) AS v FROM {{frame}}")["v"]
+            value = result.iloc[0]
+            return np.nan if pd.isna(value) else dtype.type(value)
+        if op in ("sum", "mean") and _is_plain_int(dtype):
+            # Integer sum exact (HUGEINT); float sum pandas pairwise se alag ho sakta hai
+            row = self._query(
+                source, [column], "SELECT CAST(SUM(c0) AS VARCHAR) AS s, COUNT(c0) AS n FROM {frame}"
+            ).iloc[0]
+            total, count = int(row["s"] or 0), int(row["n"])
+            if op == "sum":
+                result_type = np.uint64 if dtype.kind == "u" else np.int64
+                if not np.iinfo(result_type).min <= total <= np.iinfo(result_type).max:
+                    return super().aggregate(source, column, op)
+                return result_type(total)
+            if abs(total) >= 2 ** 53:
+                return super().aggregate(source, column, op)
+            return np.float64(total) / count if count else np.nan
+        return super().aggregate(source, column, op)
+
+    # ---------- group-by ----------
+    def _agg_sql(self, df, value, func, alias):
+        series = df[value]
+        dtype = series.dtype
+        if func == "count":
+            return [f"COUNT({alias})"]
+        if func == "nunique" and (_is_plain_int(dtype) or _is_text(series)):
+            return [f"COUNT(DISTINCT {alias})"]
+        if func in ("min", "max") and (_is_plain_number(dtype) or (isinstance(dtype, np.dtype) and dtype.kind == "M")):
+            return [f"{func.upper()}({alias})"]
+        if func in ("sum", "mean") and isinstance(dtype, np.dtype) and dtype.kind == "i":
+            # BIGINT overflow pe DuckDB error deta hai -> pandas fallback
+            return [f"CAST(SUM({alias}) AS BIGINT)", f"COUNT({alias})"]
+        raise _Unsupported(f"{func} of {dtype}")
+
+    def group_by(self, df, by, values=None, aggs="sum"):
+        by = _as_list(by)
+        agg_names = _as_list(aggs) or ["sum"]
+        value_list = _as_list(values)
+        if (not self._use(df) or not by or len(set(by)) != len(by)
+                or any(column not in df.columns for column in by + value_list)):
+            # Errors / chhote frames - pandas wala path (same messages)
+            return super().group_by(df, by, values, aggs)
+        parsed = [(name, *parse_agg(name)) for name in agg_names]
+        count_only = not value_list and all(func == "count" for _, func, _ in parsed)
+        if not value_list and not count_only:
+            value_list = [col for col in df.select_dtypes(include="number").columns if col not in by]
+
+        columns = list(dict.fromkeys(by + value_list))
+        aliases = {column: f"c{i}" for i, column in enumerate(columns)}
+        keys = ", ".join(aliases[column] for column in by)
+        try:
+            for column in columns:
+                _check_scannable(df[column])
+            selects, outputs = [], []
+            if count_only:
+                selects.append("COUNT(*) AS a0")
+                outputs.append(("count", "count", ["a0"], None))
+            else:
+                for value in value_list:
+                    for name, func, q in parsed:
+                        if q is not None:
+                            raise _Unsupported("percentile")
+                        names = []
+                        for expression in self._agg_sql(df, value, func, aliases[value]):
+                            names.append(f"a{len(selects)}")
+                            selects.append(f"{expression} AS {names[-1]}")
+                        outputs.append((f"{value}_{func}", func, names, value))
+            not_null = " AND ".join(f"{aliases[column]} IS NOT NULL" for column in by)
+            sql = (f"SELECT {keys}, {', '.join(selects)} FROM {{frame}} WHERE {not_null} "
+                   f"GROUP BY {keys} ORDER BY {keys}")
+            raw = self._query(df, columns, sql)
+        except _Unsupported:
+            return super().group_by(df, by, values, aggs)
+        except duckdb.Error:
+            return super().group_by(df, by, value_list or None, aggs)
+
+        result = {}
+        for column in by:
+            # Key dtypes source jaise (category ke saare categories, string[pyarrow], ...)
+            result[column] = raw[aliases[column]].astype(df[column].dtype)
+        for label, func, names, value in outputs:
+            if func in ("sum", "mean"):
+                totals = raw[names[0]].to_numpy(dtype=np.int64)
+                if func == "sum":
+                    result[label] = totals
+                    continue
+                if np.abs(totals).max(initial=0) >= 2 ** 53:
+                    return super().group_by(df, by, value_list, aggs)
+                result[label] = totals.astype(np.float64) / raw[names[1]].to_numpy(dtype=np.int64)
+            elif func in ("count", "nunique"):
+                result[label] = raw[names[0]].to_numpy(dtype=np.int64)
+            else:
+                result[label] = raw[names[0]].astype(df[value].dtype)
+        return pd.DataFrame(result)
+
+
+# ============================================
+# ENGINE SWITCH
+# ============================================
+BACKENDS = {"pandas": PandasBackend, "duckdb": DuckDBBackend}
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(engine=None):
+    """Config wala query engine (process me ek hi instance)
+
+    duckdb installed na ho to pandas pe chalte hain.
+    """
+    engine = (engine or config.QUERY_ENGINE_CONFIG["engine"]).lower()
+    if engine not in BACKENDS:
+        raise ValueError(f"Unknown query engine: {engine} (use {', '.join(BACKENDS)})")
+    if engine == "duckdb" and not HAS_DUCKDB:
+        engine = "pandas"
+    with _instances_lock:
+        if engine not in _instances:
+            _instances[engine] = BACKENDS[engine]()
+        return _instances[engine]
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import config
+
+
+def _numeric_values(series):
+    """Series -> (row positions, float values) - NaN hata ke"""
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    positions = np.flatnonzero(~np.isnan(values))
+    return positions, values[positions]
+
+
+def lttb_indices(y, threshold, x=None):
+    """Largest-Triangle-Three-Buckets: line ka shape bachate hue threshold points chuno
+
+    Returns selected indices (sorted). Har bucket se woh point jo pichle
+    chune point aur agle bucket ke average ke saath sabse bada triangle banaye.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def line_points(series, max_points=None):
+    """Line chart ke liye downsampled (row, value) - LTTB se"""
+    max_points = max_points or config.CHART_CONFIG["max_points"]
+    positions, values = _numeric_values(series)
+    keep = lttb_indices(values, max_points, positions)
+    return pd.DataFrame({"Row": positions[keep], series.name: values[keep]})
+
+
+def bar_points(series, max_points=None):
+    """Bar chart: rows zyada hon to lagatar rows ke bins ka mean"""
+    max_points = max_points or config.CHART_CONFIG["max_points"]
+    if len(series) <= max_points:
+        return pd.DataFrame({"Row": np.arange(len(series)), series.name: series.to_numpy()})
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    edges = np.linspace(0, len(values), max_points + 1).astype(np.intp)
+    bin_ids = np.repeat(np.arange(max_points), np.diff(edges))
+    valid = ~np.isnan(values)
+    sums = np.bincount(bin_ids[valid], weights=values[valid], minlength=max_points)
+    counts = np.bincount(bin_ids[valid], minlength=max_points)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return pd.DataFrame({"Row": edges[:-1], series.name: means})
+
+
+def histogram_bins(series, bins=None):
+    """Histogram server pe - sirf bin edges aur counts browser ko jaate hain"""
+    bins = bins or config.CHART_CONFIG["histogram_bins"]
+    _, values = _numeric_values(series)
+    if values.size == 0:
+        return pd.DataFrame({"bin_start": [], "bin_end": [], "count": []})
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})
+
+
+def box_stats(series):
+    """Box plot ke quartiles/fences (Plotly jaisa 1.5 IQR rule)"""
+    _, values = _numeric_values(series)
+    if values.size == 0:
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        "q1": float(q1),
+        "median": float(median),
+        "q3": float(q3),
+        "mean": float(values.mean()),
+        "lowerfence": float(inside.min()),
+        "upperfence": float(inside.max()),
+    }
+
+
+def pie_slices(df, names, values, max_slices=None):
+    """Pie chart: names column pe group karke sum, chhote slices 'Other' me"""
+    max_slices = max_slices or config.CHART_CONFIG["pie_max_slices"]
+    totals = df.groupby(names, sort=False, observed=True)[values].sum().sort_values(ascending=False)
+    if len(totals) > max_slices:
+        other = totals.iloc[max_slices - 1:].sum()
+        totals = totals.iloc[:max_slices - 1]
+        totals = pd.concat([totals, pd.Series({"Other": other})])
+    return pd.DataFrame({names: totals.index.astype(str), values: totals.to_numpy()})
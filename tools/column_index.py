@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import config
+
+
+class HashIndex:
+    """Categorical/text column ka index: value -> row positions
+
+    pd.factorize se codes, phir stable argsort - har value ki rows ek
+    contiguous slice me (original row order me) milti hain.
+    """
+
+    kind = "hash"
+
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        self._lookup = {value: i for i, value in enumerate(uniques)}
+        valid = codes >= 0
+        self._order = np.argsort(codes, kind="stable")[np.count_nonzero(~valid):]
+        counts = np.bincount(codes[valid], minlength=len(uniques))
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    def equal(self, value):
+        code = self._lookup.get(value)
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return self._order[self._offsets[code]:self._offsets[code + 1]]
+
+    def isin(self, values):
+        parts = [self.equal(value) for value in values]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+
+class SortedIndex:
+    """Numeric/date column ka sorted index - equality aur range lookups"""
+
+    kind = "sorted"
+
+    def __init__(self, series):
+        values = series.to_numpy()
+        valid = ~pd.isna(values)
+        positions = np.flatnonzero(valid)
+        valid_values = values[valid]
+        order = np.argsort(valid_values, kind="stable")
+        self._values = valid_values[order]
+        self._positions = positions[order]
+
+    def _convert(self, value):
+        if isinstance(value, pd.Timestamp):
+            return value.to_datetime64() if value.tzinfo is None else value
+        return value
+
+    def equal(self, value):
+        value = self._convert(value)
+        lo = np.searchsorted(self._values, value, side="left")
+        hi = np.searchsorted(self._values, value, side="right")
+        return self._positions[lo:hi]
+
+    def isin(self, values):
+        parts = [self.equal(value) for value in values]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+    def range(self, low=None, high=None, include_low=True, include_high=True):
+        lo = 0
+        hi = len(self._values)
+        if low is not None:
+            lo = np.searchsorted(self._values, self._convert(low), side="left" if include_low else "right")
+        if high is not None:
+            hi = np.searchsorted(self._values, self._convert(high), side="right" if include_high else "left")
+        return self._positions[lo:hi] if lo < hi else np.empty(0, dtype=np.intp)
+
+
+class ColumnIndexes:
+    """Ek DataFrame ke per-column indexes - pehli lookup pe lazily bante hain
+
+    Frame badla (sort = naya object) to indexes khud reset; in-place
+    changes (add column) ke baad invalidate() call karo.
+    """
+
+    def __init__(self, min_rows=None, enabled=None):
+        index_config = config.COLUMN_INDEX_CONFIG
+        self.min_rows = min_rows if min_rows is not None else index_config["min_rows"]
+        self.enabled = index_config["enabled"] if enabled is None else enabled
+        self._df = None
+        self._indexes = {}
+
+    def invalidate(self, column=None):
+        """Saare (ya ek column ke) indexes hatao"""
+        if column is None:
+            self._indexes.clear()
+            self._df = None
+        else:
+            self._indexes.pop(column, None)
+
+    def get(self, df, column, kind=None):
+        """Column ka index (zarurat ho to abhi banao), ya None agar index nahi banta"""
+        if not self.enabled or len(df) < self.min_rows:
+            return None
+        if self._df is not df:
+            self._indexes.clear()
+            self._df = df
+
+        index = self._indexes.get(column)
+        if index is None:
+            series = df[column]
+            dtype = series.dtype
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) \
+                    or pd.api.types.is_datetime64_any_dtype(dtype):
+                index = SortedIndex(series)
+            elif isinstance(dtype, pd.CategoricalDtype) or dtype == object \
+                    or pd.api.types.is_string_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+                index = HashIndex(series)
+            else:
+                return None
+            self._indexes[column] = index
+
+        if kind is not None and index.kind != kind:
+            return None
+        return index
+
+    def __contains__(self, column):
+        return column in self._indexes
+
+
+def positions_to_mask(positions, df):
+    """Row positions -> boolean mask Series"""
+    mask = np.zeros(len(df), dtype=bool)
+    mask[positions] = True
+    return pd.Series(mask, index=df.index)
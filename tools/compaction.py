@@ -0,0 +1,126 @@
+import re
+import pandas as pd
+import config
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+# "2024-01-31", "31/01/2024", "2024-01-31 10:30" jaise values
+DATE_PATTERN = re.compile(r"^\s*(\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4})([ T]\d{1,2}:\d{2}(:\d{2})?)?\s*$")
+
+
+def _compact_integer(series):
+    """Sabse chhota integer dtype jisme saari values aa jayen"""
+    if series.empty:
+        return series
+    if pd.api.types.is_unsigned_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast="unsigned")
+    return pd.to_numeric(series, downcast="integer")
+
+
+# DATE_PATTERN wale shapes ke explicit formats (ISO8601 pehle try hota hai)
+_DATE_PARTS = ["%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"] + [
+    f"{first}{sep}{second}{sep}{year}"
+    for sep in "-/."
+    for first, second in (("%d", "%m"), ("%m", "%d"))
+    for year in ("%Y", "%y")
+]
+DATE_FORMATS = [date + time for date in _DATE_PARTS
+                for time in ("", " %H:%M", " %H:%M:%S", "T%H:%M", "T%H:%M:%S")]
+
+
+def _looks_like_dates(values, sample_size):
+    sample = values[:sample_size]
+    return len(sample) > 0 and all(DATE_PATTERN.match(value) for value in sample)
+
+
+def _parse_dates(series, sample):
+    """Text -> datetime sirf ek unambiguous format se, warna None
+
+    Har value ek hi format se parse honi chahiye. "03/04/2024" jaisi
+    values dd/mm aur mm/dd dono me chalti hain aur alag dates deti hain -
+    aise column text hi rehte hain (per-value guessing nahi).
+    """
+    text = series.str.strip()
+    sample = pd.Series(sample).str.strip()
+    candidates = [fmt for fmt in ["ISO8601"] + DATE_FORMATS
+                  if pd.to_datetime(sample, format=fmt, errors="coerce").notna().all()]
+    expected = text.notna().sum()
+    parsed = None
+    for fmt in candidates:
+        result = pd.to_datetime(text, format=fmt, errors="coerce")
+        if result.notna().sum() != expected:
+            continue
+        if parsed is not None and not result.equals(parsed):
+            return None
+        parsed = result
+    return parsed
+
+
+def _compact_strings(series, settings):
+    """Text column: dates -> datetime64, kam unique -> category, baaki Arrow strings"""
+    non_null = series.dropna()
+    if non_null.empty:
+        return series
+    # Mixed (text + numbers) columns ko chhedna values badal dega
+    if pd.api.types.infer_dtype(non_null, skipna=True) != "string":
+        return series
+
+    unique = non_null.unique()
+    if settings["parse_dates"] and _looks_like_dates(unique, settings["date_sample_size"]):
+        parsed = _parse_dates(series, unique[:settings["date_sample_size"]])
+        if parsed is not None:
+            return parsed
+
+    if len(unique) <= settings["category_max_ratio"] * len(series):
+        return series.astype("category")
+    if settings["arrow_strings"] and HAS_PYARROW:
+        return series.astype("string[pyarrow]")
+    return series
+
+
+def compact_dtypes(df, **overrides):
+    """DataFrame ke dtypes chhote karo - values wahi rehti hain, memory kam
+
+    - int64 -> int8/int16/int32 (jo fit ho)
+    - floats float64 hi rehte hain - float32 pe pandas sum/mean float32 me
+      jodta hai aur bade columns ke totals badal jaate hain
+    - kam unique wale text columns -> category
+    - date jaise text -> datetime64
+    - baaki text -> Arrow-backed strings (pyarrow ho to)
+
+    Returns (compacted_df, report) - report me before/after bytes aur
+    badle hue columns.
+    """
+    settings = dict(config.DTYPE_COMPACTION_CONFIG)
+    settings.update(overrides)
+
+    before = int(df.memory_usage(deep=True).sum())
+    changes = {}
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            compacted = series
+        elif pd.api.types.is_integer_dtype(dtype):
+            compacted = _compact_integer(series)
+        elif dtype == object:
+            compacted = _compact_strings(series, settings)
+        else:
+            compacted = series
+        if compacted.dtype != dtype:
+            changes[column] = (str(dtype), str(compacted.dtype))
+        columns[column] = compacted
+
+    if not changes:
+        return df, {"before": before, "after": before, "columns": changes}
+
+    result = pd.DataFrame(columns, index=df.index)
+    result.columns = df.columns
+    after = int(result.memory_usage(deep=True).sum())
+    return result, {"before": before, "after": after, "columns": changes}
@@ -0,0 +1,202 @@
+import math
+import threading
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import config
+from .profiling import ColumnProfiler
+
+try:
+    from llama_cpp import Llama
+    HAS_LLAMA = True
+except ImportError:
+    Llama = None
+    HAS_LLAMA = False
+
+
+class TokenCounter:
+    """Prompt text ke tokens - Mistral ke apne tokenizer se gine hue
+
+    Model sirf vocab_only load hota hai (weights nahi), isliye sasta hai aur
+    LLM server mode me bhi chalta hai. llama_cpp / model file na ho to
+    bytes-per-token estimate (jaan-boojh ke thoda zyada ginta hai).
+    """
+
+    def __init__(self, model_path=None):
+        self.model_path = model_path or config.LLM_CONFIG["model_path"]
+        self._vocab = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _model(self):
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                if HAS_LLAMA and Path(self.model_path).exists():
+                    try:
+                        self._vocab = Llama(model_path=str(self.model_path), vocab_only=True, verbose=False)
+                    except Exception:
+                        self._vocab = None
+            return self._vocab
+
+    @property
+    def exact(self):
+        """True = asli tokenizer, False = estimate"""
+        return self._model() is not None
+
+    def count(self, text):
+        model = self._model()
+        data = text.encode("utf-8")
+        if model is None:
+            return math.ceil(len(data) / config.CONTEXT_CONFIG["bytes_per_token"])
+        return len(model.tokenize(data, add_bos=False))
+
+    def cut(self, text, max_tokens):
+        """Text ke pehle max_tokens tokens"""
+        model = self._model()
+        if max_tokens <= 0:
+            return ""
+        if model is None:
+            limit = int(max_tokens * config.CONTEXT_CONFIG["bytes_per_token"])
+            return text.encode("utf-8")[:limit].decode("utf-8", errors="ignore")
+        tokens = model.tokenize(text.encode("utf-8"), add_bos=False)[:max_tokens]
+        return model.detokenize(tokens).decode("utf-8", errors="ignore").lstrip()
+
+    def truncate(self, text, max_tokens):
+        """Text budget me laao - poori lines rakhte hain, aakhir me kitna chhoda wo likha"""
+        if self.count(text) <= max_tokens:
+            return text
+        lines = text.splitlines()
+
+        def candidate(keep):
+            return "\n".join(lines[:keep] + [f"... ({len(lines) - keep} more lines truncated)"])
+
+        # Sabse zyada head lines jo budget me aayein (binary search)
+        low, high = 0, len(lines) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count(candidate(middle)) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        if low > 0:
+            return candidate(low)
+        # Pehli line hi budget se badi - token level pe kaato
+        marker = "... (truncated)"
+        return self.cut(lines[0], max_tokens - self.count(marker) - 1) + "\n" + marker
+
+
+_counter = None
+_counter_lock = threading.Lock()
+
+
+def get_token_counter():
+    """Process-wide TokenCounter (vocab ek hi baar load)"""
+    global _counter
+    with _counter_lock:
+        if _counter is None:
+            _counter = TokenCounter()
+        return _counter
+
+
+def _short(value, width):
+    text = str(value)
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def _evenly_spaced(length, count):
+    if length == 0 or count <= 0:
+        return np.array([], dtype=np.int64)
+    return np.unique(np.linspace(0, length - 1, min(count, length)).astype(np.int64))
+
+
+class ContextBuilder:
+    """Agent prompt ke liye token-budgeted data context
+
+    Poora head()/JSON/filtered frame scratchpad me daalne ki jagah schema,
+    types, cardinality, top values aur kuch representative rows ka summary
+    - budget (asli tokenizer counts) ke andar. Bade tool observations bhi
+    isi se fixed budget tak truncate hote hain.
+    """
+
+    def __init__(self, counter=None, profiler=None):
+        self.counter = counter or get_token_counter()
+        self.profiler = profiler or ColumnProfiler()
+
+    def observation(self, text, max_tokens=None):
+        """Tool output ko observation budget tak chhota karo"""
+        max_tokens = max_tokens or config.CONTEXT_CONFIG["observation_tokens"]
+        return self.counter.truncate(str(text), max_tokens)
+
+    def _column_line(self, column, series, stats, sample):
+        context_config = config.CONTEXT_CONFIG
+        width = context_config["max_value_chars"]
+        unique = f"{'~' if stats['unique_approx'] else ''}{stats['unique']:,} distinct"
+        null_pct = stats["null"] / len(series) * 100 if len(series) else 0
+        nulls = f", {null_pct:.0f}% null" if stats["null"] else ""
+        dtype = series.dtype
+        if "numeric" in stats:
+            numeric = stats["numeric"]
+            if not numeric["count"]:
+                return f"- {column} ({dtype}{nulls})"
+            return (f"- {column} ({dtype}; {unique}; min {numeric['min']:g}, max {numeric['max']:g}"
+                    f"{nulls})")
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            low, high = series.min(), series.max()
+            if low is pd.NaT:
+                return f"- {column} (date{nulls})"
+            if low == low.normalize() and high == high.normalize():
+                low, high = low.date(), high.date()
+            return f"- {column} (date; {unique}; {low} to {high}{nulls})"
+        if pd.api.types.is_bool_dtype(dtype):
+            return f"- {column} (bool{nulls})"
+        # Text: sample rows ki top values (poore column pe value_counts nahi)
+        top = sample[column].value_counts(dropna=True).head(context_config["top_values"])
+        values = ", ".join(repr(_short(value, width)) for value in top.index)
+        examples = f"; e.g. {values}" if values else ""
+        return f"- {column} (text; {unique}{nulls}{examples})"
+
+    def data_context(self, df, max_tokens=None):
+        """Schema + cardinality + representative rows, max_tokens ke andar"""
+        context_config = config.CONTEXT_CONFIG
+        max_tokens = max_tokens or context_config["data_context_tokens"]
+        count = self.counter.count
+        stats = self.profiler.column_stats(df)
+        sample = df.iloc[_evenly_spaced(len(df), context_config["value_sample_rows"])]
+
+        parts = [f"Rows: {len(df):,} | Columns: {len(df.columns)}", "Columns:"]
+        used = count("\n".join(parts))
+        # Sample rows ke liye jagah chhod ke columns bharo
+        column_budget = max_tokens - int(max_tokens * context_config["sample_rows_share"])
+        shown = []
+        for column in df.columns:
+            line = self._column_line(column, df[column], stats[column], sample)
+            cost = count(line) + 1
+            if used + cost > column_budget:
+                break
+            parts.append(line)
+            shown.append(column)
+            used += cost
+        hidden = [str(column) for column in df.columns[len(shown):]]
+        if hidden:
+            note = f"... {len(hidden)} more columns: {', '.join(hidden)}"
+            room = max_tokens - used - 1
+            if count(note) > room:
+                suffix = " …"
+                note = self.counter.cut(note, room - count(suffix)) + suffix
+            parts.append(note)
+            used += count(note) + 1
+
+        # Representative rows (shuru, beech, aakhir) - jitni budget me aayein
+        for rows in range(context_config["sample_rows"] if len(df) and shown else 0, 0, -1):
+            picked = df.iloc[_evenly_spaced(len(df), rows)][shown]
+            block = "Sample rows:\n" + picked.to_string(
+                index=False, max_colwidth=context_config["max_value_chars"]
+            )
+            if used + count(block) + 1 <= max_tokens:
+                parts.append(block)
+                break
+
+        text = "\n".join(parts)
+        # Per-line counts jodne se thoda farak ho sakta hai - aakhri check
+        return self.counter.truncate(text, max_tokens)
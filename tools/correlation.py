@@ -0,0 +1,173 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import config
+
+
+def _column_key(series):
+    """Column ka content key (row order ke saath) - values badle to key badle"""
+    values = series.to_numpy()
+    if values.dtype.kind not in "biuf":
+        values = pd.util.hash_pandas_object(series, index=False).to_numpy(dtype=np.uint64)
+    digest = hashlib.blake2b(np.ascontiguousarray(values).tobytes(), digest_size=16).hexdigest()
+    return str(series.name), str(series.dtype), len(series), digest
+
+
+def numeric_columns(df):
+    """Numeric (bool nahi) columns ke naam"""
+    return [column for column, dtype in df.dtypes.items()
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)]
+
+
+def _prepare(df, columns):
+    """float64 matrix (column mean se centered), NaN -> 0 aur presence mask"""
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        means = np.nanmean(values, axis=0) if len(values) else np.zeros(len(columns))
+    # Centering se badi values pe cancellation error kam hota hai
+    centered = np.where(present, values - np.nan_to_num(means), 0.0)
+    return centered, present.astype(np.float64)
+
+
+def pairwise_corr(left, left_mask, right, right_mask):
+    """Pearson correlation (pairwise-complete rows, df.corr() jaisa) - sirf matmuls
+
+    left/right: centered values (NaN -> 0), *_mask: 1.0 jahan value hai.
+    Returns (left columns x right columns) matrix.
+    """
+    n = left_mask.T @ right_mask
+    sum_x = left.T @ right_mask
+    sum_y = left_mask.T @ right
+    sum_xx = (left * left).T @ right_mask
+    sum_yy = left_mask.T @ (right * right)
+    sum_xy = left.T @ right
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = n * sum_xy - sum_x * sum_y
+        var = (n * sum_xx - sum_x ** 2) * (n * sum_yy - sum_y ** 2)
+        corr = cov / np.sqrt(var)
+    corr[(n < 2) | (var <= 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _unit_diagonal(matrix):
+    """Diagonal exact 1.0 (constant/khali column ho to NaN hi rehta hai)"""
+    diagonal = np.diag(matrix)
+    np.fill_diagonal(matrix, np.where(np.isnan(diagonal), np.nan, 1.0))
+
+
+class CorrelationService:
+    """Numeric columns ka correlation matrix - ek baar compute, phir cache
+
+    Matrix column content keys pe cached hai. Naya column add ho to sirf
+    us column ki correlations nikalti hain, baaki purane matrix se aati hain.
+    Same frame object (Streamlit rerun) pe hashing bhi skip.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or config.CORRELATION_CONFIG["max_entries"]
+        self._entries = OrderedDict()
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _cached_frame(self, df, columns):
+        entry = self._frames.get(id(df))
+        if entry is None:
+            return None
+        ref, frame_key, matrix = entry
+        if ref() is not df or frame_key != (tuple(columns), len(df)):
+            return None
+        return matrix
+
+    def _remember_frame(self, df, columns, matrix):
+        frame_id = id(df)
+        ref = weakref.ref(df, lambda _, frame_id=frame_id: self._frames.pop(frame_id, None))
+        self._frames[frame_id] = (ref, (tuple(columns), len(df)), matrix)
+
+    def _best_base(self, keys):
+        """Cache me sabse bada matrix jiske saare columns is frame me bhi hain"""
+        wanted = set(keys)
+        best = None
+        for entry_keys, matrix in self._entries.items():
+            if set(entry_keys) <= wanted and (best is None or len(entry_keys) > len(best[0])):
+                best = (entry_keys, matrix)
+        return best
+
+    def _compute(self, df, columns, keys):
+        with self._lock:
+            base = self._best_base(keys)
+        key_to_column = dict(zip(keys, columns))
+        if base is None:
+            centered, mask = _prepare(df, columns)
+            result = pairwise_corr(centered, mask, centered, mask)
+            _unit_diagonal(result)
+            return pd.DataFrame(result, index=columns, columns=columns)
+
+        base_keys, base_matrix = base
+        known = [key_to_column[key] for key in base_keys]
+        new = [column for key, column in zip(keys, columns) if key not in set(base_keys)]
+        result = pd.DataFrame(np.nan, index=columns, columns=columns)
+        result.loc[known, known] = base_matrix.to_numpy()
+        if new:
+            new_values, new_mask = _prepare(df, new)
+            known_values, known_mask = _prepare(df, known)
+            cross = pairwise_corr(new_values, new_mask, known_values, known_mask)
+            inner = pairwise_corr(new_values, new_mask, new_values, new_mask)
+            _unit_diagonal(inner)
+            result.loc[new, known] = cross
+            result.loc[known, new] = cross.T
+            result.loc[new, new] = inner
+        return result
+
+    def matrix(self, df, columns=None):
+        """Correlation matrix (df[columns].corr() jaisa), cached"""
+        if columns is None:
+            columns = numeric_columns(df)
+        columns = list(columns)
+        with self._lock:
+            cached = self._cached_frame(df, columns)
+        if cached is not None:
+            return cached
+
+        keys = tuple(_column_key(df[column]) for column in columns)
+        with self._lock:
+            matrix = self._entries.get(keys)
+            if matrix is not None:
+                self._entries.move_to_end(keys)
+        if matrix is None:
+            matrix = self._compute(df, columns, keys)
+            # Cache me content-key order wala matrix, caller ko uske column names
+            with self._lock:
+                self._entries[keys] = matrix
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        if list(matrix.columns) != columns:
+            matrix = pd.DataFrame(matrix.to_numpy(), index=columns, columns=columns)
+        with self._lock:
+            self._remember_frame(df, columns, matrix)
+        return matrix
+
+    def top_pairs(self, df, k=None, columns=None):
+        """Sabse strong k column pairs (|r| ke hisab se) - heatmap ki jagah wide sheets pe"""
+        k = k or config.CORRELATION_CONFIG["top_k"]
+        matrix = self.matrix(df, columns)
+        values = matrix.to_numpy()
+        rows, cols = np.triu_indices(len(values), k=1)
+        pair_values = values[rows, cols]
+        valid = ~np.isnan(pair_values)
+        rows, cols, pair_values = rows[valid], cols[valid], pair_values[valid]
+        order = np.argsort(-np.abs(pair_values), kind="stable")[:k]
+        names = matrix.columns
+        return pd.DataFrame({
+            "Column A": names[rows[order]],
+            "Column B": names[cols[order]],
+            "Correlation": pair_values[order],
+        })
+
+    def forget(self, df):
+        """In-place edit ke baad call karo - is frame ka shortcut entry hatao"""
+        with self._lock:
+            self._frames.pop(id(df), None)
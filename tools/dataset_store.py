@@ -0,0 +1,126 @@
+import threading
+import weakref
+import config
+from .ingest_cache import IngestCache, content_hash
+
+
+class DatasetLease:
+    """Ek session ka shared dataset pe handle
+
+    df ek shallow (copy-on-write) view hai - session isme column add/edit
+    kare to sirf usi session ki copy banti hai, shared frame wahi rehta hai.
+    Lease garbage collect ho (session khatam) to reference apne aap chhut jata hai.
+    """
+
+    def __init__(self, store, key, df):
+        self.key = key
+        self.df = df.copy(deep=False)
+        self._finalizer = weakref.finalize(self, store._release, key)
+
+    def release(self):
+        """Shared dataset ka reference chhodo (dobara call safe hai)"""
+        self._finalizer()
+
+    @property
+    def released(self):
+        return not self._finalizer.alive
+
+
+class DatasetStore(IngestCache):
+    """Process-wide parsed datasets - har distinct file/sheet ki ek hi copy
+
+    Sessions acquire() se lease lete hain; reference count zero hone par hi
+    entry memory budget ke hisab se (LRU) evict hoti hai.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, snapshots=None, compact=None):
+        store_config = config.DATASET_STORE_CONFIG
+        if compact is None:
+            compact = config.DTYPE_COMPACTION_CONFIG["enabled"]
+        super().__init__(
+            max_entries=max_entries or store_config["max_entries"],
+            max_bytes=max_bytes or store_config["max_bytes"],
+            snapshots=snapshots,
+            compact=compact
+        )
+        self._lock = threading.RLock()
+        self._key_locks = {}
+        self._refs = {}
+
+    def get(self, key):
+        with self._lock:
+            return super().get(key)
+
+    def put(self, key, df):
+        with self._lock:
+            super().put(key, df)
+
+    def report(self, key):
+        with self._lock:
+            return super().report(key)
+
+    def _evict(self):
+        # Sirf woh entries hatao jinhe koi session use nahi kar raha
+        # (aakhri/nayi entry abhi acquire ho rahi hai - use nahi chhedte)
+        for key in list(self._store)[:-1]:
+            if len(self._store) <= self.max_entries and self.total_bytes <= self.max_bytes:
+                break
+            if self._refs.get(key, 0) == 0:
+                self._remove(key)
+
+    def acquire(self, data, sheet_name=0, digest=None, **options):
+        """Dataset lo (cache me na ho to parse) aur reference badhao
+
+        Same key pe ek saath aaye sessions me sirf ek parse karega.
+        Returns DatasetLease
+        """
+        digest = digest or content_hash(data)
+        key = self.make_key(digest, sheet_name, **options)
+        with self._lock:
+            # [lock, kitne sessions is key pe parse ka wait/parse kar rahe hain]
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                loaded_key, df = self.load_excel(data, sheet_name=sheet_name, digest=digest, **options)
+                with self._lock:
+                    self._refs[loaded_key] = self._refs.get(loaded_key, 0) + 1
+                    return DatasetLease(self, loaded_key, df)
+        finally:
+            # Parse fail ho tab bhi lock chhodo - koi wait na kar raha ho to hata do
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0 and self._key_locks.get(key) is entry:
+                    del self._key_locks[key]
+
+    def _release(self, key):
+        with self._lock:
+            count = self._refs.get(key, 0) - 1
+            if count > 0:
+                self._refs[key] = count
+            else:
+                self._refs.pop(key, None)
+                self._evict()
+
+    def refcount(self, key):
+        with self._lock:
+            return self._refs.get(key, 0)
+
+    def clear(self):
+        """Unreferenced entries hatao (in-use datasets rehte hain)"""
+        with self._lock:
+            for key in list(self._store):
+                if self._refs.get(key, 0) == 0:
+                    self._remove(key)
+
+    def stats(self):
+        """Store ka summary - entries, memory, active leases"""
+        with self._lock:
+            return {
+                "entries": len(self._store),
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "active_leases": sum(self._refs.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -1,27 +1,124 @@
 import pandas as pd
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.chart import BarChart, Reference
 from pathlib import Path
+from collections import OrderedDict
 import json
+from .snapshot import SnapshotStore
+from .streaming import ChunkedSheet
+from .workbook import WorkbookHandle
+from .answer_cache import dataset_fingerprint
+from .aggregation import pivot_aggregate
+from .filter_expr import parse_filter, equality_node
+from .column_index import ColumnIndexes
+from .xlsx_writer import write_xlsx, style_header
+from .backends import get_backend
+import config
 
 class ExcelTools:
     """Excel operations ke liye tools"""
     
+    # format_excel shortcut ke liye kitni saved files yaad rakhni hain
+    MAX_SAVED_FILES = 8
+    
     def __init__(self, file_path=None):
         self.file_path = file_path
         self.df = None
         self.wb = None
+        self.snapshots = SnapshotStore()
+        self.stream = None
+        self.workbook = None
+        # Agent answer cache (optional) - data badle to iske answers invalid
+        self.answer_cache = None
+        self._fingerprint = None
+        self._fingerprint_df = None
+        # Filter/lookup ke liye per-column indexes (lazy)
+        self.indexes = ColumnIndexes()
+        # save_excel ki files -> (data fingerprint, mtime, size) - format_excel read-back skip karta hai
+        self._saved = OrderedDict()
+        # Filter/sort/aggregate/group-by engine (config.QUERY_ENGINE_CONFIG)
+        self.backend = get_backend()
         
     def read_excel(self, file_path, sheet_name=0):
         """Excel file read karo"""
         try:
+            # Bahut badi file RAM me load nahi karte - streaming mode
+            if Path(file_path).stat().st_size > config.STREAM_THRESHOLD_BYTES:
+                return self.read_excel_stream(file_path, sheet_name)
             self.file_path = file_path
-            self.df = pd.read_excel(file_path, sheet_name=sheet_name)
+            self.stream = None
+            # Workbook handle - baaki sheets tabhi parse hongi jab select hongi
+            self.workbook = WorkbookHandle(file_path, snapshots=self.snapshots)
+            self.df = self.workbook.get_sheet(sheet_name)
             return f"✅ File read successful! Shape: {self.df.shape}\n\nFirst 5 rows:\n{self.df.head()}"
         except Exception as e:
             return f"❌ Error: {str(e)}"
     
+    def list_sheets(self):
+        """Workbook ki saari sheets (names + dimensions)"""
+        if self.workbook is None:
+            return "❌ Pehle file read karo!"
+        
+        try:
+            return json.dumps(self.workbook.sheet_info(), indent=2, default=str)
+        except Exception as e:
+            return f"❌ Error: {str(e)}"
+    
+    def select_sheet(self, sheet_name):
+        """Dusri sheet pe switch karo (lazy parse)"""
+        if self.workbook is None:
+            return "❌ Pehle file read karo!"
+        
+        try:
+            self.df = self.workbook.get_sheet(sheet_name)
+            return f"✅ Sheet '{sheet_name}' selected! Shape: {self.df.shape}\n\nFirst 5 rows:\n{self.df.head()}"
+        except Exception as e:
+            return f"❌ Error: {str(e)}"
+    
+    def read_excel_stream(self, file_path, sheet_name=0, chunk_size=None):
+        """Excel file streaming mode me kholo (rows chunks me padhi jati hain)"""
+        try:
+            self.file_path = file_path
+            self.df = None
+            self.stream = ChunkedSheet(file_path, sheet_name=sheet_name, chunk_size=chunk_size)
+            return f"✅ File opened in streaming mode! Columns: {list(self.stream.columns)}\n\nFirst 5 rows:\n{self.stream.head()}"
+        except Exception as e:
+            self.stream = None
+            return f"❌ Error: {str(e)}"
+    
+    def fingerprint(self):
+        """Loaded DataFrame ka content fingerprint (same frame pe cached)"""
+        if self.df is None:
+            return None
+        if self._fingerprint_df is not self.df:
+            self._fingerprint = dataset_fingerprint(self.df)
+            self._fingerprint_df = self.df
+        return self._fingerprint
+    
+    def mark_mutated(self):
+        """Data badalne se pehle call karo - purane fingerprint ke answers hatao"""
+        if self.answer_cache is not None and self.df is not None:
+            self.answer_cache.invalidate(self.fingerprint())
+        self._fingerprint = None
+        self._fingerprint_df = None
+        self.indexes.invalidate()
+        self._saved.clear()
+    
+    def unload(self):
+        """Loaded data ke saare references chhodo (cached answers rehte hain)"""
+        self.df = None
+        self.stream = None
+        self.workbook = None
+        self.file_path = None
+        self._fingerprint = None
+        self._fingerprint_df = None
+        self.indexes.invalidate()
+        self._saved.clear()
+    
+    def _source(self):
+        """Loaded DataFrame, ya streaming mode me ChunkedSheet"""
+        return self.df if self.df is not None else self.stream
+    
     def get_data_info(self):
         """Data ki information"""
         if self.df is None:
@@ -39,7 +136,7 @@ class ExcelTools:
         """Naya Excel file banao"""
         try:
             df = pd.DataFrame(data_dict)
-            df.to_excel(output_path, sheet_name=sheet_name, index=False)
+            write_xlsx(df, output_path, sheet_name=sheet_name)
             return f"✅ File created: {output_path}"
         except Exception as e:
             return f"❌ Error: {str(e)}"
@@ -48,52 +145,132 @@ class ExcelTools:
         """Data add karo Excel me"""
         try:
             df = pd.DataFrame(data_dict)
-            df.to_excel(output_path, index=False)
+            write_xlsx(df, output_path)
             return f"✅ Data added to {output_path}"
         except Exception as e:
             return f"❌ Error: {str(e)}"
     
     def filter_data(self, column, value):
         """Data filter karo"""
-        if self.df is None:
+        source = self._source()
+        if source is None:
             return "❌ Pehle file read karo!"
         
         try:
-            filtered_df = self.df[self.df[column] == value]
+            if isinstance(source, ChunkedSheet):
+                filtered_df = source.filter(column, value)
+            else:
+                # Value column ke dtype me convert hoti hai ("30" -> 30 for numbers)
+                filtered_df = self.backend.filter(source, equality_node(column, value), self.indexes)
             return f"Filtered Results:\n{filtered_df}"
         except Exception as e:
             return f"❌ Error: {str(e)}"
     
+    def query_data(self, expression):
+        """Filter expression se data filter karo
+
+        e.g. "City = 'Delhi' AND Salary > 50000", "Age BETWEEN 25 AND 30",
+        "City IN ('Delhi', 'Mumbai')", "Name ~ '^A'", "`Join Date` >= '2023-01-01'"
+        """
+        source = self._source()
+        if source is None:
+            return "❌ Pehle file read karo!"
+        
+        try:
+            if isinstance(source, ChunkedSheet):
+                filtered_df = source.query(expression)
+            else:
+                node = parse_filter(expression, source.columns)
+                filtered_df = self.backend.filter(source, node, self.indexes)
+            return f"Filtered Results ({len(filtered_df)} rows):\n{filtered_df}"
+        except Exception as e:
+            return f"❌ Error: {str(e)}"
+    
     def calculate_sum(self, column):
         """Column ka sum nikalo"""
-        if self.df is None:
+        source = self._source()
+        if source is None:
             return "❌ Pehle file read karo!"
         
         try:
-            total = self.df[column].sum()
+            total = self.backend.aggregate(source, column, "sum")
             return f"Sum of {column}: {total}"
         except Exception as e:
             return f"❌ Error: {str(e)}"
     
     def calculate_average(self, column):
         """Column ka average nikalo"""
-        if self.df is None:
+        source = self._source()
+        if source is None:
             return "❌ Pehle file read karo!"
         
         try:
-            avg = self.df[column].mean()
+            avg = self.backend.aggregate(source, column, "mean")
             return f"Average of {column}: {avg}"
         except Exception as e:
             return f"❌ Error: {str(e)}"
     
-    def sort_data(self, column, ascending=True):
-        """Data sort karo"""
+    def calculate_min(self, column):
+        """Column ka minimum nikalo"""
+        source = self._source()
+        if source is None:
+            return "❌ Pehle file read karo!"
+        
+        try:
+            result = self.backend.aggregate(source, column, "min")
+            return f"Minimum of {column}: {result}"
+        except Exception as e:
+            return f"❌ Error: {str(e)}"
+    
+    def calculate_max(self, column):
+        """Column ka maximum nikalo"""
+        source = self._source()
+        if source is None:
+            return "❌ Pehle file read karo!"
+        
+        try:
+            result = self.backend.aggregate(source, column, "max")
+            return f"Maximum of {column}: {result}"
+        except Exception as e:
+            return f"❌ Error: {str(e)}"
+    
+    def group_by(self, by_column, value_column=None, agg="sum"):
+        """Group-by aggregate - kai keys/values/aggs ek saath
+
+        by_column / value_column / agg: naam, list ya comma-separated string.
+        agg: sum, mean, count, min, max, nunique, median, pNN (percentile)
+        """
         if self.df is None:
             return "❌ Pehle file read karo!"
         
         try:
-            self.df = self.df.sort_values(by=column, ascending=ascending)
-            return f"✅ Data sorted by {column}\n{self.df.head()}"
+            result = self.backend.group_by(self.df, by_column, value_column, agg)
+            return f"Group-by result ({len(result)} groups):\n{result.to_string(index=False)}"
+        except Exception as e:
+            return f"❌ Error: {str(e)}"
+    
+    def pivot_data(self, index, columns, values, agg="sum"):
+        """Pivot table banao (index x columns, ek value column)"""
+        if self.df is None:
+            return "❌ Pehle file read karo!"
+        
+        try:
+            table = pivot_aggregate(self.df, index, columns, values, agg)
+            return f"Pivot of {agg}({values}):\n{table.to_string()}"
+        except Exception as e:
+            return f"❌ Error: {str(e)}"
+    
+    def sort_data(self, column, ascending=True, inplace=True):
+        """Data sort karo (inplace=False: sirf sorted view dikhao, df waisa hi)"""
+        if self.df is None:
+            return "❌ Pehle file read karo!"
+        
+        try:
+            result = self.backend.sort(self.df, column, ascending)
+            if inplace:
+                self.mark_mutated()
+                self.df = result
+            return f"✅ Data sorted by {column}\n{result.head()}"
         except Exception as e:
             return f"❌ Error: {str(e)}"
     
@@ -103,6 +280,7 @@ class ExcelTools:
             return "❌ Pehle file read karo!"
         
         try:
+            self.mark_mutated()
             self.df[column_name] = values
             return f"✅ Column '{column_name}' added!"
         except Exception as e:
@@ -114,27 +292,35 @@ class ExcelTools:
             return "❌ No data to save!"
         
         try:
-            self.df.to_excel(output_path, index=False)
+            write_xlsx(self.df, output_path)
+            path = Path(output_path).resolve()
+            stat = path.stat()
+            self._saved[path] = (self.fingerprint(), stat.st_mtime_ns, stat.st_size)
+            self._saved.move_to_end(path)
+            while len(self._saved) > self.MAX_SAVED_FILES:
+                self._saved.popitem(last=False)
             return f"✅ File saved: {output_path}"
         except Exception as e:
             return f"❌ Error: {str(e)}"
     
+    def _is_current_save(self, file_path):
+        """File abhi bhi wahi hai jo save_excel ne current data se likhi thi?"""
+        path = Path(file_path).resolve()
+        saved = self._saved.get(path)
+        if saved is None or self.df is None or not path.exists():
+            return False
+        stat = path.stat()
+        # File baad me kisi aur ne badli ho to mtime/size match nahi karega
+        return saved == (self.fingerprint(), stat.st_mtime_ns, stat.st_size)
+    
     def format_excel(self, file_path, output_path):
         """Excel file ko format karo (colors, fonts)"""
         try:
-            wb = openpyxl.load_workbook(file_path)
-            ws = wb.active
-            
-            # Header formatting
-            header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=12)
-            
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center")
-            
-            wb.save(output_path)
+            if self._is_current_save(file_path):
+                # Humne hi current data se likhi thi - dobara padhne ki jagah seedha styled write
+                write_xlsx(self.df, output_path)
+            else:
+                style_header(file_path, output_path)
             return f"✅ File formatted and saved: {output_path}"
         except Exception as e:
             return f"❌ Error: {str(e)}"
@@ -0,0 +1,178 @@
+import gzip
+import io
+import os
+import uuid
+from pathlib import Path
+import config
+from .answer_cache import dataset_fingerprint
+from .xlsx_writer import write_xlsx
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    HAS_ZSTD = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    pa = None
+    pq = None
+    HAS_PYARROW = False
+
+
+EXPORT_FORMATS = {
+    "csv": {"extension": "csv", "mime": "text/csv", "compressions": (None, "gzip", "zstd")},
+    "json": {"extension": "json", "mime": "application/json", "compressions": (None, "gzip", "zstd")},
+    # XLSX pehle se zip hai - alag compression nahi
+    "xlsx": {"extension": "xlsx",
+             "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+             "compressions": (None,)},
+    "parquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet",
+                "compressions": (None, "gzip", "zstd")},
+}
+
+# Text formats (csv/json) file-level compression; parquet apna codec use karta hai
+COMPRESSIONS = {
+    None: {"suffix": "", "mime": None},
+    "gzip": {"suffix": ".gz", "mime": "application/gzip"},
+    "zstd": {"suffix": ".zst", "mime": "application/zstd"},
+}
+
+
+def available_formats(fmt=None):
+    """Is environment me kaun se formats/compressions chal sakte hain
+
+    fmt diya ho to sirf wahi compressions jo us format pe lagti hain.
+    """
+    formats = [name for name in EXPORT_FORMATS if name != "parquet" or HAS_PYARROW]
+    supported = EXPORT_FORMATS[fmt]["compressions"] if fmt in EXPORT_FORMATS else COMPRESSIONS
+    # Parquet zstd pyarrow ka codec hai, zstandard package nahi chahiye
+    compressions = [name for name in COMPRESSIONS
+                    if name in supported and (name != "zstd" or HAS_ZSTD or fmt == "parquet")]
+    return formats, compressions
+
+
+def _chunks(df, chunk_size):
+    for start in range(0, len(df), chunk_size):
+        yield start, df.iloc[start:start + chunk_size]
+
+
+def _open_text(path, compression):
+    """Text sink - gzip/zstd ho to compressed stream"""
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if compression == "zstd":
+        raw = open(path, "wb")
+        writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(writer, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _write_csv(df, path, compression, chunk_size):
+    with _open_text(path, compression) as handle:
+        if df.empty:
+            df.to_csv(handle, index=False)
+        for start, chunk in _chunks(df, chunk_size):
+            chunk.to_csv(handle, index=False, header=(start == 0))
+
+
+def _write_json(df, path, compression, chunk_size):
+    # Records array - har chunk ke records bracket hata ke jodte hain
+    with _open_text(path, compression) as handle:
+        handle.write("[")
+        first = True
+        for _, chunk in _chunks(df, chunk_size):
+            records = chunk.to_json(orient="records")[1:-1]
+            if not records:
+                continue
+            if not first:
+                handle.write(",")
+            handle.write(records)
+            first = False
+        handle.write("]")
+
+
+def _write_xlsx(df, path, chunk_size):
+    write_xlsx(df, path, chunk_size=chunk_size)
+
+
+def _write_parquet(df, path, compression, chunk_size):
+    if not HAS_PYARROW:
+        raise RuntimeError("Parquet export needs pyarrow")
+    # Schema poore frame se - pehle chunk me koi column khali ho to bhi type sahi rahe
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    writer = pq.ParquetWriter(str(path), schema, compression=compression or "snappy")
+    try:
+        for _, chunk in _chunks(df, chunk_size):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        writer.close()
+
+
+def _prune(directory, max_files):
+    """Purane exports hatao - sirf latest max_files rakhte hain"""
+    files = sorted(
+        (p for p in directory.iterdir() if p.is_file() and not p.name.endswith(".tmp")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True
+    )
+    for old in files[max_files:]:
+        old.unlink(missing_ok=True)
+
+
+def export_path(fingerprint, fmt, compression=None, directory=None):
+    """Export file ka path (dataset fingerprint + format + compression)"""
+    directory = Path(directory or config.EXPORT_CONFIG["directory"])
+    suffix = "" if fmt in ("xlsx", "parquet") else COMPRESSIONS[compression]["suffix"]
+    codec = f"_{compression}" if fmt == "parquet" and compression else ""
+    return directory / f"{fingerprint[:16]}{codec}.{EXPORT_FORMATS[fmt]['extension']}{suffix}"
+
+
+def export_frame(df, fmt="csv", compression=None, directory=None, chunk_size=None, fingerprint=None):
+    """DataFrame ko chunk-by-chunk file me likho (sirf download maangne pe)
+
+    Same data + format ka export pehle se ho to wahi file dobara milti hai.
+    Returns (path, mime)
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt} (use {', '.join(EXPORT_FORMATS)})")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compression} (use gzip or zstd)")
+    if compression not in EXPORT_FORMATS[fmt]["compressions"]:
+        raise ValueError(f"{fmt} export does not support {compression} compression")
+    if compression == "zstd" and fmt in ("csv", "json") and not HAS_ZSTD:
+        raise RuntimeError("zstd compression needs the zstandard package")
+
+    export_config = config.EXPORT_CONFIG
+    directory = Path(directory or export_config["directory"])
+    directory.mkdir(parents=True, exist_ok=True)
+    chunk_size = chunk_size or export_config["chunk_size"]
+    fingerprint = fingerprint or dataset_fingerprint(df)
+
+    path = export_path(fingerprint, fmt, compression, directory)
+    mime = EXPORT_FORMATS[fmt]["mime"]
+    if fmt in ("csv", "json") and compression:
+        mime = COMPRESSIONS[compression]["mime"]
+    if path.exists():
+        os.utime(path)
+        return path, mime
+
+    tmp_path = directory / f"{path.name}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        if fmt == "csv":
+            _write_csv(df, tmp_path, compression, chunk_size)
+        elif fmt == "json":
+            _write_json(df, tmp_path, compression, chunk_size)
+        elif fmt == "xlsx":
+            _write_xlsx(df, tmp_path, chunk_size)
+        else:
+            _write_parquet(df, tmp_path, compression, chunk_size)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    _prune(directory, export_config["max_files"])
+    return path, mime
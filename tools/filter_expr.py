@@ -0,0 +1,430 @@
+import re
+import numpy as np
+import pandas as pd
+from .column_index import positions_to_mask
+
+
+class FilterSyntaxError(ValueError):
+    """Filter expression samajh nahi aaya"""
+
+
+# ============================================
+# TOKENIZER
+# ============================================
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)(?![\w.])
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<quoted>`[^`]+`|\[[^\]]+\])
+      | (?P<op>==|!=|<>|>=|<=|=|>|<|~|\(|\)|,)
+      | (?P<word>[^\s=!<>~(),'"`\[\]]+)
+    )""", re.VERBOSE)
+
+KEYWORDS = {"and", "or", "not", "in", "between", "is", "null", "contains", "matches", "like"}
+
+
+def tokenize(expression):
+    """Expression ko (kind, value) tokens me todo"""
+    tokens = []
+    pos = 0
+    expression = expression.strip()
+    while pos < len(expression):
+        match = TOKEN_PATTERN.match(expression, pos)
+        if not match or match.end() == pos:
+            raise FilterSyntaxError(f"Unexpected character at position {pos}: {expression[pos:pos + 10]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "string":
+            tokens.append(("string", re.sub(r"\\(.)", r"\1", text[1:-1])))
+        elif kind == "quoted":
+            tokens.append(("column", text[1:-1]))
+        elif kind == "number":
+            tokens.append(("number", text))
+        elif kind == "op":
+            tokens.append(("op", "!=" if text == "<>" else "=" if text == "==" else text))
+        elif text.lower() in KEYWORDS:
+            tokens.append(("kw", text.lower()))
+        else:
+            tokens.append(("word", text))
+    return tokens
+
+
+# ============================================
+# PARSER (recursive descent -> AST tuples)
+# ============================================
+# AST nodes:
+#   ("and", left, right) / ("or", left, right) / ("not", node)
+#   ("cmp", column, op, value)         op: = != > >= < <=
+#   ("between", column, low, high)
+#   ("in", column, [values], negate)
+#   ("regex", column, pattern)         LIKE bhi anchored regex ban ke yahi
+#   ("contains", column, text)
+#   ("null", column, negate)
+
+def like_to_regex(pattern):
+    """SQL LIKE pattern -> anchored regex (% = kuch bhi, _ = ek character)"""
+    parts = []
+    for ch in str(pattern):
+        if ch == "%":
+            parts.append(".*")
+        elif ch == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(ch))
+    return "^" + "".join(parts) + "$"
+
+
+class _Parser:
+    def __init__(self, tokens, columns):
+        self.tokens = tokens
+        self.pos = 0
+        self.columns = [str(col) for col in columns]
+        self._lookup = {col.lower(): col for col in self.columns}
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def accept(self, kind, value=None):
+        token = self.peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, kind, value=None):
+        if not self.accept(kind, value):
+            found = self.peek()[1]
+            raise FilterSyntaxError(f"Expected {value or kind}, found {found!r}")
+
+    def parse(self):
+        if not self.tokens:
+            raise FilterSyntaxError("Empty filter expression")
+        node = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise FilterSyntaxError(f"Unexpected token {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self):
+        node = self.parse_and()
+        while self.accept("kw", "or"):
+            node = ("or", node, self.parse_and())
+        return node
+
+    def parse_and(self):
+        node = self.parse_not()
+        while self.accept("kw", "and"):
+            node = ("and", node, self.parse_not())
+        return node
+
+    def parse_not(self):
+        if self.accept("kw", "not"):
+            return ("not", self.parse_not())
+        if self.accept("op", "("):
+            node = self.parse_or()
+            self.expect("op", ")")
+            return node
+        return self.parse_condition()
+
+    def parse_column(self):
+        # Multi-word column names bina backticks ke bhi (longest match)
+        kind, value = self.peek()
+        if kind == "column":
+            self.pos += 1
+            return self._resolve(value)
+        if kind not in ("word", "string"):
+            raise FilterSyntaxError(f"Expected column name, found {value!r}")
+        best = None
+        parts = []
+        for i in range(self.pos, len(self.tokens)):
+            k, v = self.tokens[i]
+            if k not in ("word", "number"):
+                break
+            parts.append(v)
+            if " ".join(parts).lower() in self._lookup:
+                best = i
+        if best is None:
+            if kind == "string" and value.lower() in self._lookup:
+                self.pos += 1
+                return self._lookup[value.lower()]
+            raise FilterSyntaxError(f"Unknown column: {value!r}")
+        name = " ".join(v for _, v in self.tokens[self.pos:best + 1])
+        self.pos = best + 1
+        return self._lookup[name.lower()]
+
+    def _resolve(self, name):
+        if name in self.columns:
+            return name
+        if name.lower() in self._lookup:
+            return self._lookup[name.lower()]
+        raise FilterSyntaxError(f"Unknown column: {name!r}")
+
+    def parse_value(self):
+        kind, value = self.take()
+        if kind in ("string", "number", "word"):
+            return (kind, value)
+        if kind == "kw" and value == "null":
+            return ("null", None)
+        raise FilterSyntaxError(f"Expected value, found {value!r}")
+
+    def parse_pattern(self):
+        pattern = self.parse_value()[1]
+        try:
+            re.compile(str(pattern))
+        except re.error as e:
+            raise FilterSyntaxError(f"Invalid regex {pattern!r}: {e}")
+        return pattern
+
+    def parse_condition(self):
+        column = self.parse_column()
+        kind, value = self.peek()
+
+        if kind == "op" and value in ("=", "!=", ">", ">=", "<", "<="):
+            self.pos += 1
+            return ("cmp", column, value, self.parse_value())
+        if kind == "op" and value == "~":
+            self.pos += 1
+            return ("regex", column, self.parse_pattern())
+        if kind == "kw":
+            self.pos += 1
+            if value == "between":
+                low = self.parse_value()
+                self.expect("kw", "and")
+                return ("between", column, low, self.parse_value())
+            if value == "matches":
+                return ("regex", column, self.parse_pattern())
+            if value == "like":
+                return ("regex", column, like_to_regex(self.parse_value()[1]))
+            if value == "contains":
+                return ("contains", column, self.parse_value()[1])
+            if value == "is":
+                negate = self.accept("kw", "not")
+                self.expect("kw", "null")
+                return ("null", column, negate)
+            if value == "in" or (value == "not" and self.accept("kw", "in")):
+                negate = value == "not"
+                self.expect("op", "(")
+                values = [self.parse_value()]
+                while self.accept("op", ","):
+                    values.append(self.parse_value())
+                self.expect("op", ")")
+                return ("in", column, values, negate)
+        raise FilterSyntaxError(f"Expected operator after {column!r}, found {value!r}")
+
+
+def parse_filter(expression, columns):
+    """Expression ko AST me badlo (syntax galat ho to FilterSyntaxError)"""
+    return _Parser(tokenize(expression), columns).parse()
+
+
+def filter_columns(node):
+    """AST me use hue saare column names"""
+    if node[0] in ("and", "or"):
+        return filter_columns(node[1]) | filter_columns(node[2])
+    if node[0] == "not":
+        return filter_columns(node[1])
+    return {node[1]}
+
+
+# ============================================
+# COMPILER (AST -> vectorized boolean mask)
+# ============================================
+def coerce_value(series, literal):
+    """Literal ko column ke native dtype me badlo (string scan nahi karna padta)"""
+    kind, raw = literal
+    if kind == "null":
+        return None
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        lowered = str(raw).lower()
+        if lowered in ("true", "yes", "1"):
+            return True
+        if lowered in ("false", "no", "0"):
+            return False
+        raise FilterSyntaxError(f"Column {series.name!r} is boolean, got {raw!r}")
+    if pd.api.types.is_numeric_dtype(dtype):
+        try:
+            number = float(str(raw).replace(",", ""))
+        except ValueError:
+            raise FilterSyntaxError(f"Column {series.name!r} is numeric, got {raw!r}")
+        if pd.api.types.is_integer_dtype(dtype) and number.is_integer():
+            return int(number)
+        return number
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        try:
+            value = pd.Timestamp(raw)
+        except ValueError:
+            raise FilterSyntaxError(f"Column {series.name!r} is a date, got {raw!r}")
+        tz = getattr(dtype, "tz", None)
+        if tz is not None and value.tzinfo is None:
+            value = value.tz_localize(tz)
+        return value
+    if kind == "number" and series.dtype == object:
+        # Object column me numbers bhi ho sakte hain
+        number = float(raw)
+        return int(number) if number.is_integer() else number
+    return str(raw)
+
+
+def _equals(series, value, literal):
+    if value is None:
+        return series.isna()
+    mask = series == value
+    if series.dtype == object and literal[0] == "number":
+        # Mixed object column: 30 aur "30" dono match
+        mask = mask | (series == literal[1])
+    # Nullable (Int64/string) me NA aata hai - NA = no match, taki "!=" me
+    # null rows aayein (float NaN aur index path jaisa)
+    return mask.fillna(False).astype(bool)
+
+
+def _string_series(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Categories pe ek baar string op, phir codes se map (har row pe nahi)
+        categories = series.cat.categories.astype(str)
+        return series.cat.codes, categories
+    return None, None
+
+
+def _indexed_positions(node, df, indexes):
+    """Leaf node ke matching row positions column index se (None = index nahi laga)
+
+    Returns (positions, negate)
+    """
+    op = node[0]
+    if op not in ("cmp", "between", "in"):
+        return None
+    column = node[1]
+    series = df[column]
+    literals = node[2] if op == "in" else [node[3]] if op == "cmp" else [node[2], node[3]]
+    if series.dtype == object and any(literal[0] == "number" for literal in literals):
+        # Mixed object column ka "30"/30 logic sirf scan path me hai
+        return None
+    values = [coerce_value(series, literal) for literal in literals]
+    if any(value is None for value in values):
+        return None
+
+    if op == "in":
+        index = indexes.get(df, column)
+        return (index.isin(values), node[3]) if index is not None else None
+    if op == "cmp" and node[2] in ("=", "!="):
+        index = indexes.get(df, column)
+        return (index.equal(values[0]), node[2] == "!=") if index is not None else None
+
+    index = indexes.get(df, column, kind="sorted")
+    if index is None:
+        return None
+    if op == "between":
+        positions = index.range(values[0], values[1])
+    elif node[2] in (">", ">="):
+        positions = index.range(low=values[0], include_low=(node[2] == ">="))
+    else:
+        positions = index.range(high=values[0], include_high=(node[2] == "<="))
+    # Bahut saari rows match hon to numeric scan hi sasta hai
+    if len(positions) > len(df) // 4:
+        return None
+    return positions, False
+
+
+def compile_mask(node, df, indexes=None):
+    """AST ko DataFrame pe boolean mask me badlo
+
+    indexes (ColumnIndexes) diye hon to equality/range/IN lookups column
+    index se hote hain, full scan nahi.
+    """
+    op = node[0]
+    if op == "and":
+        return compile_mask(node[1], df, indexes) & compile_mask(node[2], df, indexes)
+    if op == "or":
+        return compile_mask(node[1], df, indexes) | compile_mask(node[2], df, indexes)
+    if op == "not":
+        return ~compile_mask(node[1], df, indexes)
+
+    if indexes is not None:
+        found = _indexed_positions(node, df, indexes)
+        if found is not None:
+            positions, negate = found
+            mask = positions_to_mask(positions, df)
+            return ~mask if negate else mask
+
+    series = df[node[1]]
+    if op == "cmp":
+        _, _, cmp, literal = node
+        value = coerce_value(series, literal)
+        if cmp == "=":
+            return _equals(series, value, literal)
+        if cmp == "!=":
+            return ~_equals(series, value, literal)
+        if value is None:
+            raise FilterSyntaxError("Use IS NULL / IS NOT NULL for null checks")
+        if isinstance(series.dtype, pd.CategoricalDtype) and not series.cat.ordered:
+            series = series.astype(series.cat.categories.dtype)
+        try:
+            result = {">": series.gt, ">=": series.ge, "<": series.lt, "<=": series.le}[cmp](value)
+        except TypeError:
+            # Mixed object column (numbers + text) ya galat type ka value
+            raise FilterSyntaxError(f"Cannot compare column {node[1]!r} with {literal[1]!r}")
+        return result.fillna(False).astype(bool)
+    if op == "between":
+        low, high = coerce_value(series, node[2]), coerce_value(series, node[3])
+        try:
+            return series.between(low, high).fillna(False).astype(bool)
+        except TypeError:
+            raise FilterSyntaxError(f"Cannot compare column {node[1]!r} with {node[2][1]!r} / {node[3][1]!r}")
+    if op == "in":
+        values = [coerce_value(series, literal) for literal in node[2]]
+        mask = series.isin([v for v in values if v is not None])
+        if any(v is None for v in values):
+            mask = mask | series.isna()
+        return ~mask if node[3] else mask
+    if op == "null":
+        mask = series.isna()
+        return ~mask if node[2] else mask
+    if op in ("regex", "contains"):
+        pattern = node[2]
+        codes, categories = _string_series(series)
+        if codes is not None:
+            hits = categories.str.contains(pattern, case=False, regex=(op == "regex"))
+            hits = np.append(np.asarray(hits, dtype=bool), False)
+            # code -1 (NaN) -> aakhri False
+            return pd.Series(hits[codes.to_numpy()], index=series.index)
+        if series.dtype != object and not pd.api.types.is_string_dtype(series.dtype):
+            series = series.astype(str)
+        return series.str.contains(pattern, case=False, regex=(op == "regex"), na=False).astype(bool)
+    raise FilterSyntaxError(f"Unknown node: {op}")
+
+
+def compile_filter(expression, df, indexes=None):
+    """Expression string -> boolean mask"""
+    return compile_mask(parse_filter(expression, df.columns), df, indexes)
+
+
+def filter_rows(df, node, indexes=None):
+    """Parsed AST se filtered DataFrame"""
+    if indexes is not None:
+        # Akela indexed condition - mask banaye bina seedha rows lo
+        found = _indexed_positions(node, df, indexes)
+        if found is not None and not found[1]:
+            return df.iloc[np.sort(found[0])]
+    return df[compile_mask(node, df, indexes)]
+
+
+def apply_filter(df, expression, indexes=None):
+    """Expression se filtered DataFrame"""
+    return filter_rows(df, parse_filter(expression, df.columns), indexes)
+
+
+def equality_node(column, value):
+    """(column, value) pair ka AST node - value column dtype me coerce hogi"""
+    if isinstance(value, bool):
+        literal = ("word", str(value))
+    elif isinstance(value, (int, float, np.number)):
+        literal = ("number", str(value))
+    else:
+        literal = ("string", str(value))
+    return ("cmp", column, "=", literal)
@@ -0,0 +1,90 @@
+import math
+import config
+from .pipeline import OperationPipeline
+
+
+class GridView:
+    """Bade frames ka paged view - browser ko sirf current page jaata hai
+
+    Sort/filter state server pe rehta hai (OperationPipeline me evaluated
+    aur cached), isliye page badalna sirf ek slice hai - rows kitni bhi hon.
+    Source DataFrame ho ya koi OperationPipeline (uska plan as-is dikhta hai).
+    """
+
+    def __init__(self, source, page_size=None, indexes=None):
+        self.source = source
+        self.indexes = indexes
+        self.page_size = page_size or config.GRID_CONFIG["page_size"]
+        self.sort_column = None
+        self.ascending = True
+        self.filter_expression = ""
+        self.page_number = 0
+        self._view = None
+
+    @property
+    def controls_enabled(self):
+        """Sort/filter sirf DataFrame source pe (pipeline ka apna plan hai)"""
+        return not isinstance(self.source, OperationPipeline)
+
+    def _build(self, filter_expression, sort_column, ascending):
+        view = OperationPipeline(self.source, self.indexes)
+        if filter_expression:
+            view.filter(filter_expression)
+        if sort_column is not None:
+            view.sort(sort_column, ascending)
+        return view
+
+    @property
+    def view(self):
+        if not self.controls_enabled:
+            return self.source
+        if self._view is None:
+            self._view = self._build(self.filter_expression, self.sort_column, self.ascending)
+        return self._view
+
+    def set_sort(self, column, ascending=True):
+        if (column, ascending) != (self.sort_column, self.ascending):
+            self._view = self._build(self.filter_expression, column, ascending)
+            self.sort_column, self.ascending = column, ascending
+            self.page_number = 0
+
+    def set_filter(self, expression):
+        """Filter badlo - galat expression pe FilterSyntaxError (purana view bana rehta hai)"""
+        expression = (expression or "").strip()
+        if expression != self.filter_expression:
+            self._view = self._build(expression, self.sort_column, self.ascending)
+            self.filter_expression = expression
+            self.page_number = 0
+
+    def set_page_size(self, size):
+        if size != self.page_size:
+            # Pehli dikh rahi row wahi rahe
+            first_row = self.page_number * self.page_size
+            self.page_size = size
+            self.page_number = first_row // size
+
+    @property
+    def columns(self):
+        return self.view.columns
+
+    @property
+    def total_rows(self):
+        return len(self.view)
+
+    @property
+    def page_count(self):
+        return max(1, math.ceil(self.total_rows / self.page_size))
+
+    def go_to(self, page_number):
+        self.page_number = min(max(page_number, 0), self.page_count - 1)
+        return self.page_number
+
+    def current_page(self):
+        """Sirf current page ki rows materialize karo"""
+        self.go_to(self.page_number)
+        return self.view.page(self.page_number, self.page_size)
+
+    def row_range(self):
+        """(pehli row, aakhri row) 1-based, display ke liye"""
+        start = self.page_number * self.page_size
+        return min(start + 1, self.total_rows), min(start + self.page_size, self.total_rows)
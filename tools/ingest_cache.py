@@ -0,0 +1,104 @@
+import hashlib
+import io
+from collections import OrderedDict
+import pandas as pd
+from .compaction import compact_dtypes
+
+
+def content_hash(data):
+    """Uploaded bytes ka sha256 hash nikalo"""
+    return hashlib.sha256(bytes(data)).hexdigest()
+
+
+class IngestCache:
+    """Parsed DataFrames ka LRU cache (bytes hash + sheet/options se keyed)"""
+
+    def __init__(self, max_entries=8, max_bytes=512 * 1024 * 1024, snapshots=None, compact=False):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compact = compact
+        self._store = OrderedDict()
+        self._sizes = {}
+        self._reports = {}
+        self.total_bytes = 0
+        self.snapshots = snapshots
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(digest, sheet_name=0, **options):
+        """Hash + sheet + options se cache key banao"""
+        opts = tuple(sorted((k, repr(v)) for k, v in options.items()))
+        return (digest, repr(sheet_name), opts)
+
+    def get(self, key):
+        """Cache se frame lo (LRU order update hota hai)"""
+        if key not in self._store:
+            self.misses += 1
+            return None
+        self._store.move_to_end(key)
+        self.hits += 1
+        return self._store[key]
+
+    def put(self, key, df):
+        """Frame cache me daalo aur limits ke hisab se evict karo"""
+        if key in self._store:
+            self._remove(key)
+        size = int(df.memory_usage(deep=True).sum())
+        self._store[key] = df
+        self._sizes[key] = size
+        self.total_bytes += size
+        self._evict()
+
+    def _remove(self, key):
+        self._store.pop(key)
+        self._reports.pop(key, None)
+        self.total_bytes -= self._sizes.pop(key)
+
+    def report(self, key):
+        """Is entry ki dtype compaction report (before/after bytes), na ho to None"""
+        return self._reports.get(key)
+
+    def _evict(self):
+        # Sabse purane entries hatao jab tak count/size limit me na aa jaye
+        # (akela bada frame rakhte hain, warna har rerun pe dobara parse hoga)
+        while len(self._store) > 1 and (
+            len(self._store) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._store))
+            self._remove(oldest)
+
+    def clear(self):
+        """Poora cache khali karo"""
+        self._store.clear()
+        self._sizes.clear()
+        self._reports.clear()
+        self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._store)
+
+    def __contains__(self, key):
+        return key in self._store
+
+    def load_excel(self, data, sheet_name=0, digest=None, **options):
+        """Bytes se Excel parse karo - same bytes/options pe cached frame milega
+
+        Returns (key, df)
+        """
+        digest = digest or content_hash(data)
+        key = self.make_key(digest, sheet_name, **options)
+        df = self.get(key)
+        if df is None:
+            if self.snapshots is not None:
+                # Disk snapshot mila to XLSX decode skip
+                df = self.snapshots.read_excel(data, sheet_name, digest=digest, **options)
+            else:
+                df = pd.read_excel(io.BytesIO(bytes(data)), sheet_name=sheet_name, **options)
+            report = None
+            if self.compact and isinstance(df, pd.DataFrame):
+                df, report = compact_dtypes(df)
+            self.put(key, df)
+            if report is not None:
+                self._reports[key] = report
+        return key, df
@@ -0,0 +1,294 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import config
+from .aggregation import group_aggregate, _as_list
+from .filter_expr import compile_mask, filter_columns, parse_filter
+
+
+# Plan steps (immutable tuples):
+#   ("filter", ast_node, expression)
+#   ("sort", (columns...), (ascending...))
+#   ("assign", ((name, value), ...))          - constant value wale naye columns
+#   ("aggregate", (by...), (values...), (aggs...))
+
+
+def describe_step(step):
+    """Step ka readable text (UI ke liye)"""
+    kind = step[0]
+    if kind == "filter":
+        return f"Filter: {step[2]}"
+    if kind == "sort":
+        parts = [f"{column} {'↑' if ascending else '↓'}" for column, ascending in zip(step[1], step[2])]
+        return f"Sort: {', '.join(parts)}"
+    if kind == "assign":
+        return "Add column: " + ", ".join(f"{name} = {value!r}" for name, value in step[1])
+    values = ", ".join(step[2]) if step[2] else "all numeric"
+    return f"Group by {', '.join(step[1])}: {', '.join(step[3])} of {values}"
+
+
+def _rewrite(first, second):
+    """Do adjacent steps ko fuse/reorder karo - None = kuch nahi badla"""
+    a, b = first[0], second[0]
+    if a == "filter" and b == "filter":
+        return [("filter", ("and", first[1], second[1]), f"({first[2]}) AND ({second[2]})")]
+    if a == "sort" and b == "sort":
+        # Stable sort: pehle A phir B == ek hi sort [B..., A...] se
+        columns = list(second[1])
+        ascending = list(second[2])
+        for column, asc in zip(first[1], first[2]):
+            if column not in columns:
+                columns.append(column)
+                ascending.append(asc)
+        return [("sort", tuple(columns), tuple(ascending))]
+    if a == "assign" and b == "assign":
+        merged = OrderedDict(first[1])
+        for name, value in second[1]:
+            merged.pop(name, None)
+            merged[name] = value
+        return [("assign", tuple(merged.items()))]
+    if a == "sort" and b == "filter":
+        # Filter pushdown - kam rows sort karni padengi
+        return [second, first]
+    if a == "assign" and b == "filter":
+        if not filter_columns(second[1]) & {name for name, _ in first[1]}:
+            return [second, first]
+        return None
+    if a == "sort" and b == "assign":
+        # Sort wala column overwrite ho raha ho to order badal jayega
+        if not set(first[1]) & {name for name, _ in second[1]}:
+            return [second, first]
+        return None
+    if a == "sort" and b == "aggregate":
+        # group_aggregate groups ko khud sort karta hai - pehle ka sort bekaar
+        return [second]
+    return None
+
+
+def optimize(steps):
+    """Plan ko fuse + filter pushdown karke chhota karo (result same rehta hai)"""
+    steps = list(steps)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(steps) - 1):
+            replacement = _rewrite(steps[i], steps[i + 1])
+            if replacement is not None:
+                steps[i:i + 2] = replacement
+                changed = True
+                break
+    return tuple(steps)
+
+
+class _State:
+    """Plan ka evaluated result - base frame + row positions + constant columns
+
+    Rows copy nahi hoti; sirf int positions rakhte hain.
+    """
+
+    __slots__ = ("frame", "positions", "extras")
+
+    def __init__(self, frame, positions=None, extras=()):
+        self.frame = frame
+        self.positions = positions
+        self.extras = tuple(extras)
+
+    def __len__(self):
+        return len(self.frame) if self.positions is None else len(self.positions)
+
+    @property
+    def columns(self):
+        names = list(self.frame.columns)
+        for name, _ in self.extras:
+            if name not in names:
+                names.append(name)
+        return names
+
+    def take(self, start=0, stop=None):
+        """Sirf [start:stop) rows materialize karo"""
+        if self.positions is None:
+            result = self.frame.iloc[start:stop]
+        else:
+            result = self.frame.take(self.positions[start:stop])
+        if self.extras:
+            result = result.assign(**{str(name): value for name, value in self.extras})
+        return result
+
+    def columns_frame(self, columns):
+        """Current rows ke sirf diye gaye columns (RangeIndex ke saath)"""
+        extras = dict(self.extras)
+        data = {}
+        for column in columns:
+            if column in extras:
+                data[column] = pd.Series([extras[column]] * len(self)).infer_objects()
+            else:
+                # Series hi rakhte hain taki dtype (category/dates) bana rahe
+                series = self.frame[column]
+                if self.positions is not None:
+                    series = series.take(self.positions)
+                data[column] = series.reset_index(drop=True)
+        return pd.DataFrame(data, index=pd.RangeIndex(len(self)))
+
+    def current_positions(self):
+        if self.positions is None:
+            return np.arange(len(self.frame))
+        return self.positions
+
+
+class OperationPipeline:
+    """Operations tab ka lazy plan - source frame kabhi nahi badalta
+
+    filter/sort/add_column/aggregate sirf steps record karte hain. Plan
+    optimize (fuse + filter pushdown) hoke row positions pe chalta hai;
+    poora frame sirf to_frame() pe banta hai. Undo/redo sirf step lists
+    ke beech switch hai - data copy nahi hota.
+    """
+
+    def __init__(self, source, indexes=None, max_cached_states=None):
+        self.source = source
+        self.indexes = indexes
+        self.max_cached_states = max_cached_states or config.PIPELINE_CONFIG["max_cached_states"]
+        self.steps = ()
+        self._undo = []
+        self._redo = []
+        self._states = OrderedDict()
+
+    # ---------- recording ----------
+    def _record(self, step):
+        self._undo.append(self.steps)
+        self._redo.clear()
+        self.steps = self.steps + (step,)
+        return self
+
+    def filter(self, expression):
+        node = parse_filter(expression, pd.Index(self.columns))
+        return self._record(("filter", node, expression))
+
+    def sort(self, column, ascending=True):
+        self._check_columns([column])
+        return self._record(("sort", (column,), (bool(ascending),)))
+
+    def add_column(self, name, value):
+        return self._record(("assign", ((name, value),)))
+
+    def aggregate(self, by, values=None, aggs="sum"):
+        by, values, aggs = _as_list(by), _as_list(values), _as_list(aggs) or ["sum"]
+        self._check_columns(by + values)
+        return self._record(("aggregate", tuple(by), tuple(values), tuple(aggs)))
+
+    def _check_columns(self, columns):
+        missing = [column for column in columns if column not in self.columns]
+        if missing:
+            raise KeyError(f"Columns not found: {missing}")
+
+    # ---------- history ----------
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        if self._undo:
+            self._redo.append(self.steps)
+            self.steps = self._undo.pop()
+        return self
+
+    def redo(self):
+        if self._redo:
+            self._undo.append(self.steps)
+            self.steps = self._redo.pop()
+        return self
+
+    def reset(self):
+        """Saare steps hatao (undo se wapas aa sakte hain)"""
+        if self.steps:
+            self._undo.append(self.steps)
+            self._redo.clear()
+            self.steps = ()
+        return self
+
+    def describe(self):
+        """Recorded steps (user ne jo kiya) aur optimized plan (jo chalega)"""
+        return [describe_step(step) for step in self.steps], [describe_step(step) for step in self.plan]
+
+    # ---------- evaluation ----------
+    @property
+    def plan(self):
+        return optimize(self.steps)
+
+    def _apply(self, state, step):
+        kind = step[0]
+        if kind == "filter":
+            node = step[1]
+            extras = {name for name, _ in state.extras}
+            if state.positions is None and not filter_columns(node) & extras:
+                indexes = self.indexes if state.frame is self.source else None
+                mask = compile_mask(node, state.frame, indexes)
+                return _State(state.frame, np.flatnonzero(mask.to_numpy()), state.extras)
+            frame = state.columns_frame(sorted(filter_columns(node), key=str))
+            mask = compile_mask(node, frame).to_numpy()
+            return _State(state.frame, state.current_positions()[mask], state.extras)
+        if kind == "sort":
+            columns, ascending = list(step[1]), list(step[2])
+            frame = state.columns_frame(columns)
+            order = frame.sort_values(columns, ascending=ascending, kind="stable").index.to_numpy()
+            return _State(state.frame, state.current_positions()[order], state.extras)
+        if kind == "assign":
+            merged = OrderedDict(state.extras)
+            for name, value in step[1]:
+                merged.pop(name, None)
+                merged[name] = value
+            return _State(state.frame, state.positions, merged.items())
+        _, by, values, aggs = step
+        needed = list(by) + list(values) if values else state.columns
+        grouped = group_aggregate(state.columns_frame(needed), list(by), list(values) or None, list(aggs))
+        return _State(grouped)
+
+    def _state(self):
+        plan = self.plan
+        state = self._states.get(plan)
+        if state is not None:
+            self._states.move_to_end(plan)
+            return state
+        # Sabse lamba cached prefix se aage chalao
+        start, state = 0, _State(self.source)
+        for length in range(len(plan) - 1, 0, -1):
+            cached = self._states.get(plan[:length])
+            if cached is not None:
+                start, state = length, cached
+                break
+        for step in plan[start:]:
+            state = self._apply(state, step)
+        self._states[plan] = state
+        while len(self._states) > self.max_cached_states:
+            self._states.popitem(last=False)
+        return state
+
+    @property
+    def columns(self):
+        return self._state().columns
+
+    def __len__(self):
+        return len(self._state())
+
+    def head(self, n=None):
+        """Pehli n rows (display ke liye) - sirf yahi rows materialize hoti hain"""
+        n = n or config.PIPELINE_CONFIG["page_size"]
+        return self._state().take(0, n)
+
+    def page(self, number, size=None):
+        size = size or config.PIPELINE_CONFIG["page_size"]
+        start = max(number, 0) * size
+        return self._state().take(start, start + size)
+
+    def column(self, name):
+        """Ek column ki current values (poora frame banaye bina)"""
+        self._check_columns([name])
+        return self._state().columns_frame([name])[name]
+
+    def to_frame(self):
+        """Poora result (export / dataset replace ke liye)"""
+        return self._state().take()
@@ -0,0 +1,197 @@
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import config
+
+
+NUMERIC_STATS = ("count", "mean", "std", "min", "25%", "50%", "75%", "max")
+
+
+class HyperLogLog:
+    """Approximate distinct count - 2^p registers, ~1.04/sqrt(2^p) relative error"""
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        """64-bit hashes (numpy uint64 array) add karo - poora vectorized"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size == 0:
+            return
+        p = self.precision
+        buckets = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest_bits = 64 - p
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        # rank = leading zeros (baaki bits me) + 1
+        top_bit = np.zeros(rest.shape, dtype=np.int64)
+        nonzero = rest > 0
+        top_bit[nonzero] = np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64)
+        ranks = np.where(nonzero, rest_bits - top_bit, rest_bits + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Chhoti cardinality pe linear counting zyada sahi hai
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+def _column_hashes(series):
+    """Non-null values ke 64-bit hashes (unhashable objects ko str bana ke)"""
+    values = series.dropna()
+    try:
+        return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+    except TypeError:
+        return pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy(dtype=np.uint64)
+
+
+def profile_column(series, hashes=None, exact_distinct_max_rows=None, hll_precision=None):
+    """Ek column ke saare stats ek saath (nulls, distinct, numeric summary)"""
+    profiling_config = config.PROFILING_CONFIG
+    if exact_distinct_max_rows is None:
+        exact_distinct_max_rows = profiling_config["exact_distinct_max_rows"]
+    hll_precision = hll_precision or profiling_config["hll_precision"]
+    if hashes is None:
+        hashes = _column_hashes(series)
+
+    non_null = len(hashes)
+    stats = {
+        "dtype": str(series.dtype),
+        "non_null": non_null,
+        "null": len(series) - non_null,
+    }
+    if non_null <= exact_distinct_max_rows:
+        stats["unique"] = len(pd.unique(hashes))
+        stats["unique_approx"] = False
+    else:
+        sketch = HyperLogLog(hll_precision)
+        sketch.add_hashes(hashes)
+        stats["unique"] = min(sketch.count(), non_null)
+        stats["unique_approx"] = True
+
+    dtype = series.dtype
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if values.size:
+            q25, q50, q75 = np.percentile(values, [25, 50, 75])
+            stats["numeric"] = {
+                "count": float(values.size),
+                "mean": float(values.mean()),
+                "std": float(values.std(ddof=1)) if values.size > 1 else float("nan"),
+                "min": float(values.min()),
+                "25%": float(q25),
+                "50%": float(q50),
+                "75%": float(q75),
+                "max": float(values.max()),
+            }
+        else:
+            stats["numeric"] = {name: (0.0 if name == "count" else float("nan")) for name in NUMERIC_STATS}
+    return stats
+
+
+class ColumnProfiler:
+    """DataFrame profiling - har column ek pass, results cache me
+
+    Column stats ek order-independent content key (hashes ka sum + dtype +
+    length) pe cached hain, isliye sort ke baad kuch dobara nahi banta aur
+    naya column add hone par sirf wahi column profile hota hai. Same frame
+    object dobara aaye (Streamlit rerun) to hashing bhi skip.
+    """
+
+    def __init__(self, max_entries=None, exact_distinct_max_rows=None, hll_precision=None):
+        profiling_config = config.PROFILING_CONFIG
+        self.max_entries = max_entries or profiling_config["max_entries"]
+        self.exact_distinct_max_rows = (
+            exact_distinct_max_rows if exact_distinct_max_rows is not None
+            else profiling_config["exact_distinct_max_rows"]
+        )
+        self.hll_precision = hll_precision or profiling_config["hll_precision"]
+        self._columns = OrderedDict()
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _frame_key(self, df):
+        return tuple(map(str, df.columns)), tuple(map(str, df.dtypes)), len(df)
+
+    def _cached_frame(self, df):
+        entry = self._frames.get(id(df))
+        if entry is None:
+            return None
+        ref, frame_key, stats = entry
+        if ref() is not df or frame_key != self._frame_key(df):
+            return None
+        return stats
+
+    def _remember_frame(self, df, stats):
+        frame_id = id(df)
+        # Frame garbage collect ho to entry bhi hatao
+        ref = weakref.ref(df, lambda _, frame_id=frame_id: self._frames.pop(frame_id, None))
+        self._frames[frame_id] = (ref, self._frame_key(df), stats)
+
+    def _column_stats(self, series):
+        hashes = _column_hashes(series)
+        key = (str(series.dtype), len(series), len(hashes), int(hashes.sum(dtype=np.uint64)))
+        with self._lock:
+            stats = self._columns.get(key)
+            if stats is not None:
+                self._columns.move_to_end(key)
+                return stats
+        stats = profile_column(series, hashes, self.exact_distinct_max_rows, self.hll_precision)
+        with self._lock:
+            self._columns[key] = stats
+            while len(self._columns) > self.max_entries:
+                self._columns.popitem(last=False)
+        return stats
+
+    def column_stats(self, df):
+        """{column: stats} - cached, sirf naye/badle columns compute hote hain"""
+        with self._lock:
+            stats = self._cached_frame(df)
+        if stats is not None:
+            return stats
+        stats = {column: self._column_stats(df[column]) for column in df.columns}
+        with self._lock:
+            self._remember_frame(df, stats)
+        return stats
+
+    def forget(self, df):
+        """In-place edit ke baad call karo - is frame ka shortcut entry hatao"""
+        with self._lock:
+            self._frames.pop(id(df), None)
+
+    def column_info(self, df):
+        """Upload page ki 'Column Information' table"""
+        stats = self.column_stats(df)
+        approx = any(s["unique_approx"] for s in stats.values())
+        return pd.DataFrame({
+            'Column Name': list(stats),
+            'Data Type': [s["dtype"] for s in stats.values()],
+            'Non-Null Count': [s["non_null"] for s in stats.values()],
+            'Null Count': [s["null"] for s in stats.values()],
+            # Koi bhi approx ho to poora column text (mixed types Arrow me nahi jaate)
+            'Unique Values': [(f"~{s['unique']:,}" if s["unique_approx"] else f"{s['unique']:,}")
+                              if approx else s["unique"] for s in stats.values()],
+        })
+
+    def describe(self, df):
+        """df.describe() jaisa numeric summary (cached stats se)"""
+        stats = self.column_stats(df)
+        numeric = {column: s["numeric"] for column, s in stats.items() if "numeric" in s}
+        if not numeric:
+            return pd.DataFrame(index=list(NUMERIC_STATS))
+        return pd.DataFrame(numeric, index=list(NUMERIC_STATS))
@@ -0,0 +1,295 @@
+import re
+import pandas as pd
+from .streaming import ChunkedSheet
+from .filter_expr import FilterSyntaxError, parse_filter
+
+
+# Keyword -> aggregate function (pandas naam)
+AGG_KEYWORDS = {
+    "sum": "sum", "total": "sum",
+    "average": "mean", "avg": "mean", "mean": "mean",
+    "maximum": "max", "max": "max", "highest": "max", "largest": "max",
+    "minimum": "min", "min": "min", "lowest": "min", "smallest": "min",
+    "count": "count", "number of": "count", "how many": "count",
+    "median": "median",
+    "unique": "nunique", "distinct": "nunique",
+}
+PERCENTILE_WORDS = re.compile(r"(?<!\w)(?:p(\d{1,2})|(\d{1,2})(?:st|nd|rd|th)?\s+percentile)(?!\w)")
+PIVOT_WORDS = r"(?:across|split by|broken down by)"
+
+GROUP_WORDS = r"(?:grouped by|group by|for each|by|per)"
+EQUALS_WORDS = r"(?:==|=|is equal to|equal to|equals|is)"
+SORT_PATTERN = re.compile(r"\b(?:sort|order|arrange)(?:\s+\w+)*?\s+by\s+", re.IGNORECASE)
+DESC_PATTERN = re.compile(r"\b(?:desc|descending|highest first|largest first|reverse)\b", re.IGNORECASE)
+WHERE_PATTERN = re.compile(r"\b(?:where|filter(?:ed)?(?: by| on)?)\s+", re.IGNORECASE)
+
+# Columns/keywords hata ke sirf ye words bachein tabhi router answer karta hai -
+# "max salary in Delhi" me "delhi" bachta hai, to sawal LLM ko jata hai
+STOPWORDS = {
+    "a", "an", "the", "of", "is", "are", "was", "what", "whats", "what's", "which", "me", "my",
+    "show", "give", "tell", "find", "get", "list", "display", "calculate", "compute", "please",
+    "can", "could", "would", "you", "i", "want", "to", "see", "know", "column", "columns",
+    "value", "values", "all", "rows", "row", "records", "record", "data", "sheet", "table",
+    "in", "for", "each", "and", "on", "with", "whose", "having", "from", "it", "its",
+    "sort", "sorted", "order", "ordered", "arrange", "asc", "ascending", "first",
+}
+
+
+def _find_keyword(text, keywords):
+    """Text me kaunse keywords hain (longest first, overlap nahi)"""
+    found = []
+    taken = []
+    for word in sorted(keywords, key=len, reverse=True):
+        for match in re.finditer(r"(?<!\w)" + re.escape(word) + r"(?!\w)", text):
+            if any(start < match.end() and match.start() < end for start, end in taken):
+                continue
+            taken.append((match.start(), match.end()))
+            found.append((match.start(), word))
+    return [word for _, word in sorted(found)]
+
+
+class QueryRouter:
+    """Simple sawalon ko bina LLM ke ExcelTools se answer karo
+
+    Aggregate ("total of Salary by City"), filter ("rows where City is
+    Delhi"), sort aur row/column count pehchanta hai. Jo samajh na aaye uske
+    liye None - tab sawal LLM agent ko jata hai.
+    """
+
+    def __init__(self, excel_tools):
+        self.excel_tools = excel_tools
+
+    @property
+    def columns(self):
+        source = self.excel_tools._source()
+        return [] if source is None else [str(col) for col in source.columns]
+
+    def find_columns(self, text):
+        """Text me mentioned columns, position order me (lambe naam pehle match)"""
+        lowered = text.lower()
+        taken = []
+        found = []
+        for col in sorted(self.columns, key=len, reverse=True):
+            pattern = r"(?<!\w)" + re.escape(col.lower()) + r"(?!\w)"
+            for match in re.finditer(pattern, lowered):
+                if any(start < match.end() and match.start() < end for start, end in taken):
+                    continue
+                taken.append((match.start(), match.end()))
+                found.append((match.start(), match.end(), col))
+        return sorted(found)
+
+    def route(self, question, intents=None):
+        """Question ka direct answer (string) ya None agar LLM chahiye
+
+        intents se limit kar sakte ho: {"group", "filter", "sort", "aggregate", "info"}
+        """
+        if self.excel_tools._source() is None or not question or not question.strip():
+            return None
+        intents = intents or {"group", "filter", "sort", "aggregate", "info"}
+        text = question.strip().rstrip("?.! ")
+        lowered = text.lower()
+        mentions = self.find_columns(text)
+
+        handlers = [
+            ("sort", self._route_sort),
+            ("group", self._route_group),
+            ("filter", self._route_filter),
+            ("aggregate", self._route_aggregate),
+            ("info", self._route_info),
+        ]
+        for intent, handler in handlers:
+            if intent not in intents:
+                continue
+            try:
+                answer = handler(text, lowered, mentions)
+            except Exception:
+                answer = None
+            if answer is not None:
+                return answer
+        return None
+
+    # ----- intents -----
+
+    def _only_stopwords(self, lowered, mentions, patterns=()):
+        """Mentioned columns + pehchane keywords hata ke kuch aur bacha? (bacha = LLM)"""
+        chars = list(lowered)
+        for start, end, _ in mentions:
+            chars[start:end] = " " * (end - start)
+        rest = "".join(chars)
+        for word in sorted(AGG_KEYWORDS, key=len, reverse=True):
+            rest = re.sub(r"(?<!\w)" + re.escape(word) + r"(?!\w)", " ", rest)
+        rest = PERCENTILE_WORDS.sub(" ", rest)
+        for pattern in patterns:
+            rest = re.sub(pattern, " ", rest)
+        return all(word in STOPWORDS for word in re.findall(r"[\w']+", rest))
+
+    def _route_sort(self, text, lowered, mentions):
+        match = SORT_PATTERN.search(text)
+        if not match or not isinstance(self.excel_tools.df, pd.DataFrame):
+            return None
+        after = [col for start, _, col in mentions if start >= match.end()]
+        if len(after) != 1:
+            return None
+        if not self._only_stopwords(lowered, mentions, [r"\bby\b", DESC_PATTERN.pattern]):
+            return None
+        ascending = DESC_PATTERN.search(lowered) is None
+        # Sawal ka jawab hai - agent ka df reorder nahi karte
+        return self.excel_tools.sort_data(after[0], ascending=ascending, inplace=False)
+
+    def _route_group(self, text, lowered, mentions):
+        if not isinstance(self.excel_tools.df, pd.DataFrame):
+            return None
+        pivot = re.search(r"(?<!\w)" + PIVOT_WORDS + r"(?!\w)", lowered)
+        head = lowered[:pivot.start()] if pivot else lowered
+        match = None
+        for candidate in re.finditer(r"(?<!\w)" + GROUP_WORDS + r"(?!\w)", head):
+            match = candidate
+        if match is None:
+            return None
+
+        group_end = pivot.start() if pivot else len(lowered)
+        by_cols = [col for start, _, col in mentions if match.end() <= start < group_end]
+        value_cols = [col for start, _, col in mentions if start < match.start()]
+        pivot_cols = [col for start, _, col in mentions if pivot and start >= pivot.end()]
+        if not by_cols:
+            return None
+
+        before = lowered[:match.start()]
+        aggs = [AGG_KEYWORDS[word] for word in _find_keyword(before, AGG_KEYWORDS)]
+        aggs += [f"p{m.group(1) or m.group(2)}" for m in PERCENTILE_WORDS.finditer(before)]
+        aggs = list(dict.fromkeys(aggs))
+        if not aggs:
+            aggs = ["sum"] if value_cols else ["count"]
+        if not value_cols and aggs != ["count"]:
+            return None
+        if not self._only_stopwords(lowered, mentions, [r"(?<!\w)" + GROUP_WORDS + r"(?!\w)",
+                                                        r"(?<!\w)" + PIVOT_WORDS + r"(?!\w)"]):
+            return None
+
+        if pivot:
+            if len(pivot_cols) != 1 or len(value_cols) != 1 or len(aggs) != 1:
+                return None
+            return self.excel_tools.pivot_data(by_cols, pivot_cols, value_cols[0], aggs[0])
+        return self.excel_tools.group_by(by_cols, value_cols or None, aggs)
+
+    def _route_filter(self, text, lowered, mentions):
+        # "... where City = 'Delhi' and Salary > 50000" - poora expression
+        where = WHERE_PATTERN.search(text)
+        if where:
+            head = lowered[:where.start()]
+            head_mentions = [m for m in mentions if m[1] <= where.start()]
+            # "sum of Salary where ..." aggregate hai; head me aur kuch ho to LLM
+            if _find_keyword(head, AGG_KEYWORDS) or not self._only_stopwords(head, head_mentions):
+                return None
+            expression = text[where.end():]
+            try:
+                parse_filter(expression, self.columns)
+                return self.excel_tools.query_data(expression)
+            except FilterSyntaxError:
+                pass
+
+        if not re.search(r"\b(?:where|filter|with|whose|having|show|rows)\b", lowered):
+            return None
+        if len(mentions) != 1:
+            return None
+        start, end, col = mentions[0]
+        if not self._only_stopwords(lowered[:start], [], [WHERE_PATTERN.pattern]):
+            return None
+        match = re.match(r"\s*" + EQUALS_WORDS + r"\s+(.+)$", text[end:], re.IGNORECASE)
+        if not match:
+            return None
+        raw = match.group(1).strip().strip("'\"")
+        if not raw:
+            return None
+        value = self._coerce(col, raw)
+        if value is None:
+            return None
+        return self.excel_tools.filter_data(col, value)
+
+    def _route_aggregate(self, text, lowered, mentions):
+        # "sum of Salary where Age > 30" - pehle filter, phir aggregate
+        where = WHERE_PATTERN.search(text)
+        expression = None
+        if where:
+            expression = text[where.end():]
+            lowered = lowered[:where.start()]
+            mentions = [m for m in mentions if m[1] <= where.start()]
+        words = _find_keyword(lowered, AGG_KEYWORDS)
+        aggs = {AGG_KEYWORDS[word] for word in words}
+        if len(aggs) != 1 or len(mentions) != 1:
+            return None
+        agg = aggs.pop()
+        col = mentions[0][2]
+        if agg not in ("sum", "mean", "min", "max"):
+            return None
+        if not self._only_stopwords(lowered, mentions):
+            return None
+        if expression is not None:
+            return self._filtered_aggregate(col, agg, expression)
+        method = {
+            "sum": self.excel_tools.calculate_sum,
+            "mean": self.excel_tools.calculate_average,
+            "min": self.excel_tools.calculate_min,
+            "max": self.excel_tools.calculate_max,
+        }[agg]
+        return method(col)
+
+    def _filtered_aggregate(self, column, agg, expression):
+        df = self.excel_tools.df
+        if not isinstance(df, pd.DataFrame):
+            return None
+        try:
+            node = parse_filter(expression, df.columns)
+        except FilterSyntaxError:
+            return None
+        backend = self.excel_tools.backend
+        filtered = backend.filter(df, node, self.excel_tools.indexes)
+        label = {"sum": "Sum", "mean": "Average", "min": "Minimum", "max": "Maximum"}[agg]
+        result = backend.aggregate(filtered, column, agg)
+        return f"{label} of {column} where {expression} ({len(filtered)} rows): {result}"
+
+    def _route_info(self, text, lowered, mentions):
+        if mentions:
+            return None
+        if re.search(r"\b(?:how many|count|number of|total)\s+(?:the\s+)?rows\b", lowered) or lowered in ("count rows", "rows"):
+            source = self.excel_tools._source()
+            return f"Total rows: {len(source)}"
+        if re.search(r"\b(?:list|show|what are|which)\b.*\bcolumns\b", lowered):
+            return f"Columns: {', '.join(self.columns)}"
+        return None
+
+    # ----- helpers -----
+
+    def _coerce(self, column, raw):
+        """Filter value ko column ke dtype me badlo"""
+        source = self.excel_tools._source()
+        if isinstance(source, ChunkedSheet):
+            sample = source.head(1)
+            dtype = sample[column].dtype if column in sample else object
+        else:
+            dtype = source[column].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            lowered = raw.lower()
+            if lowered in ("true", "yes", "1"):
+                return True
+            if lowered in ("false", "no", "0"):
+                return False
+            return None
+        if pd.api.types.is_numeric_dtype(dtype):
+            try:
+                number = float(raw.replace(",", ""))
+            except ValueError:
+                return None
+            return int(number) if number.is_integer() and pd.api.types.is_integer_dtype(dtype) else number
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            try:
+                return pd.Timestamp(raw)
+            except ValueError:
+                return None
+        if isinstance(source, pd.DataFrame):
+            # "delhi" likha ho to bhi "Delhi" match ho
+            lowered = raw.lower()
+            for value in source[column].dropna().unique():
+                if str(value).lower() == lowered:
+                    return value
+        return raw
@@ -0,0 +1,151 @@
+import hashlib
+import io
+import os
+from pathlib import Path
+import pandas as pd
+import config
+from .ingest_cache import content_hash
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    pa = None
+    HAS_PYARROW = False
+
+
+def _read_source(source):
+    """Path ya bytes - dono se raw bytes lo"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    return Path(source).read_bytes()
+
+
+def _labels_roundtrip(columns):
+    """Column labels Arrow se wapas waise hi aayenge?
+
+    Sab string, ya ek hi int/float/datetime type (header=None wale ints)
+    theek aate hain. Mixed labels (1.5, 'a') string ban jaate hain aur
+    bool labels load pe hi fail hote hain - inka snapshot nahi banta.
+    """
+    if isinstance(columns, pd.MultiIndex):
+        return False
+    dtype = columns.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return False
+    if pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype):
+        return True
+    return all(isinstance(label, str) for label in columns)
+
+
+class SnapshotStore:
+    """Parsed sheets ka columnar (Arrow IPC) snapshot disk pe
+
+    Pehli baar XLSX parse hoke snapshot likha jata hai, baad me
+    wahi file memory-mapped reopen hoti hai - openpyxl decode nahi hota.
+    Directory max_files / max_bytes tak rehti hai (LRU - load pe mtime touch).
+    """
+
+    SUFFIX = ".arrow"
+
+    def __init__(self, directory=None, enabled=None, max_files=None, max_bytes=None):
+        self.directory = Path(directory or config.SNAPSHOT_DIR)
+        self.max_files = max_files or config.SNAPSHOT_MAX_FILES
+        self.max_bytes = max_bytes or config.SNAPSHOT_MAX_BYTES
+        if enabled is None:
+            enabled = config.SNAPSHOT_ENABLED
+        self.enabled = enabled and HAS_PYARROW
+        if self.enabled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, digest, sheet_name=0, **options):
+        """Snapshot file ka path (content hash + sheet + options)"""
+        opts = repr((sheet_name, sorted((k, repr(v)) for k, v in options.items())))
+        suffix = hashlib.sha1(opts.encode("utf-8")).hexdigest()[:12]
+        return self.directory / f"{digest}_{suffix}{self.SUFFIX}"
+
+    def exists(self, digest, sheet_name=0, **options):
+        return self.enabled and self.path_for(digest, sheet_name, **options).exists()
+
+    def load(self, digest, sheet_name=0, **options):
+        """Snapshot memory-mapped kholo, na mile to None"""
+        if not self.enabled:
+            return None
+        path = self.path_for(digest, sheet_name, **options)
+        if not path.exists():
+            return None
+        try:
+            with pa.memory_map(str(path), "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            # LRU ke liye - recently used snapshot prune me sabse baad hatega
+            os.utime(path)
+            return table.to_pandas()
+        except Exception:
+            # Corrupt/purana snapshot - hata do, dobara ban jayega
+            path.unlink(missing_ok=True)
+            return None
+
+    def save(self, digest, df, sheet_name=0, **options):
+        """DataFrame ka snapshot likho (fail ho to chup-chap skip)"""
+        if not self.enabled or not _labels_roundtrip(df.columns):
+            return None
+        path = self.path_for(digest, sheet_name, **options)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            table = pa.Table.from_pandas(df)
+            with pa.OSFile(str(tmp_path), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            tmp_path.replace(path)
+            self._prune()
+            return path
+        except Exception:
+            # Mixed-type object columns Arrow me nahi jaate - parse path hi chalega
+            tmp_path.unlink(missing_ok=True)
+            return None
+
+    def _prune(self):
+        """Purane snapshots hatao - latest hamesha rehta hai, baaki count/bytes limit tak"""
+        files = []
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, path))
+        files.sort(key=lambda item: item[0], reverse=True)
+        kept, total = 0, 0
+        for _, size, path in files:
+            if kept and (kept >= self.max_files or total + size > self.max_bytes):
+                path.unlink(missing_ok=True)
+                continue
+            kept += 1
+            total += size
+
+    def read_excel(self, source, sheet_name=0, digest=None, **options):
+        """Snapshot ho to wahan se, warna XLSX parse karke snapshot banao
+
+        digest pehle se pata ho to snapshot hit pe source bytes padhe hi nahi jaate.
+        """
+        df = self.load(digest, sheet_name, **options) if digest else None
+        if df is not None:
+            return df
+        data = _read_source(source)
+        if digest is None:
+            digest = content_hash(data)
+            df = self.load(digest, sheet_name, **options)
+        if df is None:
+            df = pd.read_excel(io.BytesIO(data), sheet_name=sheet_name, **options)
+            if isinstance(df, pd.DataFrame):
+                self.save(digest, df, sheet_name, **options)
+        return df
+
+    def clear(self):
+        """Saare snapshots delete karo"""
+        if not self.directory.exists():
+            return 0
+        removed = 0
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
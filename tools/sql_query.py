@@ -0,0 +1,99 @@
+import re
+import pandas as pd
+import config
+
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except ImportError:
+    duckdb = None
+    HAS_DUCKDB = False
+
+
+class SQLQueryError(ValueError):
+    """SQL query allowed nahi hai ya chal nahi payi"""
+
+
+def sql_type(dtype):
+    """pandas dtype -> DuckDB type naam (schema prompt ke liye)"""
+    if pd.api.types.is_bool_dtype(dtype):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "BIGINT"
+    if pd.api.types.is_float_dtype(dtype):
+        return "DOUBLE"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "VARCHAR"
+
+
+def schema_text(df, table_name=None):
+    """get_data_info wala metadata (rows, column names, types) ek compact block me"""
+    table_name = table_name or config.SQL_AGENT_CONFIG["table_name"]
+    columns = ",\n".join(
+        f'  "{str(column).replace(chr(34), chr(34) * 2)}" {sql_type(dtype)}'
+        for column, dtype in df.dtypes.items()
+    )
+    return f"TABLE {table_name} ({len(df)} rows) (\n{columns}\n)"
+
+
+def extract_sql(text):
+    """LLM output se pehli SQL statement nikalo (```sql fences / 'SQL:' hata ke)"""
+    # Stop token ("\n```\n") ya max_tokens pe ruka ho to closing fence nahi hota
+    fenced = re.search(r"```(?:sql)?\s*(.*?)(?:```|$)", text, re.DOTALL | re.IGNORECASE)
+    if fenced:
+        text = fenced.group(1)
+    text = re.sub(r"^\s*SQL\s*:", "", text.strip(), flags=re.IGNORECASE).strip()
+    if not HAS_DUCKDB:
+        return text.split(";")[0].strip()
+    # ";" string literal / quoted column naam me bhi ho sakta hai - DuckDB ka
+    # parser hi statement alag kare. Peeche prose ho to har ";" tak try karo.
+    cuts = [len(text)] + [match.start() for match in re.finditer(";", text)]
+    for cut in sorted(set(cuts)):
+        try:
+            statements = duckdb.extract_statements(text[:cut])
+        except duckdb.Error:
+            continue
+        if statements:
+            return statements[0].query.strip()
+    # Parse hi nahi hua - run_sql sahi error dega
+    return text.split(";")[0].strip()
+
+
+def run_sql(df, sql, table_name=None, max_rows=None):
+    """Ek read-only SELECT ko DataFrame pe embedded DuckDB me chalao
+
+    Sirf ek SELECT/WITH statement allowed hai; connection ka file/network
+    access band hai, isliye query sirf loaded table hi padh sakti hai.
+    Returns (result DataFrame, truncated)
+    """
+    if not HAS_DUCKDB:
+        raise RuntimeError("SQL mode needs the duckdb package")
+    sql_config = config.SQL_AGENT_CONFIG
+    table_name = table_name or sql_config["table_name"]
+    max_rows = max_rows or sql_config["max_result_rows"]
+
+    try:
+        statements = duckdb.extract_statements(sql)
+    except duckdb.Error as e:
+        raise SQLQueryError(f"Invalid SQL: {e}")
+    if len(statements) != 1:
+        raise SQLQueryError("Exactly one SQL statement is allowed")
+    if statements[0].type != duckdb.StatementType.SELECT:
+        raise SQLQueryError("Only SELECT queries are allowed")
+
+    con = duckdb.connect(config={"enable_external_access": False})
+    try:
+        con.register(table_name, df)
+        con.execute("SET lock_configuration = true")
+        relation = con.sql(sql).limit(max_rows + 1)
+        result = relation.df()
+        for column, kind in zip(result.columns, relation.types):
+            # SUM(int) HUGEINT hota hai jo float ban ke aata hai - int me wapas
+            if str(kind) == "HUGEINT" and result[column].abs().max() < 2 ** 53:
+                result[column] = result[column].astype("Int64")
+    except duckdb.Error as e:
+        raise SQLQueryError(str(e))
+    finally:
+        con.close()
+    return result.head(max_rows), len(result) > max_rows
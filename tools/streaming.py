@@ -0,0 +1,169 @@
+import openpyxl
+import pandas as pd
+import config
+from .filter_expr import compile_mask, equality_node, parse_filter
+
+
+def _header_names(row):
+    """Header row se column names - read_excel jaise hi naam
+
+    Khali cell -> "Unnamed: i"; duplicate -> a.1, a.2 ... (jo naam header
+    me pehle se hai wo skip). pandas ki tarah asli naam pehle, unnamed baad me.
+    """
+    names = [f"Unnamed: {i}" if value is None else str(value) for i, value in enumerate(row)]
+    unnamed = [i for i, value in enumerate(row) if value is None]
+    order = [i for i in range(len(names)) if row[i] is not None] + unnamed
+    counts = {}
+    for i in order:
+        base = name = names[i]
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[base] = count + 1
+            name = f"{base}.{count}"
+            count = count + 1 if name in names else counts.get(name, 0)
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+
+def iter_excel_chunks(file_path, sheet_name=0, chunk_size=None):
+    """Excel sheet ko read-only mode me chunk-by-chunk padho
+
+    Har chunk ek typed DataFrame hai (max chunk_size rows). Poori sheet
+    kabhi memory me nahi aati.
+    """
+    chunk_size = chunk_size or config.STREAM_CHUNK_SIZE
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _header_names(header)
+        width = len(columns)
+
+        buffer = []
+        for row in rows:
+            # read_only mode me trailing khali rows bhi aati hain
+            if all(value is None for value in row):
+                continue
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame.from_records(buffer, columns=columns).infer_objects()
+                buffer = []
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=columns).infer_objects()
+    finally:
+        wb.close()
+
+
+class ChunkedSheet:
+    """Bade sheets ke liye streaming source - aggregates chunk-wise chalte hain"""
+
+    def __init__(self, file_path, sheet_name=0, chunk_size=None):
+        self.file_path = file_path
+        self.sheet_name = sheet_name
+        self.chunk_size = chunk_size or config.STREAM_CHUNK_SIZE
+        self._columns = None
+        self._row_count = None
+
+    @property
+    def columns(self):
+        """Sirf header row padh ke column names"""
+        if self._columns is None:
+            wb = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+            try:
+                ws = wb.worksheets[self.sheet_name] if isinstance(self.sheet_name, int) else wb[self.sheet_name]
+                header = next(ws.iter_rows(max_row=1, values_only=True), ())
+                self._columns = pd.Index(_header_names(header))
+            finally:
+                wb.close()
+        return self._columns
+
+    def iter_chunks(self):
+        return iter_excel_chunks(self.file_path, self.sheet_name, self.chunk_size)
+
+    def __len__(self):
+        if self._row_count is None:
+            self._row_count = sum(len(chunk) for chunk in self.iter_chunks())
+        return self._row_count
+
+    def head(self, n=5):
+        """Pehle n rows (sirf pehla chunk padhta hai)"""
+        for chunk in self.iter_chunks():
+            return chunk.head(n)
+        return pd.DataFrame(columns=self.columns)
+
+    def _check_column(self, column):
+        if column not in self.columns:
+            raise KeyError(column)
+
+    def sum(self, column):
+        self._check_column(column)
+        total = 0
+        for chunk in self.iter_chunks():
+            total += chunk[column].sum()
+        return total
+
+    def count(self, column):
+        self._check_column(column)
+        return sum(int(chunk[column].count()) for chunk in self.iter_chunks())
+
+    def mean(self, column):
+        self._check_column(column)
+        total, count = 0, 0
+        for chunk in self.iter_chunks():
+            values = chunk[column].dropna()
+            total += values.sum()
+            count += len(values)
+        return total / count if count else float("nan")
+
+    def _extreme(self, column, pick):
+        self._check_column(column)
+        result = None
+        for chunk in self.iter_chunks():
+            values = chunk[column].dropna()
+            if values.empty:
+                continue
+            value = values.min() if pick is min else values.max()
+            result = value if result is None else pick(result, value)
+        return float("nan") if result is None else result
+
+    def min(self, column):
+        return self._extreme(column, min)
+
+    def max(self, column):
+        return self._extreme(column, max)
+
+    def filter(self, column, value, limit=None):
+        """Equality filter - matching rows hi memory me rakhte hain"""
+        self._check_column(column)
+        return self._filter_node(equality_node(column, value), limit)
+
+    def query(self, expression, limit=None):
+        """Filter expression har chunk pe (e.g. "City = 'Delhi' AND Salary > 50000")"""
+        return self._filter_node(parse_filter(expression, self.columns), limit)
+
+    def _filter_node(self, node, limit=None):
+        matches = []
+        found = 0
+        for chunk in self.iter_chunks():
+            matched = chunk[compile_mask(node, chunk)]
+            if not matched.empty:
+                matches.append(matched)
+                found += len(matched)
+            if limit is not None and found >= limit:
+                break
+        if not matches:
+            return pd.DataFrame(columns=self.columns)
+        result = pd.concat(matches, ignore_index=True)
+        return result.head(limit) if limit is not None else result
+
+
+def aggregate(source, column, op):
+    """DataFrame ya ChunkedSheet - dono pe sum/mean/min/max/count"""
+    if isinstance(source, ChunkedSheet):
+        return getattr(source, op)(column)
+    return getattr(source[column], op)()
@@ -0,0 +1,118 @@
+import io
+from collections import OrderedDict
+from pathlib import Path
+import openpyxl
+import pandas as pd
+import config
+from .ingest_cache import content_hash
+
+
+class WorkbookHandle:
+    """Multi-sheet workbook - sheets sirf pehli access pe parse hoti hain
+
+    Sheet names aur dimensions workbook metadata se aate hain (cell data
+    parse nahi hota). Parsed sheets ek bounded LRU cache me rehti hain.
+    """
+
+    def __init__(self, source, max_cached_sheets=None, snapshots=None, digest=None):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.file_path = None
+            self._data = bytes(source)
+        else:
+            self.file_path = Path(source)
+            self._data = None
+        self.max_cached_sheets = max_cached_sheets or config.WORKBOOK_MAX_CACHED_SHEETS
+        self.snapshots = snapshots
+        self._sheets = OrderedDict()
+        self._meta = None
+        self._digest = digest
+
+    def _open_source(self):
+        return io.BytesIO(self._data) if self._data is not None else self.file_path
+
+    @property
+    def digest(self):
+        """Workbook bytes ka content hash (snapshots ke liye)"""
+        if self._digest is None:
+            data = self._data if self._data is not None else self.file_path.read_bytes()
+            self._digest = content_hash(data)
+        return self._digest
+
+    def _load_meta(self):
+        # read_only mode me sirf workbook.xml aur har sheet ka <dimension> padha jata hai
+        if self._meta is not None:
+            return self._meta
+        meta = OrderedDict()
+        try:
+            wb = openpyxl.load_workbook(self._open_source(), read_only=True)
+            try:
+                for ws in wb.worksheets:
+                    rows = ws.max_row if ws.max_row else None
+                    cols = ws.max_column if ws.max_column else None
+                    meta[ws.title] = {
+                        # Pehli row header hai
+                        "rows": rows - 1 if rows else None,
+                        "columns": cols,
+                    }
+            finally:
+                wb.close()
+        except Exception:
+            # .xls jaisi files openpyxl nahi padh sakta - sirf names
+            for name in pd.ExcelFile(self._open_source()).sheet_names:
+                meta[name] = {"rows": None, "columns": None}
+        self._meta = meta
+        return meta
+
+    @property
+    def sheet_names(self):
+        return list(self._load_meta().keys())
+
+    def dimensions(self, sheet_name):
+        """Sheet ke (rows, columns) - metadata se, None agar pata nahi"""
+        info = self._load_meta()[self._resolve(sheet_name)]
+        return info["rows"], info["columns"]
+
+    def sheet_info(self):
+        """Saari sheets ki list: name, rows, columns, loaded"""
+        return [
+            {"name": name, "rows": info["rows"], "columns": info["columns"], "loaded": name in self._sheets}
+            for name, info in self._load_meta().items()
+        ]
+
+    def _resolve(self, sheet_name):
+        names = self.sheet_names
+        if isinstance(sheet_name, int):
+            return names[sheet_name]
+        if sheet_name not in names:
+            raise KeyError(f"Sheet '{sheet_name}' not found")
+        return sheet_name
+
+    def get_sheet(self, sheet_name=0):
+        """Sheet ka DataFrame - pehli baar parse, baad me cache se"""
+        name = self._resolve(sheet_name)
+        if name in self._sheets:
+            self._sheets.move_to_end(name)
+            return self._sheets[name]
+
+        if self.snapshots is not None:
+            df = self.snapshots.read_excel(
+                self._data if self._data is not None else self.file_path,
+                sheet_name=name,
+                digest=self.digest
+            )
+        else:
+            df = pd.read_excel(self._open_source(), sheet_name=name)
+
+        self._sheets[name] = df
+        while len(self._sheets) > self.max_cached_sheets:
+            self._sheets.popitem(last=False)
+        return df
+
+    def __getitem__(self, sheet_name):
+        return self.get_sheet(sheet_name)
+
+    def __len__(self):
+        return len(self.sheet_names)
+
+    def is_loaded(self, sheet_name):
+        return self._resolve(sheet_name) in self._sheets
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
+import config
+
+
+# format_excel wala header style
+HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=12)
+HEADER_ALIGNMENT = Alignment(horizontal="center")
+
+
+def excel_value(value):
+    """numpy/pandas scalar -> openpyxl-friendly Python value"""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def number_format(dtype):
+    """Column dtype ke hisab se Excel number format (None = General)"""
+    formats = config.XLSX_WRITER_CONFIG["number_formats"]
+    if pd.api.types.is_bool_dtype(dtype):
+        return None
+    if pd.api.types.is_integer_dtype(dtype):
+        return formats["integer"]
+    if pd.api.types.is_float_dtype(dtype):
+        return formats["float"]
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return formats["datetime"]
+    return None
+
+
+def column_widths(df, sample_rows=None):
+    """Header aur pehli sample rows ke text length se column widths"""
+    writer_config = config.XLSX_WRITER_CONFIG
+    sample_rows = sample_rows or writer_config["width_sample_rows"]
+    sample = df.head(sample_rows)
+    widths = []
+    for position, column in enumerate(df.columns):
+        values = sample.iloc[:, position].dropna().astype(str)
+        longest = int(values.str.len().max()) if len(values) else 0
+        width = max(len(str(column)) + 2, longest + 2, writer_config["min_width"])
+        widths.append(min(width, writer_config["max_width"]))
+    return widths
+
+
+def write_xlsx(df, path, sheet_name="Sheet1", styled=True, chunk_size=None):
+    """DataFrame ko ek hi pass me XLSX me likho (openpyxl write-only)
+
+    Header style, column widths, number formats aur freeze pane likhte
+    waqt hi lagte hain - file dobara kholni nahi padti.
+    """
+    chunk_size = chunk_size or config.XLSX_WRITER_CONFIG["chunk_size"]
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+
+    formats = [number_format(dtype) for dtype in df.dtypes] if styled else [None] * len(df.columns)
+    if styled:
+        for position, width in enumerate(column_widths(df), start=1):
+            ws.column_dimensions[get_column_letter(position)].width = width
+        ws.freeze_panes = "A2"
+        header = []
+        for column in df.columns:
+            cell = WriteOnlyCell(ws, value=str(column))
+            cell.fill = HEADER_FILL
+            cell.font = HEADER_FONT
+            cell.alignment = HEADER_ALIGNMENT
+            header.append(cell)
+        ws.append(header)
+    else:
+        ws.append([str(column) for column in df.columns])
+
+    # Har formatted column ka ek styled cell - har row pe sirf value badalti hai
+    # (append row ko turant XML me likh deta hai, isliye reuse safe hai)
+    styled_cells = {}
+    for position, fmt in enumerate(formats):
+        if fmt is not None:
+            cell = WriteOnlyCell(ws)
+            cell.number_format = fmt
+            styled_cells[position] = cell
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        for row in chunk.itertuples(index=False, name=None):
+            values = [excel_value(value) for value in row]
+            for position, cell in styled_cells.items():
+                if values[position] is not None:
+                    cell.value = values[position]
+                    values[position] = cell
+            ws.append(values)
+    wb.save(path)
+    return path
+
+
+def style_header(file_path, output_path):
+    """Purana 3-step path: saved file kholo, header style karo, dobara save"""
+    wb = openpyxl.load_workbook(file_path)
+    ws = wb.active
+    for cell in ws[1]:
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGNMENT
+    wb.save(output_path)
+    return output_path